@@ -1,5 +1,74 @@
-BASE_URL = "https://jsonplaceholder.typicode.com/"
+import os
+
+BASE_URL = os.getenv("API_BASE_URL", "https://jsonplaceholder.typicode.com/")
 HEADERS = {
     "Content-Type": "application/json",
     "Authorization": "Bearer token"
-}
\ No newline at end of file
+}
+
+# HTTP client settings shared by every API test through the `api_client` fixture
+POOL_CONNECTIONS = 10  # number of per-host connection pools kept alive
+POOL_MAXSIZE = 20  # connections kept alive per host
+CONNECT_TIMEOUT = 5  # seconds to establish a connection
+READ_TIMEOUT = 30  # seconds to wait for the server to send data
+RETRIES = 0  # retry attempts for failed requests (0 disables retrying)
+RETRY_BACKOFF = 0.5  # backoff factor between retries, in seconds
+RETRY_STATUSES = (429, 500, 502, 503, 504)  # status codes that trigger a retry
+REQUEST_DEADLINE = float(os.getenv("API_REQUEST_DEADLINE", "30"))  # seconds one request may take in total (0 for no limit)
+TEST_DEADLINE = float(os.getenv("API_TEST_DEADLINE", "120"))  # seconds all requests of a test may take, @pytest.mark.deadline overrides (0 for no limit)
+HEDGE = os.getenv("API_HEDGE", "false").lower() == "true"  # send a second GET when the first is slower than its endpoint's p95
+HEDGE_MIN_SAMPLES = 20  # latencies an endpoint needs before its requests are hedged
+HEDGE_MIN_DELAY_MS = float(os.getenv("API_HEDGE_MIN_DELAY_MS", "5"))  # never hedge sooner than this
+HEDGE_WINDOW = 200  # recent latencies per endpoint the p95 is computed from
+ADAPTIVE_CONCURRENCY = os.getenv("API_ADAPTIVE_CONCURRENCY", "false").lower() == "true"  # AIMD limit on requests in flight (utils/adaptive_concurrency.py)
+ADAPTIVE_INITIAL_LIMIT = int(os.getenv("API_ADAPTIVE_INITIAL_LIMIT", "4"))  # requests in flight before the limit adapts
+ADAPTIVE_MIN_LIMIT = 1  # the limit never drops below this
+ADAPTIVE_MAX_LIMIT = int(os.getenv("API_ADAPTIVE_MAX_LIMIT", str(POOL_MAXSIZE)))  # the limit never grows above this
+ADAPTIVE_BACKOFF = 0.7  # factor applied to the limit on a 429/503, timeout or latency spike
+ADAPTIVE_LATENCY_TOLERANCE = 2.0  # latency above this many times an endpoint's fastest one counts as congestion
+ADAPTIVE_LATENCY_FLOOR_MS = float(os.getenv("API_ADAPTIVE_LATENCY_FLOOR_MS", "50"))  # latencies below this never count as congestion
+ADAPTIVE_RETRIES = 3  # times a GET answered with 429/503 is sent again (after any Retry-After)
+ASYNC_CONCURRENCY = int(os.getenv("API_ASYNC_CONCURRENCY", "20"))  # requests in flight for batched checks (keep <= POOL_MAXSIZE)
+ENDPOINT_MATRIX = os.getenv("API_ENDPOINT_MATRIX", os.path.join(os.path.dirname(os.path.abspath(__file__)), "resource", "endpoint_matrix.json"))  # spec expanded by tests/test_endpoint_matrix.py
+MATRIX_BATCH_SIZE = int(os.getenv("API_MATRIX_BATCH_SIZE", "200"))  # endpoint checks run concurrently per batch
+WRITE_BATCH_SIZE = int(os.getenv("API_WRITE_BATCH_SIZE", "50"))  # requests per verb and resource in tests/test_write_path.py
+WRITE_CONCURRENCY = int(os.getenv("API_WRITE_CONCURRENCY", "10"))  # write requests in flight (keep <= POOL_MAXSIZE)
+WRITE_SEED = int(os.getenv("API_WRITE_SEED", "1"))  # seed of the generated write payloads
+LATENCY_SAMPLES = int(os.getenv("API_LATENCY_SAMPLES", "20"))  # repeats per request for @pytest.mark.latency_budget tests (0 skips the budgets)
+
+# Record/replay response cache (utils/response_cache.py) mounted under the `api_client` fixture
+CACHE_MODE = os.getenv("API_CACHE_MODE", "off")  # off, record, replay or refresh (serve fresh entries, re-fetch stale ones)
+CACHE_DIR = os.getenv("API_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".api_cache"))
+CACHE_TTL = float(os.getenv("API_CACHE_TTL", "86400"))  # seconds a recorded response stays fresh (0 never expires)
+CACHE_MAX_BYTES = int(os.getenv("API_CACHE_MAX_MB", "256")) * 1024 * 1024  # store size before LRU eviction
+CACHE_VARY_HEADERS = ("Accept", "Authorization")  # request headers that are part of the cache key
+
+# JSON schema validation settings used by the `schema_registry` fixture
+SCHEMA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resource")  # *_schema.json files
+VALIDATION_CHUNK_SIZE = 10000  # items per chunk when a list is validated in parallel
+VALIDATION_WORKERS = 0  # worker processes for large lists (0 validates in-process)
+STREAM_JSON = os.getenv("API_STREAM_JSON", "false").lower() == "true"  # decode and validate collection responses item by item
+STREAM_CHUNK_SIZE = 64 * 1024  # bytes read from the socket at a time when streaming
+VERDICT_CACHE = os.getenv("API_VERDICT_CACHE", "false").lower() == "true"  # skip re-validating byte-identical bodies that passed before
+VERDICT_CACHE_FILE = os.getenv("API_VERDICT_CACHE_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".verdict_cache.json"))
+VERDICT_CACHE_MAX_ENTRIES = 10000  # verdicts kept before the least recently used are dropped
+
+# Local JSONPlaceholder stand-in (utils/local_server.py), started by the `local_api_server` fixture
+LOCAL_SERVER = os.getenv("API_LOCAL_SERVER", "false").lower() == "true"  # run the suite against it
+LOCAL_SERVER_SEED = int(os.getenv("API_LOCAL_SERVER_SEED", "1"))  # seed of the generated dataset
+LOCAL_SERVER_LATENCY_MS = float(os.getenv("API_LOCAL_SERVER_LATENCY_MS", "0"))  # latency added to every response
+LOCAL_SERVER_JITTER_MS = float(os.getenv("API_LOCAL_SERVER_JITTER_MS", "0"))  # random latency added on top
+LOCAL_SERVER_ERROR_RATE = float(os.getenv("API_LOCAL_SERVER_ERROR_RATE", "0"))  # fraction of requests answered with 500
+LOCAL_SERVER_RATE_LIMIT = float(os.getenv("API_LOCAL_SERVER_RATE_LIMIT", "0"))  # requests/second before 429 (0 disables it)
+
+# Offline micro-benchmarks of the framework's hot paths (utils/benchmarks.py)
+BENCHMARK_BASELINE = os.getenv("API_BENCHMARK_BASELINE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json"))
+BENCHMARK_THRESHOLD = float(os.getenv("API_BENCHMARK_THRESHOLD", "0.2"))  # slowdown vs the baseline that fails the comparison
+BENCHMARK_ROUNDS = 7  # timed rounds per benchmark
+BENCHMARK_MIN_TIME = 0.2  # minimum seconds per round
+
+# Execution log (utils/log_pipeline.py): JSON lines written by a background thread, one file per xdist worker
+LOG_DIR = os.getenv("API_LOG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs"))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")  # minimum level written to the execution log
+LOG_MAX_BYTES = int(os.getenv("API_LOG_MAX_MB", "10")) * 1024 * 1024  # file size before it is rotated and gzipped
+LOG_BACKUP_COUNT = 5  # rotated files kept per worker
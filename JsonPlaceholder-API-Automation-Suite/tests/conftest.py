@@ -1,33 +1,127 @@
 import pytest
 import json
 import logging
+import config
+from utils.adaptive_concurrency import AdaptiveLimiter
+from utils.deadlines import DeadlinePlugin
+from utils.http_client import ApiClient
+from utils.latency_budget import LatencyBudgetPlugin
+from utils.local_server import FaultInjector, LocalApiServer
+from utils.log_pipeline import LogPipeline, LogPipelinePlugin
+from utils.response_cache import RecordReplayAdapter
+from utils.schema_registry import SchemaRegistry
+from utils.verdict_cache import VALIDATION_CACHE_PROPERTY, VerdictCache, VerdictCachePlugin
+from utils.write_path import WriteThroughputPlugin
 
-logging.basicConfig(
-    filename="execution.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
+# history-based xdist sharding shared with the UI suite (plugins/duration_sharding.py)
+pytest_plugins = ["duration_sharding"]
 
-# fixture for user APIs output validation
-@pytest.fixture
-def user_schema():
-    with open('resource/user_schema.json') as schema_file:
-        schema = json.load(schema_file)
-    yield schema
-    schema.clear()
+def pytest_configure(config):
+    # the endpoint matrix runs one batch per xdist_group; under plain `-n` (load) a batch would be
+    # spread over workers that each request all of it
+    if config.getoption("dist", "no") == "load":
+        config.option.dist = "loadgroup"
+    if getattr(config, "workerinput", {}).get("dist") == "loadgroup":
+        # workers parse the original command line, so they learn the switch from the controller
+        config.option.loadgroup = True
+    # test logs go through a queue to a background JSON-lines writer (logs/execution-<worker>.jsonl)
+    config.pluginmanager.register(LogPipelinePlugin(LogPipeline().start()), "log_pipeline")
+    # registered before latency_budget, so the test deadline does not cover the budget's repeat measurements
+    config.pluginmanager.register(DeadlinePlugin(), "deadlines")
+    config.pluginmanager.register(LatencyBudgetPlugin(), "latency_budget")
+    config.pluginmanager.register(VerdictCachePlugin(), "verdict_cache")
+    config.pluginmanager.register(WriteThroughputPlugin(), "write_throughput")
 
-# fixture for user APIs output validation
-@pytest.fixture
-def post_schema():
-    with open('resource/post_schema.json') as schema_file:
-        schema = json.load(schema_file)
-    yield schema
-    schema.clear()
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput["dist"] = node.config.getoption("dist")
+
+# fixture running the local JSONPlaceholder stand-in for the whole test session
+@pytest.fixture(scope="session")
+def local_api_server():
+    faults = FaultInjector(
+        latency_ms=config.LOCAL_SERVER_LATENCY_MS,
+        jitter_ms=config.LOCAL_SERVER_JITTER_MS,
+        error_rate=config.LOCAL_SERVER_ERROR_RATE,
+        rate_limit=config.LOCAL_SERVER_RATE_LIMIT,
+        seed=config.LOCAL_SERVER_SEED,
+    )
+    with LocalApiServer(faults=faults) as server:
+        yield server
+
+# fixture resolving the API under test: the local stand-in when API_LOCAL_SERVER=true, else BASE_URL
+@pytest.fixture(scope="session")
+def api_base_url(request):
+    if config.LOCAL_SERVER:
+        return request.getfixturevalue("local_api_server").url
+    return config.BASE_URL
+
+# fixture providing one pooled, keep-alive HTTP client for the whole test session (AIMD-limited when API_ADAPTIVE_CONCURRENCY=true)
+@pytest.fixture(scope="session")
+def api_client(api_base_url):
+    limiter = AdaptiveLimiter() if config.ADAPTIVE_CONCURRENCY else None
+    client = ApiClient(base_url=api_base_url, limiter=limiter)
+    yield client
+    if isinstance(client.adapter, RecordReplayAdapter):
+        logging.getLogger(__name__).info(
+            f"Response cache ({client.adapter.mode}): {client.adapter.hits} hits, {client.adapter.misses} misses"
+        )
+    if limiter is not None:
+        limiter.log_summary(logging.getLogger(__name__))
+    client.close()
+
+# fixture attaching the timing of every HTTP request a test makes to its JUnit properties and JSON report entry
+@pytest.fixture(autouse=True)
+def http_timings(request, api_client):
+    first = len(api_client.timings)
+    yield
+    for timing in api_client.timings[first:]:
+        request.node.user_properties.append(("http_timing", json.dumps(timing.as_dict())))
+    # drained, so the session-scoped client does not keep every request of the run
+    del api_client.timings[first:]
+
+# fixture holding the verdicts of bodies that already passed validation, when API_VERDICT_CACHE=true
+@pytest.fixture(scope="session")
+def verdict_cache():
+    if not config.VERDICT_CACHE:
+        yield None
+        return
+    cache = VerdictCache()
+    yield cache
+    logging.getLogger(__name__).info(f"Validation verdict cache: {cache.hits} hits, {cache.misses} misses")
+    cache.save()
+
+# fixture attaching the verdict cache hits and misses of every test to its JUnit properties and JSON report entry
+@pytest.fixture(autouse=True)
+def validation_verdicts(request, verdict_cache):
+    if verdict_cache is None:
+        yield
+        return
+    before = verdict_cache.stats()
+    yield
+    after = verdict_cache.stats()
+    request.node.user_properties.append((VALIDATION_CACHE_PROPERTY, json.dumps({
+        "hits": after["hits"] - before["hits"],
+        "misses": after["misses"] - before["misses"],
+        "saved_ms": round(after["saved_ms"] - before["saved_ms"], 1),
+    })))
+
+# fixture compiling every schema in resource/ once for the whole test session
+@pytest.fixture(scope="session")
+def schema_registry(verdict_cache):
+    return SchemaRegistry(verdict_cache=verdict_cache)
 
 # fixture for user APIs output validation
-@pytest.fixture
-def comment_schema():
-    with open('resource/comment_schema.json') as schema_file:
-        schema = json.load(schema_file)
-    yield schema
-    schema.clear()
\ No newline at end of file
+@pytest.fixture(scope="session")
+def user_schema(schema_registry):
+    return schema_registry.get("user")
+
+# fixture for post APIs output validation
+@pytest.fixture(scope="session")
+def post_schema(schema_registry):
+    return schema_registry.get("post")
+
+# fixture for comment APIs output validation
+@pytest.fixture(scope="session")
+def comment_schema(schema_registry):
+    return schema_registry.get("comment")
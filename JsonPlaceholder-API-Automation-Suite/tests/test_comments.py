@@ -1,14 +1,16 @@
 import pytest
 import requests
-from config import BASE_URL, HEADERS
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 import logging
+import config
+from utils.json_stream import read_items
 
 logger = logging.getLogger(__name__)
 
 class TestCommentsAPI:
     @pytest.mark.comments_tests
-    def test_get_comments(self, comment_schema):
+    @pytest.mark.latency_budget(p95_ms=1000, max_ms=3000)
+    def test_get_comments(self, api_client, comment_schema):
         """
         Test fetching all comments from the API.
 
@@ -23,24 +25,21 @@ class TestCommentsAPI:
         Handles exceptions for HTTP requests, schema validation, and unexpected errors.
 
         Args:
-            comment_schema (dict): JSON schema for validating each comment object.
+            api_client (ApiClient): The shared pooled HTTP client used to send requests.
+            comment_schema (CompiledSchema): JSON schema for validating each comment object.
         """
         logger.info("Starting test: test_get_comments")
         try:
             # Send the GET request to fetch comments
-            response = requests.get(url=f"{BASE_URL}comments", headers=HEADERS)
-            logger.info(f"GET {BASE_URL}comments - Status Code: {response.status_code}")
+            response = api_client.get("comments", stream=config.STREAM_JSON)
+            logger.info(f"GET {response.url} - Status Code: {response.status_code}")
             assert response.status_code == 200
 
-            # Parse and validate response
-            response_data = response.json()
-            assert isinstance(response_data, list)
+            # Parse the list and validate each comment using comment schema
+            # (item by item as it is decoded when API_STREAM_JSON=true)
+            response_data = read_items(response, comment_schema)
             assert len(response_data) == 500
             logger.info(f"Response contains {len(response_data)} comments")
-
-            # Validate each comment data using comment schema
-            for item in response_data:
-                validate(instance=item, schema=comment_schema)
             logger.info("All comments validated successfully against the schema")
 
         except requests.exceptions.RequestException as e:
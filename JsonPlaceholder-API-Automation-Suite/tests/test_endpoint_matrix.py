@@ -0,0 +1,82 @@
+import pytest
+import json
+import config
+from utils.async_engine import AsyncEngine, BatchedChecks
+from utils.endpoint_matrix import load_matrix
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Every collection, item lookup, query filter and nested collection described by the spec;
+# each batch is an xdist_group, run on one xdist worker (conftest.py switches `-n` runs to loadgroup)
+MATRIX = [
+    pytest.param(
+        endpoint,
+        marks=[getattr(pytest.mark, marker) for marker in endpoint.markers]
+        + [pytest.mark.xdist_group(f"endpoint-matrix-{index // config.MATRIX_BATCH_SIZE}")],
+        id=endpoint.id,
+    )
+    for index, endpoint in enumerate(load_matrix(config.ENDPOINT_MATRIX))
+]
+
+
+@pytest.fixture(scope="module")
+def matrix_checks(request, api_client, schema_registry):
+    """
+    Fixture running the selected endpoint checks of this module in concurrent batches.
+
+    Only the endpoints of the tests selected for this run are requested, so
+    `-m`/`-k` filtering still reduces the number of HTTP calls. A batch is the
+    selected endpoints of one xdist_group, which xdist keeps on one worker, so
+    no endpoint is requested by a worker that does not run its test.
+
+    Returns:
+        BatchedChecks: Runs the checks a batch at a time as the tests ask for them.
+    """
+    batches = {}
+    for item in request.session.items:
+        if item.module is request.module and hasattr(item, "callspec"):
+            group = item.get_closest_marker("xdist_group").args[0]
+            batches.setdefault(group, []).append(item.callspec.params["endpoint"])
+    endpoints = sum(len(batch) for batch in batches.values())
+    logger.info(f"Checking {endpoints} endpoints in batches of up to {config.MATRIX_BATCH_SIZE}")
+    checks = BatchedChecks(AsyncEngine(api_client, schema_registry), batches.values())
+    yield checks
+    logger.info(f"Checked the endpoints of this worker in {checks.runs} batches")
+
+
+def assert_check_passed(result, record_property):
+    """Logs a check result, records its HTTP timing and fails the calling test if the check failed."""
+    logger.info(f"GET {result.url} - Status Code: {result.status_code} ({result.elapsed * 1000:.1f} ms)")
+    if result.timing is not None:
+        record_property("http_timing", json.dumps(result.timing.as_dict()))
+    if not result.passed:
+        logger.error(result.error)
+        pytest.fail(result.error)
+
+
+class TestEndpointMatrix:
+    @pytest.mark.parametrize("endpoint", MATRIX)
+    def test_endpoint(self, matrix_checks, api_client, endpoint, record_property):
+        """
+        Test one endpoint of the spec in resource/endpoint_matrix.json.
+
+        The check is run concurrently with the rest of its batch the first time
+        a test of the batch asks for it; each test then reports its own check:
+        - Response status code is 200.
+        - A collection, filter or nested collection is a list with the expected
+          number of items, each carrying the filtered or parent field value.
+        - An item lookup is a dictionary whose ID matches the requested ID.
+        - The response adheres to the resource's JSON schema.
+
+        Args:
+            matrix_checks (BatchedChecks): Runs the selected checks in batches.
+            api_client (ApiClient): The shared pooled HTTP client the batches are sent with.
+            endpoint (Endpoint): The endpoint checked by this test.
+            record_property (callable): Records the HTTP timing of the check in the reports.
+        """
+        first = len(api_client.timings)
+        result = matrix_checks.result(endpoint)
+        # each test records the timing of its own check, not the whole batch it triggered
+        del api_client.timings[first:]
+        assert_check_passed(result, record_property)
@@ -1,14 +1,16 @@
 import pytest
 import requests
-from config import BASE_URL, HEADERS
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 import logging
+import config
+from utils.json_stream import read_items
 
 logger = logging.getLogger(__name__)
 
 class TestPostAPI:
     @pytest.mark.posts_tests
-    def test_get_posts(self, post_schema):
+    @pytest.mark.latency_budget(p95_ms=800, max_ms=3000)
+    def test_get_posts(self, api_client, post_schema):
         """
         Test fetching all posts from the API.
 
@@ -23,24 +25,21 @@ class TestPostAPI:
         Handles exceptions for HTTP requests, schema validation, and unexpected errors.
 
         Args:
-            post_schema (dict): JSON schema for validating each post.
+            api_client (ApiClient): The shared pooled HTTP client used to send requests.
+            post_schema (CompiledSchema): JSON schema for validating each post.
         """
         logger.info("Starting test: test_get_posts")
         try:
             # Sending GET request
-            response = requests.get(url=f"{BASE_URL}posts", headers=HEADERS)
-            logger.info(f"GET {BASE_URL}posts - Status Code: {response.status_code}")
+            response = api_client.get("posts", stream=config.STREAM_JSON)
+            logger.info(f"GET {response.url} - Status Code: {response.status_code}")
             assert response.status_code == 200
             
-            # Parsing and validating response
-            response_data = response.json()
-            assert isinstance(response_data, list)
+            # Parsing the list and validating each post using post schema
+            # (item by item as it is decoded when API_STREAM_JSON=true)
+            response_data = read_items(response, post_schema)
             logger.info(f"Response contains {len(response_data)} items")
             assert len(response_data) == 100
-
-            # Validate each post data using post schema
-            for item in response_data:
-                validate(instance=item, schema=post_schema)
             logger.info("All items validated successfully against the schema")
         
         except requests.exceptions.RequestException as e:
@@ -59,7 +58,8 @@ class TestPostAPI:
             logger.info("Finished test: test_get_posts")
 
     @pytest.mark.posts_tests
-    def test_get_post(self, post_schema):
+    @pytest.mark.latency_budget(p95_ms=500, max_ms=2000)
+    def test_get_post(self, api_client, post_schema):
         """
         Test fetching a single post from the API.
 
@@ -74,13 +74,14 @@ class TestPostAPI:
         Handles exceptions for HTTP requests, schema validation, and unexpected errors.
 
         Args:
-            post_schema (dict): JSON schema for validating the post object.
+            api_client (ApiClient): The shared pooled HTTP client used to send requests.
+            post_schema (CompiledSchema): JSON schema for validating the post object.
         """
         logger.info("Starting test: test_get_post")
         try:
             # Sending GET request for a specific post
-            response = requests.get(url=f"{BASE_URL}posts/2", headers=HEADERS)
-            logger.info(f"GET {BASE_URL}posts/2 - Status Code: {response.status_code}")
+            response = api_client.get("posts/2")
+            logger.info(f"GET {response.url} - Status Code: {response.status_code}")
             assert response.status_code == 200
 
             # Parsing and validating response
@@ -90,7 +91,7 @@ class TestPostAPI:
             logger.info(f"Response data ID: {response_data['id']} matches the expected value")
 
             # Validate post data using post schema
-            validate(instance=response_data, schema=post_schema)
+            post_schema.validate(response_data, body=response.content)
             logger.info("Post data validated successfully against the schema")
         
         except requests.exceptions.RequestException as e:
@@ -0,0 +1,106 @@
+import pytest
+from utils.deadlines import DeadlineExceeded
+from utils.http_client import ApiClient
+from utils.local_server import FaultInjector, LocalApiServer
+from utils.response_cache import CacheMissError, ResponseStore
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def response_store(tmp_path):
+    """
+    Fixture providing an empty response store in a temporary directory.
+
+    Returns:
+        ResponseStore: The store the record and replay clients share.
+    """
+    return ResponseStore(str(tmp_path / "api_cache"))
+
+
+@pytest.mark.cache_tests
+class TestResponseCache:
+    @pytest.mark.parametrize("status", [408, 429, 503])
+    def test_transient_failure_is_not_recorded(self, response_store, status):
+        """
+        Test that a throttled, timed-out or retried failure is never replayed.
+
+        A stand-in server answering every request with `status` is called in
+        record mode, then the same request is sent in replay mode:
+        - The recording client gets the failure from the server.
+        - Nothing was recorded, so the replay raises CacheMissError.
+
+        Args:
+            response_store (ResponseStore): The empty store both clients share.
+            status (int): The transient status injected by the server.
+        """
+        faults = FaultInjector(error_rate=1.0, error_status=status)
+        with LocalApiServer(faults=faults) as server:
+            recorder = ApiClient(base_url=server.url, retries=0, cache_mode="record", cache_store=response_store)
+            try:
+                response = recorder.get("posts/1")
+                logger.info(f"GET {response.url} - Status Code: {response.status_code} (record)")
+                assert response.status_code == status
+            finally:
+                recorder.close()
+
+            replayer = ApiClient(base_url=server.url, retries=0, cache_mode="replay", cache_store=response_store)
+            try:
+                with pytest.raises(CacheMissError):
+                    replayer.get("posts/1")
+            finally:
+                replayer.close()
+
+    def test_not_found_is_replayed(self, response_store):
+        """
+        Test that a deterministic 4xx is recorded and replayed like a success.
+
+        Args:
+            response_store (ResponseStore): The empty store both clients share.
+        """
+        with LocalApiServer() as server:
+            recorder = ApiClient(base_url=server.url, retries=0, cache_mode="record", cache_store=response_store)
+            replayer = ApiClient(base_url=server.url, retries=0, cache_mode="replay", cache_store=response_store)
+            try:
+                assert recorder.get("posts/0").status_code == 404
+                response = replayer.get("posts/0")
+                assert response.status_code == 404
+                assert response.from_cache
+            finally:
+                recorder.close()
+                replayer.close()
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_slow_body_is_read_under_the_deadline_while_recording(self, response_store, stream):
+        """
+        Test that recording a response does not lift the per-request deadline.
+
+        The recording adapter reads the body before the client sees the
+        response, so a server trickling its body out past the deadline must
+        still fail the request:
+        - The request raises DeadlineExceeded and is counted as a timeout.
+        - The partly read response was not recorded, so the replay raises CacheMissError.
+
+        Args:
+            response_store (ResponseStore): The empty store both clients share.
+            stream (bool): Whether the caller asks for a streamed response.
+        """
+        # each tenth of the body arrives within the read timeout, the whole body does not
+        faults = FaultInjector(body_latency_ms=1500)
+        with LocalApiServer(faults=faults) as server:
+            recorder = ApiClient(base_url=server.url, retries=0, cache_mode="record", cache_store=response_store)
+            recorder.deadline.request_seconds = 0.3
+            try:
+                with pytest.raises(DeadlineExceeded):
+                    recorder.get("posts/1", stream=stream)
+                assert recorder.counters.timeouts == 1
+            finally:
+                recorder.close()
+
+            replayer = ApiClient(base_url=server.url, retries=0, cache_mode="replay", cache_store=response_store)
+            try:
+                with pytest.raises(CacheMissError):
+                    replayer.get("posts/1")
+            finally:
+                replayer.close()
@@ -1,14 +1,14 @@
 import pytest
 import requests
-from config import BASE_URL, HEADERS
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 import logging
 
 logger = logging.getLogger(__name__)
 
 class TestUsersAPI:
     @pytest.mark.users_tests
-    def test_fetch_all_users(self, user_schema):
+    @pytest.mark.latency_budget(p95_ms=500, max_ms=2000)
+    def test_fetch_all_users(self, api_client, user_schema):
         """
         Test fetching all users from the API.
 
@@ -24,13 +24,14 @@ class TestUsersAPI:
         and unexpected errors.
 
         Args:
-            user_schema (dict): The JSON schema used to validate user data.
+            api_client (ApiClient): The shared pooled HTTP client used to send requests.
+            user_schema (CompiledSchema): The JSON schema used to validate user data.
         """
         logger.info("Starting test: test_fetch_all_users")
         try:
             # Send a GET request to fetch all users
-            response = requests.get(url=f"{BASE_URL}users", headers=HEADERS)
-            logger.info(f"GET {BASE_URL}users - Status Code: {response.status_code}")
+            response = api_client.get("users")
+            logger.info(f"GET {response.url} - Status Code: {response.status_code}")
             assert response.status_code == 200
 
             # Validate the response data
@@ -40,8 +41,7 @@ class TestUsersAPI:
             logger.info(f"Response contains {len(response_data)} users")
 
             # Validate each user against the JSON schema
-            for item in response_data:
-                validate(instance=item, schema=user_schema)
+            user_schema.validate_many(response_data, body=response.content)
             logger.info("All users validated successfully against the schema")
 
         except requests.exceptions.RequestException as e:
@@ -60,7 +60,8 @@ class TestUsersAPI:
             logger.info("Finished test: test_fetch_all_users")
 
     @pytest.mark.users_tests
-    def test_fetch_single_user(self, user_schema):
+    @pytest.mark.latency_budget(p95_ms=500, max_ms=2000)
+    def test_fetch_single_user(self, api_client, user_schema):
         """
         Test fetching a single user from the API.
 
@@ -76,13 +77,14 @@ class TestUsersAPI:
         and unexpected errors.
 
         Args:
-            user_schema (dict): The JSON schema used to validate user data.
+            api_client (ApiClient): The shared pooled HTTP client used to send requests.
+            user_schema (CompiledSchema): The JSON schema used to validate user data.
         """
         logger.info("Starting test: test_fetch_single_user")
         try:
             # Send a GET request to fetch a single user
-            response = requests.get(url=f"{BASE_URL}users/1", headers=HEADERS)
-            logger.info(f"GET {BASE_URL}users/1 - Status Code: {response.status_code}")
+            response = api_client.get("users/1")
+            logger.info(f"GET {response.url} - Status Code: {response.status_code}")
             assert response.status_code == 200
 
             # Validate the response data
@@ -92,7 +94,7 @@ class TestUsersAPI:
             logger.info(f"User data contains expected keys: {user_data.keys()}")
 
             # Validate the user data against the JSON schema
-            validate(instance=user_data, schema=user_schema)
+            user_schema.validate(user_data, body=response.content)
             logger.info("User data validated successfully against the schema")
 
         except requests.exceptions.RequestException as e:
@@ -111,7 +113,7 @@ class TestUsersAPI:
             logger.info("Finished test: test_fetch_single_user")
 
     @pytest.mark.users_tests
-    def test_search_for_user(self, user_schema):
+    def test_search_for_user(self, api_client, user_schema):
         """
         Test searching for a user by query parameter.
 
@@ -126,13 +128,14 @@ class TestUsersAPI:
         and unexpected errors.
 
         Args:
-            user_schema (dict): The JSON schema used to validate user data.
+            api_client (ApiClient): The shared pooled HTTP client used to send requests.
+            user_schema (CompiledSchema): The JSON schema used to validate user data.
         """
         logger.info("Starting test: test_search_for_user")
         try:
             # Send a GET request to search for a user
-            response = requests.get(url=f"{BASE_URL}/users?id=2", headers=HEADERS)
-            logger.info(f"GET {BASE_URL}/users?id=2 - Status Code: {response.status_code}")
+            response = api_client.get("users", params={"id": 2})
+            logger.info(f"GET {response.url} - Status Code: {response.status_code}")
             assert response.status_code == 200
 
             # Validate the search response data
@@ -141,9 +144,8 @@ class TestUsersAPI:
             assert isinstance(data, list)
             logger.info(f"Search result contains {len(data)} user(s)")
 
-            # Validate the user data against the JSON schema
-            response_data = data[0]
-            validate(instance=response_data, schema=user_schema)
+            # Validate the whole search result against the JSON schema
+            user_schema.validate_many(data, body=response.content)
             logger.info("User search result validated successfully against the schema")
 
         except requests.exceptions.RequestException as e:
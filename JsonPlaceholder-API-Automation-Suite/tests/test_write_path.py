@@ -0,0 +1,67 @@
+import pytest
+import json
+import config
+from utils.async_engine import AsyncEngine
+from utils.write_path import WRITE_PROPERTY, WRITE_VERBS, run_batch, write_endpoints
+import logging
+
+logger = logging.getLogger(__name__)
+
+WRITE_RESOURCES = ("posts", "comments")
+
+
+@pytest.fixture(scope="module")
+def write_spec():
+    """
+    Fixture reading the resources' schemas and ID ranges from the endpoint spec.
+
+    Returns:
+        dict: Resource name mapped to its entry in resource/endpoint_matrix.json.
+    """
+    with open(config.ENDPOINT_MATRIX) as spec_file:
+        return json.load(spec_file)["resources"]
+
+
+@pytest.mark.write_tests
+class TestWritePath:
+    @pytest.mark.parametrize("resource", WRITE_RESOURCES)
+    @pytest.mark.parametrize("verb", WRITE_VERBS)
+    def test_write_batch(self, api_client, schema_registry, write_spec, resource, verb, record_property):
+        """
+        Test a batch of create, update or delete requests for one resource.
+
+        Sends API_WRITE_BATCH_SIZE requests of the verb with at most
+        API_WRITE_CONCURRENCY in flight over the shared pooled client, with
+        bodies generated from the resource's JSON schema, and checks each response:
+        - POST returns 201 and echoes the payload with a new ID.
+        - PUT returns 200 and echoes the replacement, PATCH returns 200 with the patched field.
+        - DELETE returns 200 with an empty object.
+        - Created and updated resources adhere to the resource's JSON schema.
+
+        The batch's throughput and latency percentiles are recorded in the
+        reports and summarized per verb at the end of the run.
+
+        Args:
+            api_client (ApiClient): The shared pooled HTTP client the batch is sent with.
+            schema_registry (SchemaRegistry): Provides the schema the payloads are generated from.
+            write_spec (dict): The resources' entries in the endpoint spec.
+            resource (str): The resource written to.
+            verb (str): The HTTP method of the batch.
+            record_property (callable): Records the batch's throughput in the reports.
+        """
+        spec = write_spec[resource]
+        endpoints = write_endpoints(resource, verb, spec, schema_registry.get(spec["schema"]))
+        engine = AsyncEngine(api_client, schema_registry, concurrency=config.WRITE_CONCURRENCY)
+
+        results, summary = run_batch(engine, endpoints)
+        logger.info(
+            f"{verb} {resource}: {summary['count']} requests in {summary['duration']}s "
+            f"({summary['throughput_rps']} req/s, p95 {summary['p95']} ms, {summary['errors']} errors)"
+        )
+        record_property(WRITE_PROPERTY, json.dumps({"verb": verb, "resource": resource, **summary}))
+
+        failures = [f"{endpoint_id}: {result.error}" for endpoint_id, result in results.items() if not result.passed]
+        for failure in failures:
+            logger.error(failure)
+        if failures:
+            pytest.fail(f"{len(failures)} of {len(results)} {verb} requests failed:\n" + "\n".join(failures[:10]))
@@ -0,0 +1,236 @@
+"""
+Client-side adaptive concurrency control for rate-limited API targets.
+
+A fixed number of requests in flight is either too low for a fast target or
+too high for a shared one, where it turns into 429/503 responses and
+timeouts. The AdaptiveLimiter finds the limit at run time with AIMD
+(additive increase, multiplicative decrease), as TCP congestion control does:
+
+- every successful request raises the limit by `1 / limit`, so about one
+  slot per round of requests;
+- a 429/503, a timeout or connection failure, or a latency above
+  `latency_tolerance` times the fastest latency seen for that endpoint,
+  multiplies the limit by `backoff`. Only requests sent after the previous
+  decrease can cause another one, so a burst of failures of requests already
+  in flight counts as a single congestion signal;
+- a `Retry-After` header on a 429/503 holds every new request until the
+  given time, and idempotent requests rejected that way are sent again.
+
+The ApiClient runs every request through the limiter when one is given, so
+the batched checks, the tests and the load mode all share it. Each process
+(and so each pytest-xdist worker) has its own limiter.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+import requests
+
+import config
+
+logger = logging.getLogger(__name__)
+
+OVERLOAD_STATUSES = (429, 503)  # responses meaning the target wants fewer requests
+CONVERGED_SMOOTHING = 0.05  # weight of the latest limit in the converged (smoothed) limit
+
+
+def retry_after_seconds(value, now=None):
+    """
+    Parses a `Retry-After` header.
+
+    Args:
+        value (str): Delay in seconds, or an HTTP date.
+        now (float): Current UNIX time, defaults to `time.time()`.
+
+    Returns:
+        float: Seconds to wait, None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - (time.time() if now is None else now))
+
+
+class AdaptiveLimiter:
+    """
+    An AIMD limit on the number of requests in flight.
+
+    Attributes:
+        limit (float): The current limit; `int(limit)` requests may be in flight.
+        min_limit (int): The limit never drops below this.
+        max_limit (int): The limit never grows above this (keep it <= the connection pool size).
+        backoff (float): Factor applied to the limit on a congestion signal.
+        latency_tolerance (float): A latency above this many times an endpoint's fastest one is a congestion signal.
+        latency_floor_ms (float): Latencies below this are never a congestion signal.
+        max_wait (float): Longest `Retry-After` pause honoured, in seconds.
+        converged (float): The limit smoothed over the completed requests, logged as the converged limit.
+    """
+
+    def __init__(
+        self,
+        initial=config.ADAPTIVE_INITIAL_LIMIT,
+        min_limit=config.ADAPTIVE_MIN_LIMIT,
+        max_limit=config.ADAPTIVE_MAX_LIMIT,
+        backoff=config.ADAPTIVE_BACKOFF,
+        latency_tolerance=config.ADAPTIVE_LATENCY_TOLERANCE,
+        latency_floor_ms=config.ADAPTIVE_LATENCY_FLOOR_MS,
+        max_wait=config.READ_TIMEOUT,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.latency_floor_ms = latency_floor_ms
+        self.max_wait = max_wait
+        self.converged = self.limit
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.counts = {"requests": 0, "increases": 0, "decreases": 0, "overloaded": 0, "failed": 0, "retry_after": 0}
+        self._fastest_ms = {}
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        """
+        Waits for a free slot (and for any `Retry-After` pause), then holds it.
+
+        Yields:
+            float: The time the request was let through, passed back to `observe()`.
+        """
+        with self._condition:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    break
+                self._condition.wait(wait if wait > 0 else None)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            yield time.monotonic()
+        finally:
+            with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def observe(self, started, endpoint=None, latency_ms=None, status=None, retry_after=None, error=None):
+        """
+        Adjusts the limit from the outcome of one request.
+
+        Args:
+            started (float): The time the request was let through, as yielded by `slot()`.
+            endpoint (str): Endpoint name the latency baseline is kept for.
+            latency_ms (float): The request latency.
+            status (int): The response status code, None if the request failed.
+            retry_after (float): Seconds the target asked to wait, if it sent `Retry-After`.
+            error (Exception): The exception raised by the request, if any.
+        """
+        with self._condition:
+            self.counts["requests"] += 1
+            congested = False
+            if error is not None:
+                self.counts["failed"] += 1
+                congested = True
+            elif status in OVERLOAD_STATUSES:
+                self.counts["overloaded"] += 1
+                congested = True
+                if retry_after is not None:
+                    self.counts["retry_after"] += 1
+                    self._paused_until = max(self._paused_until, time.monotonic() + min(retry_after, self.max_wait))
+            elif latency_ms is not None:
+                fastest = min(self._fastest_ms.get(endpoint, latency_ms), latency_ms)
+                self._fastest_ms[endpoint] = fastest
+                congested = latency_ms > max(fastest * self.latency_tolerance, self.latency_floor_ms)
+
+            if congested:
+                if started >= self._last_decrease:
+                    self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                    self._last_decrease = time.monotonic()
+                    self.counts["decreases"] += 1
+                    logger.debug(f"Concurrency limit decreased to {self.limit:.1f}")
+            elif self.limit < self.max_limit:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+                self.counts["increases"] += 1
+            self.converged += CONVERGED_SMOOTHING * (self.limit - self.converged)
+            self._condition.notify_all()
+
+    def summary(self):
+        """
+        Returns:
+            dict: The current and converged limits, the peak in flight and the signal counts.
+        """
+        with self._condition:
+            return {
+                "limit": round(self.limit, 1),
+                "converged": round(self.converged, 1),
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "peak_in_flight": self.peak_in_flight,
+                **self.counts,
+            }
+
+    def log_summary(self, log=logger):
+        """Logs the limit the controller converged on."""
+        summary = self.summary()
+        log.info(
+            f"Adaptive concurrency converged on {summary['converged']} requests in flight "
+            f"(current {summary['limit']}, peak {summary['peak_in_flight']}, range {self.min_limit}-{self.max_limit}) "
+            f"after {summary['requests']} requests: {summary['decreases']} decreases, "
+            f"{summary['overloaded']} 429/503 responses ({summary['retry_after']} with Retry-After), "
+            f"{summary['failed']} failed requests"
+        )
+        return summary
+
+
+def send_limited(limiter, send, method, endpoint_of, retries=config.ADAPTIVE_RETRIES):
+    """
+    Sends a request through an AdaptiveLimiter.
+
+    Idempotent requests answered with 429/503 are sent again, up to `retries`
+    times; the limiter holds them until any `Retry-After` has passed.
+
+    Args:
+        limiter (AdaptiveLimiter): The limiter.
+        send (callable): Sends the request once and returns the response.
+        method (str): The HTTP method, only GET, HEAD and OPTIONS are sent again.
+        endpoint_of (callable): Returns the endpoint name of a response, the key of its latency baseline.
+        retries (int): Maximum number of times an overloaded request is sent again.
+
+    Returns:
+        requests.Response: The last response.
+    """
+    attempt = 0
+    while True:
+        with limiter.slot() as started:
+            start = time.perf_counter()
+            try:
+                response = send()
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                limiter.observe(started, error=e)
+                raise
+            retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+            limiter.observe(
+                started,
+                endpoint=endpoint_of(response),
+                latency_ms=(time.perf_counter() - start) * 1000,
+                status=response.status_code,
+                retry_after=retry_after,
+            )
+        if (
+            response.status_code not in OVERLOAD_STATUSES
+            or method.upper() not in ("GET", "HEAD", "OPTIONS")
+            or attempt >= retries
+        ):
+            return response
+        attempt += 1
+        response.close()
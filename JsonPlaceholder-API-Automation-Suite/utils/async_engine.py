@@ -0,0 +1,160 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import config
+from utils.endpoints import failure_message
+
+
+@dataclass
+class CheckResult:
+    """
+    The outcome of one endpoint check run by the AsyncEngine.
+
+    Attributes:
+        endpoint (Endpoint): The endpoint that was checked.
+        url (str): The requested URL.
+        status_code (int): The response status code, None if the request failed.
+        elapsed (float): Seconds from sending the request to finishing the checks.
+        error (str): Why the check failed, None if it passed.
+        timing (RequestTiming): Timing details of the HTTP request, None if it failed.
+    """
+
+    endpoint: object
+    url: str = None
+    status_code: int = None
+    elapsed: float = 0.0
+    error: str = None
+    timing: object = None
+
+    @property
+    def passed(self):
+        return self.error is None
+
+
+class AsyncEngine:
+    """
+    Runs many endpoint checks concurrently over the shared ApiClient.
+
+    Requests are issued from an asyncio event loop with at most `concurrency`
+    in flight, and each response is decoded and validated as soon as it
+    arrives instead of after the whole batch. The blocking `requests` calls run
+    on a dedicated thread pool, so the pooled keep-alive connections, retries
+    and the record/replay cache of the ApiClient all still apply.
+
+    Attributes:
+        client (ApiClient): The shared HTTP client.
+        schema_registry (SchemaRegistry): Registry providing the compiled schemas.
+        concurrency (int): Maximum number of requests in flight.
+    """
+
+    def __init__(self, client, schema_registry, concurrency=config.ASYNC_CONCURRENCY):
+        self.client = client
+        self.schema_registry = schema_registry
+        self.concurrency = concurrency
+
+    def run(self, endpoints):
+        """
+        Checks every endpoint and waits for all of them to finish.
+
+        Args:
+            endpoints (iterable): The Endpoint objects to check.
+
+        Returns:
+            dict: Endpoint id mapped to its CheckResult.
+        """
+        endpoints = list(endpoints)
+        if not endpoints:
+            return {}
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="api-check") as executor:
+            results = asyncio.run(self._run_all(endpoints, executor))
+        return {result.endpoint.id: result for result in results}
+
+    async def _run_all(self, endpoints, executor):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*(self._check(endpoint, semaphore, executor) for endpoint in endpoints))
+
+    async def _check(self, endpoint, semaphore, executor):
+        """Sends one request, then verifies the response while other requests are in flight."""
+        loop = asyncio.get_running_loop()
+        result = CheckResult(endpoint, url=self.client.url(endpoint.path))
+        start = time.perf_counter()
+        try:
+            async with semaphore:
+                response = await loop.run_in_executor(
+                    executor,
+                    lambda: self.client.request(
+                        endpoint.method, endpoint.path, params=list(endpoint.params), json=endpoint.payload,
+                        stream=endpoint.streamed,
+                    ),
+                )
+            result.url = response.url
+            result.status_code = response.status_code
+            result.timing = response.timing
+            self.verify(endpoint, response)
+        except Exception as e:
+            result.error = failure_message(e)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def verify(self, endpoint, response):
+        """
+        Checks the status code, body and schema of a response.
+
+        Args:
+            endpoint (Endpoint): The endpoint the response belongs to.
+            response (requests.Response): The response to verify.
+
+        Raises:
+            AssertionError: If the status code or the body is not what the endpoint expects.
+            ValidationError: If the body does not match the schema.
+        """
+        schema = self.schema_registry.get(endpoint.schema) if endpoint.schema else None
+        endpoint.verify_response(response, schema)
+
+
+class BatchedChecks:
+    """
+    Runs a long, ordered list of endpoint checks in batches, on demand.
+
+    The first time the result of an endpoint is asked for, the endpoints of
+    its batch that have not been run yet are checked concurrently by the
+    AsyncEngine; the results of the rest of the batch are kept for the tests
+    that follow. Thousands of checks thus run a batch at a time over the
+    shared keep-alive connections, without front-loading the whole list
+    before the first test reports.
+
+    Attributes:
+        engine (AsyncEngine): The engine running each batch.
+        batches (list): The batches of endpoints to check, each a list, in the order their tests run.
+        runs (int): Number of batches run so far.
+    """
+
+    def __init__(self, engine, batches):
+        self.engine = engine
+        self.batches = [list(batch) for batch in batches]
+        self.runs = 0
+        self._batch_of = {endpoint.id: batch for batch in self.batches for endpoint in batch}
+        self._results = {}
+
+    def result(self, endpoint):
+        """
+        Returns the CheckResult of an endpoint, running its batch first if needed.
+
+        Results are kept, so asking for the same endpoint again returns the same result.
+
+        Args:
+            endpoint (Endpoint): An endpoint of `batches`, or any other endpoint, which is then checked alone.
+
+        Returns:
+            CheckResult: The outcome of the check.
+        """
+        if endpoint.id not in self._results:
+            batch = [
+                pending for pending in self._batch_of.get(endpoint.id, [endpoint])
+                if pending.id not in self._results
+            ]
+            self._results.update(self.engine.run(batch))
+            self.runs += 1
+        return self._results[endpoint.id]
@@ -0,0 +1,325 @@
+"""
+Micro-benchmarks of the API framework's own hot paths, without the network.
+
+Measures what the suite costs on top of the API under test: loading and
+compiling the schemas, validating 10/100/500/50k-item payloads, decoding
+JSON (whole body and streamed), a log call through the execution log
+pipeline, and setting up and tearing down the session fixtures. Payloads are
+canned from the seeded stand-in dataset (`utils/local_server.py`), so they
+match `resource/*_schema.json` and are identical on every run.
+
+Every benchmark is calibrated to run for at least `--min-time` seconds per
+round, with the garbage collector off as `timeit` does, and reports the
+median, minimum and spread of the time per operation over `--rounds` rounds.
+Results are written as JSON and compared against a stored baseline: a
+benchmark whose median is more than `--threshold` slower than the baseline is
+a regression and makes the command exit with status 1.
+
+Usage:
+    python -m utils.benchmarks --save-baseline          # record the baseline on this machine
+    python -m utils.benchmarks                          # run and compare against it
+    python -m utils.benchmarks --filter validate --threshold 0.1
+"""
+import argparse
+import fnmatch
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import config
+from utils.http_client import ApiClient
+from utils.json_stream import iter_json_array
+from utils.local_server import LocalApiServer, build_dataset
+from utils.log_pipeline import LogPipeline
+from utils.schema_registry import SchemaRegistry
+
+PAYLOAD_SIZES = (10, 100, 500, 50000)  # items per canned list payload
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """
+    Registers a benchmark.
+
+    The decorated function does the untimed setup and returns `(operation, cleanup)`:
+    `operation` is called repeatedly and timed, `cleanup` (or None) is called once afterwards.
+
+    Args:
+        name (str): Unique benchmark name (e.g. "validate_many[comments-500]").
+    """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def canned_payloads():
+    """
+    Returns:
+        dict: Resource name mapped to a deterministic list of at least 50k items matching its schema.
+    """
+    if not hasattr(canned_payloads, "cache"):
+        # 100 users x 100 posts x 5 comments = 50k comments, same seed as the stand-in server
+        canned_payloads.cache = build_dataset(seed=config.LOCAL_SERVER_SEED, users=100, posts_per_user=100)
+    return canned_payloads.cache
+
+
+@benchmark("schema_load")
+def bench_schema_load():
+    def load():
+        registry = SchemaRegistry()
+        for name in registry.names():
+            registry.get(name)
+    return load, None
+
+
+@benchmark("validate[user]")
+def bench_validate_one():
+    schema = SchemaRegistry().get("user")
+    user = canned_payloads()["users"][0]
+    return lambda: schema.validate(user), None
+
+
+for _size in PAYLOAD_SIZES:
+    @benchmark(f"validate_many[comments-{_size}]")
+    def bench_validate_many(size=_size):
+        schema = SchemaRegistry().get("comment")
+        items = canned_payloads()["comments"][:size]
+        return lambda: schema.validate_many(items), None
+
+
+for _size in PAYLOAD_SIZES:
+    @benchmark(f"json_decode[comments-{_size}]")
+    def bench_json_decode(size=_size):
+        body = json.dumps(canned_payloads()["comments"][:size]).encode()
+        return lambda: json.loads(body), None
+
+
+for _size in PAYLOAD_SIZES:
+    @benchmark(f"json_stream[comments-{_size}]")
+    def bench_json_stream(size=_size):
+        body = json.dumps(canned_payloads()["comments"][:size]).encode()
+        chunk_size = config.STREAM_CHUNK_SIZE
+        chunks = [body[offset:offset + chunk_size] for offset in range(0, len(body), chunk_size)]
+
+        def stream():
+            for _ in iter_json_array(chunks):
+                pass
+        return stream, None
+
+
+@benchmark("log_call")
+def bench_log_call():
+    directory = tempfile.mkdtemp(prefix="bench-logs-")
+    pipeline = LogPipeline(directory=directory, worker="bench", max_bytes=0).start()
+    logger = logging.getLogger("benchmarks")
+
+    def cleanup():
+        pipeline.stop()
+        for file_name in os.listdir(directory):
+            os.remove(os.path.join(directory, file_name))
+        os.rmdir(directory)
+    return lambda: logger.info("GET %s - Status Code: %s", "http://127.0.0.1/posts/1", 200), cleanup
+
+
+@benchmark("fixture[api_client]")
+def bench_api_client_fixture():
+    def setup_teardown():
+        ApiClient(base_url="http://127.0.0.1:9/").close()
+    return setup_teardown, None
+
+
+@benchmark("fixture[local_api_server]")
+def bench_local_server_fixture():
+    dataset = build_dataset()
+
+    def setup_teardown():
+        # stop() waits up to the server's poll_interval (50 ms) for the serving loop to exit
+        LocalApiServer(dataset=dataset).start().stop()
+    return setup_teardown, None
+
+
+def calibrate(operation, min_time):
+    """
+    Returns:
+        int: Calls per round so that one round takes at least `min_time` seconds.
+    """
+    number = 1
+    while True:
+        elapsed = time_calls(operation, number)
+        if elapsed >= min_time:
+            return number
+        number = max(number * 2, int(number * min_time / elapsed * 1.1) if elapsed > 0 else number * 10)
+
+
+def time_calls(operation, number):
+    """
+    Returns:
+        float: Seconds taken by `number` calls of `operation`, with the garbage collector off.
+    """
+    gc_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def run_benchmark(name, rounds, min_time):
+    """
+    Runs one registered benchmark.
+
+    Args:
+        name (str): The benchmark name.
+        rounds (int): Number of timed rounds.
+        min_time (float): Minimum seconds per round.
+
+    Returns:
+        dict: Median, minimum and standard deviation of the time per operation in microseconds,
+        the number of rounds and the calls per round.
+    """
+    operation, cleanup = BENCHMARKS[name]()
+    try:
+        operation()  # warm-up: imports, lazy compilation, caches
+        number = calibrate(operation, min_time)
+        per_op = [time_calls(operation, number) / number * 1e6 for _ in range(rounds)]
+    finally:
+        if cleanup:
+            cleanup()
+    return {
+        "median_us": round(statistics.median(per_op), 3),
+        "min_us": round(min(per_op), 3),
+        "stdev_us": round(statistics.stdev(per_op), 3) if len(per_op) > 1 else 0.0,
+        "rounds": rounds,
+        "number": number,
+    }
+
+
+def run(patterns=None, rounds=config.BENCHMARK_ROUNDS, min_time=config.BENCHMARK_MIN_TIME, log=print):
+    """
+    Runs the benchmarks whose name matches one of `patterns`.
+
+    Args:
+        patterns (list): Glob patterns or substrings of benchmark names, None runs every benchmark.
+        rounds (int): Number of timed rounds per benchmark.
+        min_time (float): Minimum seconds per round.
+        log (callable): Called with a progress line after every benchmark.
+
+    Returns:
+        dict: The results document (environment and results by benchmark name).
+    """
+    names = [
+        name for name in BENCHMARKS
+        if not patterns or any(pattern in name or fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    ]
+    results = {}
+    for name in names:
+        results[name] = run_benchmark(name, rounds, min_time)
+        log(f"{name:<36} {results[name]['median_us']:>14,.1f} us/op (min {results[name]['min_us']:,.1f}, "
+            f"stdev {results[name]['stdev_us']:,.1f}, {rounds} x {results[name]['number']})")
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=config.BENCHMARK_THRESHOLD):
+    """
+    Compares results against a baseline by median time per operation.
+
+    Args:
+        current (dict): The results document of this run.
+        baseline (dict): The stored results document.
+        threshold (float): Allowed slowdown as a fraction (0.2 = 20% slower).
+
+    Returns:
+        list: (name, baseline median, current median, ratio, regressed) for every benchmark in both.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        ratio = result["median_us"] / previous["median_us"] if previous["median_us"] else 1.0
+        rows.append((name, previous["median_us"], result["median_us"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the API framework's own hot paths, offline.")
+    parser.add_argument("--filter", action="append", metavar="PATTERN",
+                        help="only run benchmarks whose name contains or glob-matches PATTERN (repeatable)")
+    parser.add_argument("--rounds", type=int, default=config.BENCHMARK_ROUNDS, help="timed rounds per benchmark")
+    parser.add_argument("--min-time", type=float, default=config.BENCHMARK_MIN_TIME, help="minimum seconds per round")
+    parser.add_argument("--output", default="benchmark_results.json", help="path of the JSON results")
+    parser.add_argument("--baseline", default=config.BENCHMARK_BASELINE, help="path of the stored baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=config.BENCHMARK_THRESHOLD,
+                        help="slowdown, as a fraction of the baseline, that counts as a regression")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    current = run(args.filter, args.rounds, args.min_time)
+    with open(args.output, "w") as results_file:
+        json.dump(current, results_file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        baseline = {"created": current["created"], "environment": current["environment"], "results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as baseline_file:
+                baseline = json.load(baseline_file)
+        # a filtered run only replaces the benchmarks it ran
+        baseline["results"].update(current["results"])
+        baseline["created"], baseline["environment"] = current["created"], current["environment"]
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(baseline, baseline_file, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --save-baseline to record one")
+        return 0
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline.get("environment") != current["environment"]:
+        print(f"Warning: the baseline was recorded on another environment: {baseline.get('environment')}")
+
+    rows = compare(current, baseline, args.threshold)
+    regressions = [row for row in rows if row[4]]
+    print(f"\n{'benchmark':<36} {'baseline us':>14} {'current us':>14} {'change':>8}")
+    for name, previous, median, ratio, regressed in rows:
+        print(f"{name:<36} {previous:>14,.1f} {median:>14,.1f} {ratio - 1:>+8.1%}"
+              f"{'  REGRESSION' if regressed else ''}")
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) more than {args.threshold:.0%} slower than the baseline")
+        return 1
+    print(f"\nNo benchmark more than {args.threshold:.0%} slower than the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
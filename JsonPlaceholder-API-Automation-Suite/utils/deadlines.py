@@ -0,0 +1,325 @@
+"""
+Deadlines and hedged requests for the ApiClient.
+
+Socket timeouts alone do not bound how long a test can spend on requests, so
+the stage time is set by the few connections that stall. Two deadlines cap
+it:
+
+- a per-request deadline (`API_REQUEST_DEADLINE`), the longest one request
+  may take from sending it to having read its body; its connect and read
+  timeouts are clipped to it, and the body is read chunk by chunk and given
+  up with DeadlineExceeded once the deadline has passed, so a server
+  trickling bytes just under the read timeout cannot hold a test past it;
+- a per-test deadline (`API_TEST_DEADLINE`, or `@pytest.mark.deadline(seconds)`)
+  shared by every request of the test; once it has passed, further requests
+  fail at once with DeadlineExceeded instead of waiting on the network.
+
+With `API_HEDGE=true` an idempotent GET that has not answered within the p95
+latency observed so far for its endpoint is sent a second time, and
+whichever response arrives first is used; the other one is closed when it
+arrives. Hedging starts once an endpoint has `API_HEDGE_MIN_SAMPLES`
+latencies, so the p95 is meaningful.
+
+Every test records its timeouts, hedges and hedge wins as the
+`request_deadlines` user property; the run summary and the combined HTML
+report show the totals.
+"""
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pytest
+import requests
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+from urllib3.response import HTTPResponse
+
+import config
+from utils.stats import percentile
+
+MARKER = "deadline"
+DEADLINES_PROPERTY = "request_deadlines"  # user property holding a test's timeouts, hedges and hedge wins
+HEDGED_METHODS = ("GET", "HEAD")
+
+_local = threading.local()
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Raised when a request cannot start, or finish, before its deadline."""
+
+
+class Deadline:
+    """
+    The per-request and per-test deadlines of an ApiClient.
+
+    Attributes:
+        request_seconds (float): Longest time one request may take, 0 for no limit.
+        expires (float): `time.monotonic()` at which the current test's deadline passes, None outside a test deadline.
+    """
+
+    def __init__(self, request_seconds=config.REQUEST_DEADLINE):
+        self.request_seconds = request_seconds
+        self.expires = None
+
+    @contextmanager
+    def scope(self, seconds):
+        """
+        Applies a deadline to every request sent inside the block.
+
+        Args:
+            seconds (float): Seconds from now, 0 or None for no deadline.
+        """
+        previous = self.expires
+        self.expires = time.monotonic() + seconds if seconds else None
+        try:
+            yield self
+        finally:
+            self.expires = previous
+
+    def remaining(self):
+        """
+        Returns:
+            float: Seconds left before the test deadline, None if there is none.
+        """
+        return None if self.expires is None else self.expires - time.monotonic()
+
+    def timeout(self, timeout):
+        """
+        Clips a requests timeout to the request and test deadlines.
+
+        Args:
+            timeout (float or tuple): The (connect, read) timeout, or a single timeout, the caller asked for.
+
+        Returns:
+            float or tuple: The timeout to send the request with.
+
+        Raises:
+            DeadlineExceeded: If the test deadline has already passed.
+        """
+        limit = self.budget()
+        if limit is None:
+            return timeout
+        if limit <= 0:
+            raise DeadlineExceeded(f"test deadline passed {-limit:.2f}s ago, request not sent")
+        if isinstance(timeout, tuple):
+            return tuple(limit if part is None else min(part, limit) for part in timeout)
+        return limit if timeout is None else min(timeout, limit)
+
+    def budget(self):
+        """
+        Returns:
+            float: Seconds the next request may take in total, None if unlimited.
+        """
+        budget = [seconds for seconds in (self.request_seconds or None, self.remaining()) if seconds is not None]
+        return min(budget) if budget else None
+
+    def expiry(self):
+        """
+        Returns:
+            float: `time.monotonic()` by which a request sent now must have read its body, None if unlimited.
+        """
+        budget = self.budget()
+        return None if budget is None else time.monotonic() + budget
+
+
+@contextmanager
+def body_deadline(expires):
+    """
+    Makes `expires` the body deadline of the requests this thread sends inside the block.
+
+    Lets an adapter that reads the body itself, such as the record/replay cache,
+    read it under the same deadline as the client.
+
+    Args:
+        expires (float): `time.monotonic()` by which a body must have been read, None for no deadline.
+    """
+    previous = current_body_deadline()
+    _local.expires = expires
+    try:
+        yield
+    finally:
+        _local.expires = previous
+
+
+def current_body_deadline():
+    """
+    Returns:
+        float: The body deadline set by `body_deadline()` on this thread, None if there is none.
+    """
+    return getattr(_local, "expires", None)
+
+
+def enforce_body_deadline(response, expires, on_timeout=None):
+    """
+    Makes reading the body of a response requested with `stream=True` fail once `expires` has passed.
+
+    `iter_content()` is wrapped, which also covers `response.content` and
+    `response.json()`, so the deadline holds whether the body is read at once or
+    streamed by the caller. The socket is read with `read1()`, which returns
+    whatever has arrived instead of waiting for a whole chunk, and the deadline
+    is checked after every read; a single read still waits at most the clipped
+    read timeout.
+
+    Args:
+        response (requests.Response): The response, with its body not read yet.
+        expires (float): `time.monotonic()` by which the body must have been read.
+        on_timeout (callable): Called before DeadlineExceeded is raised, e.g. to count it.
+    """
+    if response._content_consumed:
+        # read in full already, e.g. by the cache while recording it: the deadline was enforced there
+        return
+    iter_content = response.iter_content
+
+    def chunks(chunk_size=1, decode_unicode=False):
+        if response._content_consumed or decode_unicode or not isinstance(response.raw, HTTPResponse):
+            # already read, decoded to text, or replayed from memory: nothing left to wait for
+            yield from iter_content(chunk_size, decode_unicode)
+            return
+        try:
+            while chunk := response.raw.read1(chunk_size, decode_content=True):
+                yield chunk
+        except ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e) from e
+        except ReadTimeoutError as e:
+            raise requests.exceptions.ConnectionError(e) from e
+        response._content_consumed = True
+
+    def within_deadline(chunk_size=1, decode_unicode=False):
+        for chunk in chunks(chunk_size, decode_unicode):
+            if time.monotonic() > expires:
+                response.close()
+                if on_timeout is not None:
+                    on_timeout()
+                raise DeadlineExceeded(f"body of {response.url} not read before the deadline")
+            yield chunk
+
+    response.iter_content = within_deadline
+
+
+class HedgePolicy:
+    """
+    Decides after how long a GET is sent a second time: the p95 latency of its endpoint.
+
+    Attributes:
+        enabled (bool): True to hedge idempotent requests.
+        min_samples (int): Latencies an endpoint needs before its requests are hedged.
+        min_delay_ms (float): Requests are never hedged sooner than this.
+        window (int): Number of recent latencies kept per endpoint.
+    """
+
+    def __init__(
+        self,
+        enabled=config.HEDGE,
+        min_samples=config.HEDGE_MIN_SAMPLES,
+        min_delay_ms=config.HEDGE_MIN_DELAY_MS,
+        window=config.HEDGE_WINDOW,
+    ):
+        self.enabled = enabled
+        self.min_samples = min_samples
+        self.min_delay_ms = min_delay_ms
+        self.window = window
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    def delay_ms(self, method, endpoint):
+        """
+        Returns:
+            float: Milliseconds to wait before hedging a request, None if it must not be hedged.
+        """
+        if not self.enabled or method.upper() not in HEDGED_METHODS:
+            return None
+        with self._lock:
+            latencies = list(self._latencies.get(endpoint, ()))
+        if len(latencies) < self.min_samples:
+            return None
+        return max(percentile(latencies, 95), self.min_delay_ms)
+
+    def observe(self, endpoint, total_ms):
+        """Records the latency of a completed request."""
+        with self._lock:
+            self._latencies.setdefault(endpoint, deque(maxlen=self.window)).append(total_ms)
+
+
+class RequestCounters:
+    """
+    Thread-safe counts of the timeouts and hedges of an ApiClient.
+
+    Attributes:
+        timeouts (int): Requests that failed with a timeout or a passed deadline.
+        hedges (int): Requests sent a second time because the first one was slower than the p95.
+        hedge_wins (int): Hedged requests whose second response arrived first.
+    """
+
+    def __init__(self):
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def add(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: The current counts.
+        """
+        with self._lock:
+            return {"timeouts": self.timeouts, "hedges": self.hedges, "hedge_wins": self.hedge_wins}
+
+
+class DeadlinePlugin:
+    """
+    Applies the per-test deadline to the `api_client` and summarizes timeouts and hedges.
+
+    Tests record their counts as `request_deadlines` user properties, and the
+    summary is built from the reports, so it also covers pytest-xdist workers.
+    """
+
+    def __init__(self, test_seconds=config.TEST_DEADLINE):
+        self.test_seconds = test_seconds
+        self.totals = {"timeouts": 0, "hedges": 0, "hedge_wins": 0}
+        self.tests_with_timeouts = []
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_call(self, item):
+        client = item.funcargs.get("api_client")
+        if client is None:
+            return (yield)
+        seconds = self.test_seconds
+        marker = item.get_closest_marker(MARKER)
+        if marker is not None:
+            seconds = marker.args[0] if marker.args else marker.kwargs["seconds"]
+        before = client.counters.snapshot()
+        try:
+            with client.deadline.scope(seconds):
+                return (yield)
+        finally:
+            after = client.counters.snapshot()
+            counts = {name: after[name] - before[name] for name in after}
+            if any(counts.values()):
+                item.user_properties.append((DEADLINES_PROPERTY, json.dumps(counts)))
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call":
+            return
+        for name, value in report.user_properties:
+            if name == DEADLINES_PROPERTY:
+                counts = json.loads(value)
+                for key in self.totals:
+                    self.totals[key] += counts.get(key, 0)
+                if counts.get("timeouts"):
+                    self.tests_with_timeouts.append((report.nodeid, counts["timeouts"]))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not config.HEDGE and not any(self.totals.values()):
+            return
+        terminalreporter.section("deadlines and hedging")
+        terminalreporter.write_line(
+            f"{self.totals['timeouts']} timeouts, {self.totals['hedges']} hedged requests "
+            f"({self.totals['hedge_wins']} answered first by the hedge)"
+        )
+        for nodeid, timeouts in self.tests_with_timeouts:
+            terminalreporter.write_line(f"{nodeid}: {timeouts} timeout(s)", red=True)
@@ -0,0 +1,129 @@
+"""
+Expands the declarative endpoint spec (resource/endpoint_matrix.json) into endpoint checks.
+
+For every resource the spec lists its schema, its pytest marker, the ID range
+and the expected size of the collection, the query filters with the values
+to try and the count each value must return, and the nested collections
+(e.g. `/posts/{id}/comments`). Expanding it yields one Endpoint per
+collection, item lookup, filter value and nested collection:
+
+    {
+      "resources": {
+        "posts": {
+          "schema": "post",
+          "marker": "posts_tests",
+          "ids": {"from": 1, "to": 100},
+          "count": 100,
+          "filters": [{"field": "userId", "values": {"from": 1, "to": 10}, "count": 10}],
+          "nested": [{"resource": "comments", "schema": "comment", "foreign_key": "postId", "count": 5}]
+        }
+      }
+    }
+
+`ids` and `values` are either a list or an inclusive {"from": ..., "to": ...} range.
+"""
+import json
+
+import config
+from utils.endpoints import Endpoint
+
+
+def expand_values(values):
+    """
+    Args:
+        values (list or dict): A list of values, or an inclusive {"from": ..., "to": ...} integer range.
+
+    Returns:
+        list: The values.
+
+    Raises:
+        ValueError: If `values` is neither.
+    """
+    if isinstance(values, dict) and set(values) == {"from", "to"}:
+        return list(range(values["from"], values["to"] + 1))
+    if isinstance(values, list):
+        return values
+    raise ValueError(f"Expected a list or a {{\"from\", \"to\"}} range, got {values!r}")
+
+
+def expand_resource(resource, spec):
+    """
+    Builds the endpoints of one resource of the spec.
+
+    Args:
+        resource (str): The resource path (e.g. "posts").
+        spec (dict): The resource's entry in the spec.
+
+    Returns:
+        list: The collection, item lookup, filter and nested collection endpoints, in that order.
+    """
+    schema = spec.get("schema")
+    markers = (spec["marker"],) if spec.get("marker") else ()
+    ids = expand_values(spec.get("ids", []))
+
+    endpoints = [
+        Endpoint(id=resource, path=resource, schema=schema, many=True,
+                 expected_count=spec.get("count"), markers=markers),
+    ]
+    endpoints += [
+        Endpoint(id=f"{resource}/{item_id}", path=f"{resource}/{item_id}", schema=schema,
+                 expected_fields=(("id", item_id),), markers=markers)
+        for item_id in ids
+    ]
+    for query in spec.get("filters", []):
+        field = query["field"]
+        endpoints += [
+            Endpoint(id=f"{resource}?{field}={value}", path=resource, params=((field, value),), schema=schema,
+                     many=True, expected_count=query.get("count"), expected_fields=((field, value),),
+                     markers=markers)
+            for value in expand_values(query["values"])
+        ]
+    for nested in spec.get("nested", []):
+        child = nested["resource"]
+        foreign_key = nested.get("foreign_key")
+        endpoints += [
+            Endpoint(id=f"{resource}/{item_id}/{child}", path=f"{resource}/{item_id}/{child}",
+                     schema=nested.get("schema"), many=True, expected_count=nested.get("count"),
+                     expected_fields=((foreign_key, item_id),) if foreign_key else (), markers=markers)
+            for item_id in ids
+        ]
+    return endpoints
+
+
+def expand_matrix(spec):
+    """
+    Expands a whole spec into its endpoints.
+
+    Args:
+        spec (dict): The decoded spec, `{"resources": {name: resource spec}}`.
+
+    Returns:
+        list: Every endpoint of every resource.
+
+    Raises:
+        ValueError: If two entries expand to the same endpoint id.
+    """
+    endpoints = [
+        endpoint
+        for resource, resource_spec in spec["resources"].items()
+        for endpoint in expand_resource(resource, resource_spec)
+    ]
+    seen = set()
+    duplicates = {endpoint.id for endpoint in endpoints if endpoint.id in seen or seen.add(endpoint.id)}
+    if duplicates:
+        raise ValueError(f"Duplicate endpoints in the spec: {', '.join(sorted(duplicates))}")
+    return endpoints
+
+
+def load_matrix(path=config.ENDPOINT_MATRIX):
+    """
+    Reads and expands a spec file.
+
+    Args:
+        path (str): Path of the JSON spec.
+
+    Returns:
+        list: Every endpoint the spec describes.
+    """
+    with open(path) as spec_file:
+        return expand_matrix(json.load(spec_file))
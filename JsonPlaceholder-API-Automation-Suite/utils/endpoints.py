@@ -0,0 +1,141 @@
+from dataclasses import dataclass
+
+import requests
+from jsonschema import ValidationError
+
+import config
+from utils.json_stream import read_items
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """
+    A single endpoint check: the request to send and what the response must look like.
+
+    Attributes:
+        id (str): Unique, readable identifier used as the pytest test id (e.g. "posts/2").
+        path (str): The path relative to the base URL.
+        params (tuple): Query parameters as (name, value) pairs.
+        method (str): The HTTP method.
+        schema (str): Name of the schema the response items are validated against.
+        many (bool): True if the response is a list of items, False for a single object.
+        expected_status (int): The expected response status code.
+        expected_count (int): The expected number of items in a list response, None skips the check.
+        expected_fields (tuple): (field, value) pairs the object, or every item of a list, must contain.
+        markers (tuple): Names of the pytest markers the endpoint's test is tagged with (e.g. "posts_tests").
+        payload (dict): JSON body sent with the request (e.g. for POST, PUT and PATCH), None sends no body.
+    """
+
+    id: str
+    path: str
+    params: tuple = ()
+    method: str = "GET"
+    schema: str = None
+    many: bool = False
+    expected_status: int = 200
+    expected_count: int = None
+    expected_fields: tuple = ()
+    markers: tuple = ()
+    payload: dict = None
+
+    @property
+    def streamed(self):
+        """True if the response is a list that is decoded and validated item by item (API_STREAM_JSON)."""
+        return self.many and config.STREAM_JSON
+
+    def verify_response(self, response, schema=None):
+        """
+        Checks the status code of a response, then its decoded body.
+
+        Streamed list responses (requested with `stream=endpoint.streamed`) are
+        validated item by item as they are decoded.
+
+        Args:
+            response (requests.Response): The response to verify.
+            schema (CompiledSchema): The compiled schema named by `schema`, if any.
+
+        Raises:
+            AssertionError: If the status code or the body is not what the endpoint expects.
+            ValidationError: If the body does not match the schema.
+        """
+        if response.status_code != self.expected_status:
+            response.close()
+            raise AssertionError(f"{self.id}: expected status {self.expected_status}, got {response.status_code}")
+        if self.streamed:
+            items = read_items(response, schema, stream=True)
+            for item in items:
+                self.verify_fields(item)
+            count = items.count
+            if self.expected_count is not None:
+                assert count == self.expected_count, f"{self.id}: expected {self.expected_count} items, got {count}"
+            return
+        self.verify(response.json(), schema, body=response.content)
+
+    def verify(self, data, schema=None, body=None):
+        """
+        Checks a decoded response body against the expectations of this endpoint.
+
+        Args:
+            data: The decoded JSON body.
+            schema (CompiledSchema): The compiled schema named by `schema`, if any.
+            body (bytes): The raw body, lets the schema's verdict cache skip a body that already passed.
+
+        Raises:
+            AssertionError: If the body does not have the expected type, count or fields.
+            ValidationError: If the body does not match the schema.
+        """
+        if self.many:
+            assert isinstance(data, list), f"{self.id}: expected a list, got {type(data).__name__}"
+            if self.expected_count is not None:
+                assert len(data) == self.expected_count, f"{self.id}: expected {self.expected_count} items, got {len(data)}"
+            for item in data:
+                self.verify_fields(item)
+            if schema is not None:
+                schema.validate_many(data, body=body)
+        else:
+            assert isinstance(data, dict), f"{self.id}: expected an object, got {type(data).__name__}"
+            self.verify_fields(data)
+            if schema is not None:
+                schema.validate(data, body=body)
+
+    def verify_fields(self, item):
+        """
+        Checks that an object has every expected (field, value) pair.
+
+        Raises:
+            AssertionError: If a field is missing or has another value.
+        """
+        for name, value in self.expected_fields:
+            actual = item.get(name) if isinstance(item, dict) else None
+            assert actual == value, f"{self.id}: expected {name}={value!r}, got {actual!r}"
+
+
+def failure_message(error):
+    """
+    Describes why an endpoint check failed, using the same wording as the API tests.
+
+    Args:
+        error (Exception): The exception raised while checking the endpoint.
+
+    Returns:
+        str: The failure message.
+    """
+    if isinstance(error, requests.exceptions.RequestException):
+        return f"HTTP request failed: {str(error)}"
+    if isinstance(error, ValidationError):
+        return f"Validation failed: {error.message}"
+    if isinstance(error, AssertionError):
+        return str(error)
+    return f"Unexpected error: {str(error)}"
+
+
+# The endpoints exercised by test_users.py, test_posts.py and test_comments.py
+SUITE_ENDPOINTS = [
+    Endpoint(id="users", path="users", schema="user", many=True, expected_count=10),
+    Endpoint(id="users/1", path="users/1", schema="user", expected_fields=(("id", 1),)),
+    Endpoint(id="users?id=2", path="users", params=(("id", 2),), schema="user", many=True, expected_count=1),
+    Endpoint(id="posts", path="posts", schema="post", many=True, expected_count=100),
+    Endpoint(id="posts/2", path="posts/2", schema="post", expected_fields=(("id", 2),)),
+    Endpoint(id="comments", path="comments", schema="comment", many=True, expected_count=500),
+]
+
@@ -0,0 +1,291 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+from utils.adaptive_concurrency import send_limited
+from utils.deadlines import (
+    Deadline,
+    DeadlineExceeded,
+    HedgePolicy,
+    RequestCounters,
+    body_deadline,
+    enforce_body_deadline,
+)
+from utils.http_timing import (
+    RequestTiming,
+    endpoint_name,
+    instrument_pool_manager,
+    opened_connects,
+    reset_connects,
+    time_json_decode,
+    time_stream,
+)
+from utils.response_cache import OFF, RecordReplayAdapter, ResponseStore
+
+
+class ApiClient:
+    """
+    A thin wrapper around `requests.Session` shared by all API tests.
+
+    Reusing a single session keeps TCP/TLS connections alive between requests,
+    so only the first request to a host pays for the handshake.
+
+    Attributes:
+        base_url (str): The base URL every request path is appended to.
+        timeout (tuple): Default (connect, read) timeout in seconds for every request.
+        session (requests.Session): The underlying pooled, keep-alive session.
+        adapter (HTTPAdapter): The transport adapter mounted for http and https,
+            a RecordReplayAdapter when the response cache is on.
+        timings (list): A RequestTiming for every completed request, in completion order, when
+            `keep_timings` is set; consumers drain the entries they read so a long-lived client stays small.
+        limiter (AdaptiveLimiter): AIMD limit on the requests in flight, None leaves them unlimited.
+        deadline (Deadline): The per-request and per-test deadlines every request is held to.
+        hedging (HedgePolicy): Decides when a slow GET is sent a second time.
+        counters (RequestCounters): Counts of timed out and hedged requests.
+    """
+
+    def __init__(
+        self,
+        base_url=config.BASE_URL,
+        headers=config.HEADERS,
+        timeout=(config.CONNECT_TIMEOUT, config.READ_TIMEOUT),
+        pool_connections=config.POOL_CONNECTIONS,
+        pool_maxsize=config.POOL_MAXSIZE,
+        retries=config.RETRIES,
+        backoff_factor=config.RETRY_BACKOFF,
+        retry_statuses=config.RETRY_STATUSES,
+        cache_mode=config.CACHE_MODE,
+        cache_store=None,
+        limiter=None,
+        hedging=None,
+        keep_timings=True,
+    ):
+        """
+        Initializes the ApiClient with a tuned connection pool.
+
+        Args:
+            base_url (str): The base URL of the API under test.
+            headers (dict): Headers sent with every request.
+            timeout (tuple): Default (connect, read) timeout in seconds.
+            pool_connections (int): Number of per-host connection pools to cache.
+            pool_maxsize (int): Maximum number of connections kept alive per host.
+            retries (int): Number of retries for failed requests, 0 disables retrying.
+            backoff_factor (float): Backoff factor applied between retries.
+            retry_statuses (tuple): Response status codes that trigger a retry.
+            cache_mode (str): Record/replay mode: "off", "record", "replay" or "refresh".
+            cache_store (ResponseStore): Store used when caching is on, defaults to one built from config.
+            limiter (AdaptiveLimiter): Adaptive concurrency limit every request goes through, if any.
+            hedging (HedgePolicy): Hedging policy, defaults to one built from config.
+            keep_timings (bool): False to attach timings to the responses only, for clients
+                whose timings nobody reads (e.g. the load runner's).
+        """
+        self.base_url = base_url if base_url.endswith("/") else f"{base_url}/"
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        self.session.headers["Connection"] = "keep-alive"
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=retry_statuses,
+            raise_on_status=False,
+        ) if retries else 0
+        adapter_kwargs = {
+            "pool_connections": pool_connections,
+            "pool_maxsize": pool_maxsize,
+            "max_retries": retry,
+        }
+        if cache_mode == OFF:
+            adapter = HTTPAdapter(**adapter_kwargs)
+        else:
+            store = cache_store or ResponseStore(
+                config.CACHE_DIR,
+                ttl=config.CACHE_TTL,
+                max_bytes=config.CACHE_MAX_BYTES,
+                vary_headers=config.CACHE_VARY_HEADERS,
+            )
+            adapter = RecordReplayAdapter(store, mode=cache_mode, uncacheable_statuses=retry_statuses, **adapter_kwargs)
+        instrument_pool_manager(adapter.poolmanager)
+        self.adapter = adapter
+        self.timings = []
+        self.keep_timings = keep_timings
+        self.limiter = limiter
+        self.deadline = Deadline()
+        self.hedging = hedging or HedgePolicy()
+        self.counters = RequestCounters()
+        self._hedge_executor = None
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def url(self, path):
+        """
+        Builds the absolute URL for an API path.
+
+        Args:
+            path (str): The path relative to the base URL (e.g. "posts/2").
+
+        Returns:
+            str: The absolute URL.
+        """
+        return f"{self.base_url}{path.lstrip('/')}"
+
+    def request(self, method, path, **kwargs):
+        """
+        Sends a request through the pooled session.
+
+        The default timeout is applied unless the caller passes its own. The
+        request is timed and its RequestTiming is attached to the response as
+        `response.timing` and appended to `timings` (see `keep_timings`). With a limiter the request
+        waits for a free slot, and a GET answered with 429/503 is sent again
+        once any `Retry-After` has passed.
+
+        The timeout is clipped to the per-request and per-test deadlines, and
+        the body is read under the closer of the two: a body still arriving
+        when it passes raises DeadlineExceeded, also for streamed responses
+        and for responses the cache reads to record them.
+        With hedging on a GET slower than its endpoint's p95 is sent twice.
+
+        Args:
+            method (str): The HTTP method (e.g. "GET").
+            path (str): The path relative to the base URL.
+            **kwargs: Extra arguments passed to `requests.Session.request`.
+
+        Returns:
+            requests.Response: The response returned by the server.
+
+        Raises:
+            DeadlineExceeded: If the test deadline has passed, or a hedged request missed its deadline.
+        """
+        try:
+            kwargs["timeout"] = self.deadline.timeout(kwargs.get("timeout", self.timeout))
+            if self.limiter is None:
+                return self._send_hedged(method, path, **kwargs)
+            return send_limited(
+                self.limiter,
+                lambda: self._send_hedged(method, path, **kwargs),
+                method,
+                lambda response: response.timing.endpoint,
+            )
+        except requests.exceptions.Timeout:
+            self.counters.add("timeouts")
+            raise
+
+    def _send_hedged(self, method, path, **kwargs):
+        """Sends a request, racing a second copy of it once it is slower than its endpoint's p95."""
+        if not self.hedging.enabled:
+            return self._send(method, path, **kwargs)
+        url = requests.Request(method, self.url(path), params=kwargs.get("params")).prepare().url
+        endpoint = endpoint_name(method, url, self.base_url)
+        delay_ms = self.hedging.delay_ms(method, endpoint)
+        if delay_ms is None:
+            response = self._send(method, path, **kwargs)
+            self.hedging.observe(endpoint, response.timing.total_ms)
+            return response
+
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(max_workers=2 * config.POOL_MAXSIZE, thread_name_prefix="api-hedge")
+        budget = self.deadline.budget()
+        start = time.perf_counter()
+
+        def send():
+            future = self._hedge_executor.submit(self._send, method, path, record=False, **kwargs)
+            future.add_done_callback(
+                lambda done: done.exception() or self.hedging.observe(endpoint, done.result().timing.total_ms)
+            )
+            return future
+
+        primary = send()
+        attempts = [primary]
+        if not wait(attempts, timeout=delay_ms / 1000).done:
+            self.counters.add("hedges")
+            attempts.append(send())
+
+        pending = set(attempts)
+        winner = error = None
+        while pending and winner is None:
+            timeout = None if budget is None else budget - (time.perf_counter() - start)
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                error = DeadlineExceeded(f"no response within the {budget:.2f}s deadline")
+                break
+            for future in done:
+                if future.exception() is None:
+                    winner = future
+                    break
+                error = future.exception()
+        for future in pending:
+            # the slower copy is released as soon as it completes
+            future.add_done_callback(lambda late: late.exception() or late.result().close())
+        if winner is None:
+            raise error
+
+        response = winner.result()
+        response.timing.hedged = len(attempts) > 1
+        if winner is not primary:
+            self.counters.add("hedge_wins")
+        if self.keep_timings:
+            self.timings.append(response.timing)
+        return response
+
+    def _send(self, method, path, record=True, **kwargs):
+        """Sends and times a single request, adding its timing to `timings` when `record` is set."""
+        reset_connects()
+        streamed = kwargs.get("stream", False)
+        expires = self.deadline.expiry()
+        if expires is not None:
+            # the body is read here, under the deadline, instead of inside requests
+            kwargs["stream"] = True
+        start = time.perf_counter()
+        with body_deadline(expires):
+            # a recording cache reads the body inside request(), under this same deadline
+            response = self.session.request(method, self.url(path), **kwargs)
+        if expires is not None:
+            # a streamed body is read after request() has returned, so its timeouts are counted here
+            enforce_body_deadline(response, expires, (lambda: self.counters.add("timeouts")) if streamed else None)
+            if not streamed:
+                _ = response.content
+        total = time.perf_counter() - start
+
+        connects = opened_connects()
+        response.timing = RequestTiming(
+            endpoint=endpoint_name(method, response.url, self.base_url),
+            url=response.url,
+            status=response.status_code,
+            new_connection=bool(connects),
+            from_cache=getattr(response, "from_cache", False),
+            connect_ms=sum(connects) * 1000,
+            ttfb_ms=response.elapsed.total_seconds() * 1000,
+            total_ms=total * 1000,
+            size_bytes=None if streamed else len(response.content),
+        )
+        time_json_decode(response, response.timing)
+        if streamed:
+            time_stream(response, response.timing, start)
+        if record and self.keep_timings:
+            self.timings.append(response.timing)
+        return response
+
+    def get(self, path, **kwargs):
+        """
+        Sends a GET request through the pooled session.
+
+        Args:
+            path (str): The path relative to the base URL.
+            **kwargs: Extra arguments passed to `requests.Session.request`.
+
+        Returns:
+            requests.Response: The response returned by the server.
+        """
+        return self.request("GET", path, **kwargs)
+
+    def close(self):
+        """Closes the session and every pooled connection."""
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
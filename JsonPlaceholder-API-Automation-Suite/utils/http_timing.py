@@ -0,0 +1,173 @@
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from urllib.parse import parse_qsl, urlsplit
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# connect() durations of the connections opened by the current thread's request
+_local = threading.local()
+
+
+def reset_connects():
+    """Forgets the connections opened so far by the current thread."""
+    _local.connects = []
+
+
+def opened_connects():
+    """
+    Returns:
+        list: Durations in seconds of the connections opened by the current thread since `reset_connects()`.
+    """
+    return getattr(_local, "connects", [])
+
+
+class TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        opened_connects().append(time.perf_counter() - start)
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        opened_connects().append(time.perf_counter() - start)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+def instrument_pool_manager(pool_manager):
+    """
+    Makes every connection pool created by `pool_manager` time its new connections.
+
+    A request that reuses a kept-alive connection records no connect time,
+    so `opened_connects()` tells reused and new connections apart.
+
+    Args:
+        pool_manager (urllib3.PoolManager): The pool manager of a requests transport adapter.
+    """
+    pool_manager.pool_classes_by_scheme = {
+        "http": TimedHTTPConnectionPool,
+        "https": TimedHTTPSConnectionPool,
+    }
+
+
+def endpoint_name(method, url, base_url):
+    """
+    Groups a request URL into an endpoint name for per-endpoint aggregates.
+
+    Numeric path segments become `{id}` and query values are dropped, so
+    `GET posts/2` and `GET posts/3` land in the same `GET /posts/{id}` bucket.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The requested URL.
+        base_url (str): The base URL of the API, stripped from the path.
+
+    Returns:
+        str: The endpoint name (e.g. "GET /users?id").
+    """
+    split_url = urlsplit(url)
+    path = split_url.path
+    base_path = urlsplit(base_url).path
+    if path.startswith(base_path):
+        path = "/" + path[len(base_path):]
+    path = re.sub(r"/\d+(?=/|$)", "/{id}", path)
+    params = sorted({name for name, _ in parse_qsl(split_url.query, keep_blank_values=True)})
+    return f"{method} {path}" + (f"?{'&'.join(params)}" if params else "")
+
+
+@dataclass
+class RequestTiming:
+    """
+    Timing details of one HTTP request made through the ApiClient.
+
+    Attributes:
+        endpoint (str): The endpoint name, see `endpoint_name()`.
+        url (str): The requested URL.
+        status (int): The response status code.
+        new_connection (bool): True if a new connection was opened, False if a kept-alive one was reused.
+        from_cache (bool): True if the response was replayed from the record/replay cache.
+        connect_ms (float): Time spent opening connections (TCP and TLS), 0 when a connection was reused.
+        ttfb_ms (float): Time from sending the request to receiving the response headers.
+        total_ms (float): Time from sending the request to having read the whole body; for a
+            streamed body, the time to the headers until the stream is closed (see `time_stream()`).
+        size_bytes (int): Size of the response body, None until a streamed body has been read.
+        json_decode_ms (float): Time spent decoding the JSON body, None if it was never decoded.
+        hedged (bool): True if the request was sent a second time because it was slower than the p95.
+    """
+
+    endpoint: str
+    url: str
+    status: int
+    new_connection: bool
+    from_cache: bool
+    connect_ms: float
+    ttfb_ms: float
+    total_ms: float
+    size_bytes: int = None
+    json_decode_ms: float = None
+    hedged: bool = False
+
+    def as_dict(self):
+        timing = asdict(self)
+        for name in ("connect_ms", "ttfb_ms", "total_ms", "json_decode_ms"):
+            if timing[name] is not None:
+                timing[name] = round(timing[name], 3)
+        return timing
+
+
+def time_json_decode(response, timing):
+    """
+    Wraps `response.json()` so the time spent decoding the body is added to `timing`.
+
+    Args:
+        response (requests.Response): The response whose decoding is timed.
+        timing (RequestTiming): The timing record of the response.
+    """
+    decode = response.json
+
+    def timed_json(**kwargs):
+        start = time.perf_counter()
+        try:
+            return decode(**kwargs)
+        finally:
+            timing.json_decode_ms = (timing.json_decode_ms or 0) + (time.perf_counter() - start) * 1000
+
+    response.json = timed_json
+
+
+def time_stream(response, timing, start):
+    """
+    Wraps `response.close()` so `timing.total_ms` of a streamed response covers reading its body.
+
+    A streamed body is read by the caller after the request has returned, so
+    the total time is only known once the stream is closed (`read_items()`
+    closes it when the items are exhausted).
+
+    Args:
+        response (requests.Response): The response requested with `stream=True`.
+        timing (RequestTiming): The timing record of the response.
+        start (float): `time.perf_counter()` when the request was sent.
+    """
+    close = response.close
+    closed = False
+
+    def timed_close():
+        nonlocal closed
+        if not closed:
+            closed = True
+            timing.total_ms = (time.perf_counter() - start) * 1000
+        close()
+
+    response.close = timed_close
@@ -0,0 +1,204 @@
+"""
+Streaming parsing and validation of JSON array responses.
+
+`response.json()` holds the whole body, then the whole decoded list, in
+memory before the first item is validated. For large collections the
+response can instead be requested with `stream=True` and read with
+`read_items()`: the array is decoded item by item from the socket, each
+item is validated as soon as it is decoded and then dropped, so peak memory
+stays flat however many items come back. `len()` of the result is a running
+counter, so count assertions such as `len(response_data) == 500` still work.
+"""
+import codecs
+import json
+
+import config
+
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_array(chunks, encoding="utf-8"):
+    """
+    Decodes a JSON array incrementally, one item at a time.
+
+    Args:
+        chunks (iterable): The raw body as byte chunks, e.g. `response.iter_content(...)`.
+        encoding (str): The body encoding.
+
+    Yields:
+        The decoded items of the array, in order.
+
+    Raises:
+        json.JSONDecodeError: If the body is not a well-formed JSON array.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    chunks = iter(chunks)
+    buffer = ""
+    position = 0
+    eof = False
+
+    def fill():
+        # appends the next chunk, dropping the part of the buffer already decoded
+        nonlocal buffer, position, eof
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            buffer = buffer[position:] + text_decoder.decode(b"", final=True)
+        else:
+            buffer = buffer[position:] + text_decoder.decode(chunk)
+        position = 0
+
+    def next_token():
+        # skips whitespace and returns the next character, "" at the end of the body
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(buffer) or eof:
+                return buffer[position:position + 1]
+            fill()
+
+    def unexpected(expected):
+        found = repr(buffer[position]) if position < len(buffer) else "end of body"
+        return json.JSONDecodeError(f"Expected {expected}, found {found}", buffer, position)
+
+    if next_token() != "[":
+        raise unexpected("a JSON array")
+    position += 1
+    if next_token() == "]":
+        position += 1
+    else:
+        while True:
+            next_token()
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            if end == len(buffer) and not eof:
+                # a number at the end of the buffer may continue in the next chunk
+                fill()
+                continue
+            position = end
+            yield item
+
+            separator = next_token()
+            position += 1
+            if separator == "]":
+                break
+            if separator != ",":
+                position -= 1
+                raise unexpected("',' or ']'")
+
+    if next_token():
+        raise unexpected("end of body")
+
+
+class ItemStream:
+    """
+    The items of a streamed list response, decoded and validated on demand.
+
+    Iterating yields every item once; `len()` reads the remaining items and
+    returns how many were decoded, without keeping any of them.
+
+    Attributes:
+        count (int): Number of items decoded so far.
+    """
+
+    def __init__(self, items, on_close=None):
+        """
+        Initializes the ItemStream.
+
+        Args:
+            items (iterable): The decoded (and validated) items.
+            on_close (callable): Called once the stream is exhausted or fails.
+        """
+        self.count = 0
+        self._items = iter(items)
+        self._on_close = on_close
+        self._closed = False
+
+    def __iter__(self):
+        try:
+            for item in self._items:
+                self.count += 1
+                yield item
+        finally:
+            self.close()
+
+    def consume(self):
+        """
+        Reads the remaining items without keeping them.
+
+        Returns:
+            int: The total number of items.
+        """
+        for _ in self:
+            pass
+        return self.count
+
+    def __len__(self):
+        return self.consume()
+
+    def close(self):
+        """Releases the underlying response."""
+        if not self._closed:
+            self._closed = True
+            if self._on_close:
+                self._on_close()
+
+
+def read_items(response, schema=None, stream=config.STREAM_JSON, chunk_size=config.STREAM_CHUNK_SIZE):
+    """
+    Reads the items of a list response and validates each one against `schema`.
+
+    With `stream` the body is decoded incrementally and validated item by
+    item (the response must have been requested with `stream=True`);
+    otherwise it is decoded with `response.json()` and validated in one pass.
+    Either way `len()` of the result is the number of items.
+
+    Args:
+        response (requests.Response): The list response.
+        schema (CompiledSchema): Schema every item is validated against, None skips validation.
+        stream (bool): True to decode and validate the body incrementally.
+        chunk_size (int): Bytes read from the socket at a time when streaming.
+
+    Returns:
+        list or ItemStream: The items; an ItemStream is validated as it is consumed.
+
+    Raises:
+        AssertionError: If the body is not a JSON array.
+        BatchValidationError: If one or more items do not match the schema
+            (raised while an ItemStream is consumed).
+    """
+    if not stream:
+        items = response.json()
+        assert isinstance(items, list), f"expected a list, got {type(items).__name__}"
+        if schema is not None:
+            schema.validate_many(items, body=response.content)
+        return items
+
+    timing = getattr(response, "timing", None)
+    size = 0
+
+    def body_chunks():
+        nonlocal size
+        for chunk in response.iter_content(chunk_size):
+            size += len(chunk)
+            yield chunk
+
+    def close():
+        response.close()
+        if timing is not None:
+            timing.size_bytes = size
+
+    def items():
+        try:
+            yield from iter_json_array(body_chunks(), response.encoding or "utf-8")
+        except json.JSONDecodeError as e:
+            raise AssertionError(f"expected a list: {e}") from e
+
+    return ItemStream(schema.iter_validated(items()) if schema is not None else items(), on_close=close)
@@ -0,0 +1,202 @@
+"""
+Latency budgets for API tests.
+
+A test marked with
+
+    @pytest.mark.latency_budget(p95_ms=300, max_ms=1000)
+
+runs as usual; once it passes, every distinct request it made is repeated
+`samples` times (API_LATENCY_SAMPLES, or the marker's `samples=` argument)
+and the test fails if a measured percentile exceeds its budget. The results
+are attached to the test as a `latency_budget` property and the run summary
+lists the headroom left in every budget.
+"""
+import json
+from dataclasses import dataclass
+
+import pytest
+
+import config
+from utils.stats import latency_summary
+
+MARKER = "latency_budget"
+BUDGET_KEYS = ("p50_ms", "p90_ms", "p95_ms", "p99_ms", "max_ms")
+
+
+@dataclass(frozen=True)
+class LatencyBudget:
+    """
+    The latency limits of one test, read from its `latency_budget` marker.
+
+    Attributes:
+        p50_ms (float): Maximum allowed median latency in milliseconds, None leaves it unchecked.
+        p90_ms (float): Maximum allowed 90th percentile latency.
+        p95_ms (float): Maximum allowed 95th percentile latency.
+        p99_ms (float): Maximum allowed 99th percentile latency.
+        max_ms (float): Maximum allowed latency of any single request.
+        samples (int): Number of times each request is repeated to measure it.
+    """
+
+    p50_ms: float = None
+    p90_ms: float = None
+    p95_ms: float = None
+    p99_ms: float = None
+    max_ms: float = None
+    samples: int = config.LATENCY_SAMPLES
+
+    @classmethod
+    def from_marker(cls, marker):
+        """
+        Builds the budget from a `latency_budget` marker.
+
+        Raises:
+            pytest.UsageError: If the marker has positional or unknown arguments, or sets no limit.
+        """
+        unknown = set(marker.kwargs) - set(BUDGET_KEYS) - {"samples"}
+        if marker.args or unknown:
+            raise pytest.UsageError(
+                f"latency_budget takes keyword arguments {', '.join(BUDGET_KEYS)} and samples, "
+                f"got {marker.args or sorted(unknown)}"
+            )
+        budget = cls(**marker.kwargs)
+        if not budget.limits():
+            raise pytest.UsageError(f"latency_budget needs at least one of {', '.join(BUDGET_KEYS)}")
+        return budget
+
+    def limits(self):
+        """
+        Returns:
+            dict: Summary statistic (e.g. "p95") mapped to its limit in milliseconds, for every limit set.
+        """
+        return {
+            key[:-len("_ms")]: getattr(self, key)
+            for key in BUDGET_KEYS
+            if getattr(self, key) is not None
+        }
+
+
+def measure(client, timing, samples):
+    """
+    Repeats one request and summarizes its latencies.
+
+    Responses replayed from the record/replay cache are not counted, they say
+    nothing about the latency of the API.
+
+    Args:
+        client (ApiClient): The client the request was made with.
+        timing (RequestTiming): The timing of the original request.
+        samples (int): Number of times to repeat the request.
+
+    Returns:
+        dict: `latency_summary()` of the total request times, plus the number of
+        responses whose status differed from the original one.
+    """
+    method = timing.endpoint.split(" ", 1)[0]
+    path = timing.url[len(client.base_url):] if timing.url.startswith(client.base_url) else timing.url
+    latencies_ms = []
+    errors = 0
+    first = len(client.timings)
+    try:
+        for _ in range(samples):
+            response = client.request(method, path)
+            if response.status_code != timing.status:
+                errors += 1
+            if not response.timing.from_cache:
+                latencies_ms.append(response.timing.total_ms)
+    finally:
+        # the repeats are measurements, not requests made by the test
+        del client.timings[first:]
+    summary = latency_summary(latencies_ms)
+    summary["errors"] = errors
+    return summary
+
+
+def check_budget(budget, summary):
+    """
+    Compares a latency summary with a budget.
+
+    Returns:
+        dict: Statistic mapped to {"limit", "actual", "headroom"} in milliseconds;
+        a negative headroom means the budget was exceeded.
+    """
+    return {
+        stat: {"limit": limit, "actual": summary[stat], "headroom": round(limit - summary[stat], 1)}
+        for stat, limit in budget.limits().items()
+    }
+
+
+class LatencyBudgetPlugin:
+    """
+    Enforces `latency_budget` markers and summarizes the budget headroom at the end of the run.
+
+    Results are read back from the reports' `latency_budget` user properties,
+    so the summary also covers tests run on pytest-xdist workers.
+    """
+
+    def __init__(self):
+        self.results = []
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_call(self, item):
+        marker = item.get_closest_marker(MARKER)
+        client = item.funcargs.get("api_client")
+        if marker is None or client is None:
+            return (yield)
+
+        budget = LatencyBudget.from_marker(marker)
+        first = len(client.timings)
+        # a failing test raises here, only passing tests are measured
+        result = yield
+        if budget.samples <= 0:
+            return result
+
+        timings = {timing.url: timing for timing in client.timings[first:]}
+        if not timings:
+            pytest.fail("latency_budget: the test made no request to measure")
+
+        exceeded = []
+        for timing in timings.values():
+            summary = measure(client, timing, budget.samples)
+            checks = check_budget(budget, summary) if summary["count"] else {}
+            item.user_properties.append((MARKER, json.dumps({
+                "endpoint": timing.endpoint,
+                "url": timing.url,
+                "samples": summary["count"],
+                "errors": summary["errors"],
+                "checks": checks,
+            })))
+            if summary["errors"]:
+                exceeded.append(f"{timing.endpoint}: {summary['errors']} of {budget.samples} repeats "
+                                f"did not return status {timing.status}")
+            exceeded.extend(
+                f"{timing.endpoint}: {stat} {check['actual']} ms exceeds the {check['limit']} ms budget"
+                for stat, check in checks.items()
+                if check["headroom"] < 0
+            )
+        if exceeded:
+            pytest.fail("Latency budget exceeded:\n" + "\n".join(exceeded), pytrace=False)
+        return result
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call":
+            return
+        for name, value in report.user_properties:
+            if name == MARKER:
+                self.results.append((report.nodeid, json.loads(value)))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.results:
+            return
+        terminalreporter.section("latency budgets")
+        for nodeid, result in self.results:
+            checks = ", ".join(
+                f"{stat} {check['actual']}/{check['limit']} ms ({check['headroom']:+} ms)"
+                for stat, check in result["checks"].items()
+            ) or "not measured (all samples served from the response cache)"
+            exceeded = result["errors"] or any(check["headroom"] < 0 for check in result["checks"].values())
+            terminalreporter.write_line(
+                f"{'EXCEEDED' if exceeded else 'ok':<8} {nodeid} [{result['endpoint']}, "
+                f"{result['samples']} samples]: {checks}",
+                red=bool(exceeded),
+                green=not exceeded,
+            )
@@ -0,0 +1,318 @@
+"""
+Load and throughput mode built from the API suite's own endpoint definitions.
+
+Replays the endpoints exercised by the tests (collections, single-resource
+lookups and filtered search) with their status, count and schema checks, for
+a fixed duration or request count, at a target rate or with N concurrent
+virtual users, and reports throughput, latency percentiles and error rate per
+endpoint as JSON and HTML.
+
+Usage:
+    python -m utils.load_runner --duration 30 --users 10
+    python -m utils.load_runner --requests 5000 --rps 200 --profile all --local-server
+    python -m utils.load_runner --duration 60 --users 50 --adaptive
+"""
+import argparse
+import html
+import itertools
+import json
+import threading
+import time
+from datetime import datetime
+
+import config
+from utils.adaptive_concurrency import AdaptiveLimiter
+from utils.endpoint_matrix import load_matrix
+from utils.endpoints import SUITE_ENDPOINTS, failure_message
+from utils.http_client import ApiClient
+from utils.local_server import LocalApiServer
+from utils.schema_registry import SchemaRegistry
+from utils.stats import latency_summary
+
+PROFILES = {
+    "suite": lambda: SUITE_ENDPOINTS,
+    "matrix": lambda: load_matrix(config.ENDPOINT_MATRIX),
+    "all": lambda: SUITE_ENDPOINTS + load_matrix(config.ENDPOINT_MATRIX),
+}
+MAX_ERROR_SAMPLES = 5  # distinct error messages kept per endpoint
+
+
+class EndpointStats:
+    """Latencies and errors collected for one endpoint during a load run."""
+
+    def __init__(self):
+        self.latencies_ms = []
+        self.errors = 0
+        self.error_samples = []
+
+    def record(self, latency_ms, error=None):
+        self.latencies_ms.append(latency_ms)
+        if error:
+            self.errors += 1
+            if error not in self.error_samples and len(self.error_samples) < MAX_ERROR_SAMPLES:
+                self.error_samples.append(error)
+
+    def summary(self, duration):
+        summary = latency_summary(self.latencies_ms)
+        summary["throughput_rps"] = round(len(self.latencies_ms) / duration, 2) if duration else 0.0
+        summary["errors"] = self.errors
+        summary["error_rate"] = round(self.errors / len(self.latencies_ms), 4) if self.latencies_ms else 0.0
+        summary["error_samples"] = self.error_samples
+        return summary
+
+
+class LoadRunner:
+    """
+    Drives a list of endpoints with concurrent virtual users over one ApiClient.
+
+    Each virtual user takes the next endpoint in round-robin order, sends it and
+    runs the same checks as the functional tests. When a target rate is set the
+    users share a pacer that spaces request start times `1 / rps` seconds apart.
+
+    Attributes:
+        client (ApiClient): The shared HTTP client.
+        schema_registry (SchemaRegistry): Registry providing the compiled schemas, None skips schema checks.
+        endpoints (list): The endpoints to drive.
+        users (int): Number of concurrent virtual users.
+        rps (float): Target requests per second across all users, None runs as fast as possible.
+        duration (float): Seconds to run for, None runs until `requests` have been sent.
+        requests (int): Total number of requests to send, None runs for `duration`.
+    """
+
+    def __init__(self, client, schema_registry, endpoints, users=10, rps=None, duration=None, requests=None):
+        if duration is None and requests is None:
+            raise ValueError("Either duration or requests must be set")
+        self.client = client
+        self.schema_registry = schema_registry
+        self.endpoints = endpoints
+        self.users = users
+        self.rps = rps
+        self.duration = duration
+        self.requests = requests
+        self.stats = {endpoint.id: EndpointStats() for endpoint in endpoints}
+        self._lock = threading.Lock()
+        self._cycle = itertools.cycle(endpoints)
+        self._sent = 0
+        self._next_start = 0.0
+        self._deadline = None
+
+    def run(self):
+        """
+        Runs the load and waits for every virtual user to finish.
+
+        Returns:
+            dict: The load report (settings, totals and per-endpoint summaries).
+        """
+        started_at = datetime.now()
+        start = time.perf_counter()
+        self._next_start = start
+        self._deadline = start + self.duration if self.duration else None
+
+        threads = [
+            threading.Thread(target=self._virtual_user, name=f"virtual-user-{index}", daemon=True)
+            for index in range(self.users)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        elapsed = time.perf_counter() - start
+        return self.report(started_at, elapsed)
+
+    def _next_endpoint(self):
+        """Returns the next endpoint and its scheduled start time, or None when the run is over."""
+        with self._lock:
+            now = time.perf_counter()
+            if self.requests is not None and self._sent >= self.requests:
+                return None
+            if self._deadline is not None and now >= self._deadline:
+                return None
+            self._sent += 1
+            scheduled = now
+            if self.rps:
+                scheduled = max(now, self._next_start)
+                self._next_start = scheduled + 1 / self.rps
+            return next(self._cycle), scheduled
+
+    def _virtual_user(self):
+        while True:
+            task = self._next_endpoint()
+            if task is None:
+                return
+            endpoint, scheduled = task
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                return
+            self._execute(endpoint)
+
+    def _execute(self, endpoint):
+        error = None
+        latency_ms = None
+        start = time.perf_counter()
+        try:
+            response = self.client.request(
+                endpoint.method, endpoint.path, params=list(endpoint.params), json=endpoint.payload,
+                stream=endpoint.streamed,
+            )
+            latency_ms = (time.perf_counter() - start) * 1000
+            schema = self.schema_registry.get(endpoint.schema) if self.schema_registry and endpoint.schema else None
+            endpoint.verify_response(response, schema)
+        except Exception as e:
+            if latency_ms is None:
+                latency_ms = (time.perf_counter() - start) * 1000
+            error = failure_message(e)
+        with self._lock:
+            self.stats[endpoint.id].record(latency_ms, error)
+
+    def report(self, started_at, elapsed):
+        """
+        Builds the load report.
+
+        Args:
+            started_at (datetime): When the run started.
+            elapsed (float): Wall time of the run in seconds.
+
+        Returns:
+            dict: The load report.
+        """
+        all_latencies = [latency for stats in self.stats.values() for latency in stats.latencies_ms]
+        total_errors = sum(stats.errors for stats in self.stats.values())
+        totals = latency_summary(all_latencies)
+        totals["throughput_rps"] = round(len(all_latencies) / elapsed, 2) if elapsed else 0.0
+        totals["errors"] = total_errors
+        totals["error_rate"] = round(total_errors / len(all_latencies), 4) if all_latencies else 0.0
+        report = {
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "duration": round(elapsed, 3),
+            "settings": {
+                "base_url": self.client.base_url,
+                "users": self.users,
+                "rps": self.rps,
+                "duration": self.duration,
+                "requests": self.requests,
+                "schema_checks": self.schema_registry is not None,
+            },
+            "totals": totals,
+            "endpoints": {endpoint_id: stats.summary(elapsed) for endpoint_id, stats in self.stats.items()},
+        }
+        if self.client.limiter is not None:
+            report["concurrency"] = self.client.limiter.summary()
+        return report
+
+
+def render_html(report):
+    """
+    Renders a load report as a standalone HTML page.
+
+    Args:
+        report (dict): The report returned by `LoadRunner.run()`.
+
+    Returns:
+        str: The HTML document.
+    """
+    columns = ("count", "throughput_rps", "p50", "p90", "p99", "max", "errors", "error_rate")
+    header = "".join(f"<th>{column}</th>" for column in ("endpoint",) + columns)
+    rows = ""
+    for endpoint_id, summary in list(report["endpoints"].items()) + [("TOTAL", report["totals"])]:
+        css = ' class="failed"' if summary["errors"] else ""
+        cells = "".join(f"<td>{summary[column]}</td>" for column in columns)
+        rows += f"<tr{css}><td>{html.escape(endpoint_id)}</td>{cells}</tr>\n"
+        for sample in summary.get("error_samples", []):
+            rows += f'<tr class="sample"><td colspan="{len(columns) + 1}">{html.escape(sample)}</td></tr>\n'
+
+    settings = ", ".join(f"{name}={value}" for name, value in report["settings"].items())
+    if "concurrency" in report:
+        settings += ", adaptive concurrency: " + ", ".join(
+            f"{name}={value}" for name, value in report["concurrency"].items()
+        )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Load Report - AutoTestLab</title>
+    <style>
+        body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; padding: 20px; color: #333; }}
+        h1 {{ color: #667eea; }}
+        table {{ border-collapse: collapse; width: 100%; }}
+        th, td {{ border-bottom: 1px solid #e9ecef; padding: 8px; text-align: right; }}
+        th:first-child, td:first-child {{ text-align: left; }}
+        th {{ background: #f8f9fa; }}
+        tr.failed td {{ color: #dc3545; }}
+        tr.sample td {{ color: #6c757d; font-size: 0.85em; text-align: left; }}
+    </style>
+</head>
+<body>
+    <h1>Load Report</h1>
+    <p>Started {report['started_at']} &middot; {report['duration']}s &middot; {html.escape(settings)}</p>
+    <p>Latencies in milliseconds.</p>
+    <table>
+        <tr>{header}</tr>
+        {rows}
+    </table>
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API suite's endpoints as a load profile.")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="suite",
+                        help="suite: the endpoints of the functional tests, matrix: every endpoint of the spec, all: both")
+    parser.add_argument("--duration", type=float, help="seconds to run for")
+    parser.add_argument("--requests", type=int, help="total number of requests to send")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--rps", type=float, help="target requests per second (default: as fast as possible)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="limit requests in flight with the AIMD controller; --users is then the upper bound")
+    parser.add_argument("--no-schema", action="store_true", help="skip schema validation of the responses")
+    parser.add_argument("--local-server", action="store_true", help="run against the local stand-in server")
+    parser.add_argument("--json", default="load_report.json", help="path of the JSON report")
+    parser.add_argument("--html", default="load_report.html", help="path of the HTML report")
+    args = parser.parse_args()
+    if args.duration is None and args.requests is None:
+        parser.error("one of --duration or --requests is required")
+
+    server = LocalApiServer().start() if args.local_server else None
+    limiter = AdaptiveLimiter(max_limit=args.users) if args.adaptive or config.ADAPTIVE_CONCURRENCY else None
+    client = ApiClient(
+        base_url=server.url if server else config.BASE_URL,
+        pool_maxsize=max(config.POOL_MAXSIZE, args.users),
+        limiter=limiter,
+        # EndpointStats keeps the latencies; a RequestTiming per request would grow with --duration
+        keep_timings=False,
+    )
+    try:
+        runner = LoadRunner(
+            client,
+            None if args.no_schema else SchemaRegistry(),
+            PROFILES[args.profile](),
+            users=args.users,
+            rps=args.rps,
+            duration=args.duration,
+            requests=args.requests,
+        )
+        report = runner.run()
+    finally:
+        client.close()
+        if server:
+            server.stop()
+
+    with open(args.json, "w") as report_file:
+        json.dump(report, report_file, indent=2)
+    with open(args.html, "w") as report_file:
+        report_file.write(render_html(report))
+
+    totals = report["totals"]
+    print(f"{totals['count']} requests in {report['duration']}s - {totals['throughput_rps']} req/s, "
+          f"p50 {totals['p50']} ms, p99 {totals['p99']} ms, error rate {totals['error_rate']:.2%}")
+    if limiter is not None:
+        print(f"Adaptive concurrency converged on {report['concurrency']['converged']} requests in flight "
+              f"(peak {report['concurrency']['peak_in_flight']}, {report['concurrency']['decreases']} decreases)")
+    print(f"Reports written to {args.json} and {args.html}")
+
+
+if __name__ == "__main__":
+    main()
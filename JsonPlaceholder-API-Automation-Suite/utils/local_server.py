@@ -0,0 +1,454 @@
+"""
+Local stand-in for the JSONPlaceholder API.
+
+Serves users, posts and comments from a seeded dataset so the API suite can
+run offline, with optional latency, jitter, slow body, error and throttling injection.
+Writes (POST, PUT, PATCH, DELETE) are answered like JSONPlaceholder answers
+them: the response reflects the change but the dataset is left untouched,
+so the read tests keep their expected counts.
+
+Usage:
+    python -m utils.local_server --port 8000 --latency-ms 20 --jitter-ms 5
+    API_BASE_URL=http://127.0.0.1:8000/ pytest tests/
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import config
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud "
+    "exercitation ullamco laboris nisi aliquip ex ea commodo consequat"
+).split()
+FIRST_NAMES = ("Leanne", "Ervin", "Clementine", "Patricia", "Chelsey", "Dennis", "Kurtis", "Nicholas", "Glenna", "Clementina")
+LAST_NAMES = ("Graham", "Howell", "Bauch", "Lebsack", "Dietrich", "Schulist", "Weissnat", "Runolfsdottir", "Reichert", "DuBuque")
+
+# (parent resource, child resource) -> foreign key, for nested routes like /posts/1/comments
+NESTED_ROUTES = {
+    ("users", "posts"): "userId",
+    ("posts", "comments"): "postId",
+}
+BODY_CHUNKS = 10  # writes a body is split into when FaultInjector.body_latency_ms is set
+
+
+def build_dataset(seed=config.LOCAL_SERVER_SEED, users=10, posts_per_user=10, comments_per_post=5):
+    """
+    Builds a deterministic dataset shaped like the JSONPlaceholder resources.
+
+    The default sizes match the public service (10 users, 100 posts, 500 comments)
+    so the existing count assertions hold against the stand-in server.
+
+    Args:
+        seed (int): Seed for the random generator, the same seed yields the same data.
+        users (int): Number of users to create.
+        posts_per_user (int): Number of posts created for each user.
+        comments_per_post (int): Number of comments created for each post.
+
+    Returns:
+        dict: Resource name mapped to its list of items.
+    """
+    rng = random.Random(seed)
+
+    def sentence(words):
+        return " ".join(rng.choice(WORDS) for _ in range(words))
+
+    def email(name):
+        return f"{name.lower().replace(' ', '.')}@{rng.choice(WORDS)}.example"
+
+    dataset = {"users": [], "posts": [], "comments": []}
+    for user_id in range(1, users + 1):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        dataset["users"].append({
+            "id": user_id,
+            "name": name,
+            "username": name.split()[0] + str(user_id),
+            "email": email(name),
+            "address": {
+                "street": f"{sentence(2).title()} Street",
+                "suite": f"Apt. {rng.randint(100, 999)}",
+                "city": sentence(1).title(),
+                "zipcode": f"{rng.randint(10000, 99999)}-{rng.randint(1000, 9999)}",
+                "geo": {
+                    "lat": f"{rng.uniform(-90, 90):.4f}",
+                    "lng": f"{rng.uniform(-180, 180):.4f}",
+                },
+            },
+            "phone": f"1-{rng.randint(200, 999)}-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+            "website": f"{rng.choice(WORDS)}.example",
+            "company": {
+                "name": f"{rng.choice(LAST_NAMES)} LLC",
+                "catchPhrase": sentence(4),
+                "bs": sentence(3),
+            },
+        })
+
+    for post_id in range(1, users * posts_per_user + 1):
+        dataset["posts"].append({
+            "userId": (post_id - 1) // posts_per_user + 1,
+            "id": post_id,
+            "title": sentence(6),
+            "body": sentence(30),
+        })
+
+    for comment_id in range(1, len(dataset["posts"]) * comments_per_post + 1):
+        dataset["comments"].append({
+            "postId": (comment_id - 1) // comments_per_post + 1,
+            "id": comment_id,
+            "name": sentence(5),
+            "email": email(sentence(2)),
+            "body": sentence(20),
+        })
+
+    return dataset
+
+
+def filter_items(items, query):
+    """
+    Applies JSONPlaceholder style query filters (e.g. `?id=2&userId=1`).
+
+    Every parameter must match a top-level field; repeating a parameter
+    (`?id=1&id=2`) matches any of the given values.
+
+    Args:
+        items (list): The items to filter.
+        query (dict): Parsed query string, parameter name mapped to a list of values.
+
+    Returns:
+        list: The items matching every filter.
+    """
+    return [
+        item for item in items
+        if all(str(item.get(field)) in values for field, values in query.items())
+    ]
+
+
+class FaultInjector:
+    """
+    Decides the latency and failures applied to each request served by the stand-in server.
+
+    Attributes:
+        latency_ms (float): Base latency added to every response, in milliseconds.
+        jitter_ms (float): Maximum random latency added on top of the base latency.
+        error_rate (float): Fraction of requests (0.0 - 1.0) answered with `error_status`.
+        error_status (int): Status code returned for injected errors.
+        rate_limit (float): Maximum requests per second, extra requests get a 429 (0 disables it).
+        body_latency_ms (float): Time spent writing each body after its headers, in milliseconds;
+            the body is trickled out in BODY_CHUNKS writes, like a slow upstream streaming it.
+    """
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, error_status=500, rate_limit=0, seed=None,
+                 body_latency_ms=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit = rate_limit
+        self.body_latency_ms = body_latency_ms
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+    def delay(self):
+        """Sleeps for the configured latency plus a random jitter."""
+        with self._lock:
+            jitter = self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0
+        delay_ms = self.latency_ms + jitter
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def write_body(self, wfile, payload):
+        """Writes a response body, spread over `body_latency_ms` when it is set."""
+        if not self.body_latency_ms:
+            wfile.write(payload)
+            return
+        size = -(-len(payload) // BODY_CHUNKS)
+        for start in range(0, len(payload), size):
+            time.sleep(self.body_latency_ms / BODY_CHUNKS / 1000)
+            wfile.write(payload[start:start + size])
+            wfile.flush()
+
+    def throttled(self):
+        """
+        Counts the request against the per-second rate limit.
+
+        Returns:
+            float: Seconds until the current window resets if the request must be
+            rejected, otherwise 0.
+        """
+        if not self.rate_limit:
+            return 0
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= 1:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            if self._window_count > self.rate_limit:
+                return 1 - (now - self._window_start)
+        return 0
+
+    def failed(self):
+        """
+        Returns:
+            bool: True if this request should be answered with an injected error.
+        """
+        with self._lock:
+            return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+
+class LocalApiHandler(BaseHTTPRequestHandler):
+    """Serves the seeded dataset over HTTP/1.1 so clients can keep connections alive."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "AutoTestLabLocalAPI/1.0"
+    # headers and body are written separately, without TCP_NODELAY the body waits for a delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if not self.injected_fault():
+            self.send_json(*self.route())
+
+    def do_POST(self):
+        self.handle_write(self.route_create)
+
+    def do_PUT(self):
+        self.handle_write(lambda payload: self.route_update(payload, replace=True))
+
+    def do_PATCH(self):
+        self.handle_write(lambda payload: self.route_update(payload, replace=False))
+
+    def do_DELETE(self):
+        self.handle_write(lambda payload: self.route_delete())
+
+    def injected_fault(self):
+        """
+        Applies the throttling, latency and errors of the FaultInjector.
+
+        Returns:
+            bool: True if a 429 or an injected error has been sent instead of the response.
+        """
+        faults = self.server.faults
+        retry_after = faults.throttled()
+        if retry_after:
+            self.send_json(429, {"error": "Too Many Requests"}, {"Retry-After": str(max(1, round(retry_after)))})
+            return True
+
+        faults.delay()
+        if faults.failed():
+            self.send_json(faults.error_status, {"error": "Injected failure"})
+            return True
+        return False
+
+    def handle_write(self, route):
+        """Reads the JSON request body, then answers with `route(payload)`."""
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if self.injected_fault():
+            return
+        try:
+            payload = json.loads(raw) if raw else {}
+        except ValueError:
+            self.send_json(400, {"error": "Invalid JSON body"})
+            return
+        if not isinstance(payload, dict):
+            self.send_json(400, {"error": "Expected a JSON object"})
+            return
+        self.send_json(*route(payload))
+
+    def resolve_item(self):
+        """
+        Returns:
+            dict: The item addressed by a `/{resource}/{id}` path, None if there is none.
+        """
+        segments = [segment for segment in urlsplit(self.path).path.split("/") if segment]
+        if len(segments) != 2 or segments[0] not in self.server.dataset:
+            return None
+        matches = [item for item in self.server.dataset[segments[0]] if str(item["id"]) == segments[1]]
+        return matches[0] if matches else None
+
+    def route_create(self, payload):
+        """
+        Answers `POST /{resource}` with the payload and the id the new item would get.
+
+        Returns:
+            tuple: (status code, JSON body)
+        """
+        segments = [segment for segment in urlsplit(self.path).path.split("/") if segment]
+        if len(segments) != 1 or segments[0] not in self.server.dataset:
+            return 404, {}
+        return 201, {**payload, "id": len(self.server.dataset[segments[0]]) + 1}
+
+    def route_update(self, payload, replace):
+        """
+        Answers `PUT` (replace) and `PATCH` (merge) of `/{resource}/{id}` with the updated item.
+
+        Returns:
+            tuple: (status code, JSON body)
+        """
+        item = self.resolve_item()
+        if item is None:
+            return 404, {}
+        return 200, {**({} if replace else item), **payload, "id": item["id"]}
+
+    def route_delete(self):
+        """
+        Answers `DELETE /{resource}/{id}` with an empty object.
+
+        Returns:
+            tuple: (status code, JSON body)
+        """
+        item = self.resolve_item()
+        return (404, {}) if item is None else (200, {})
+
+    def route(self):
+        """
+        Resolves the request path against the dataset.
+
+        Returns:
+            tuple: (status code, JSON body)
+        """
+        url = urlsplit(self.path)
+        segments = [segment for segment in url.path.split("/") if segment]
+        query = parse_qs(url.query)
+        dataset = self.server.dataset
+
+        if not segments or segments[0] not in dataset:
+            return 404, {}
+        items = dataset[segments[0]]
+
+        if len(segments) == 1:
+            return 200, filter_items(items, query)
+
+        matches = [item for item in items if str(item["id"]) == segments[1]]
+        if not matches:
+            return 404, {}
+
+        if len(segments) == 2:
+            return 200, matches[0]
+
+        foreign_key = NESTED_ROUTES.get((segments[0], segments[2]))
+        if len(segments) == 3 and foreign_key:
+            children = [item for item in dataset[segments[2]] if item[foreign_key] == matches[0]["id"]]
+            return 200, filter_items(children, query)
+
+        return 404, {}
+
+    def send_json(self, status, body, headers=None):
+        """Writes a JSON response with an explicit Content-Length."""
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.server.faults.write_body(self.wfile, payload)
+
+    def log_message(self, format, *args):
+        """Silences the default per-request logging to stderr."""
+
+
+class LocalApiServer:
+    """
+    Runs the stand-in API on a background thread.
+
+    Can be used as a context manager:
+
+        with LocalApiServer(port=0) as server:
+            requests.get(f"{server.url}posts/1")
+
+    Attributes:
+        url (str): The base URL of the running server, ending with "/".
+        dataset (dict): The seeded dataset being served.
+        faults (FaultInjector): The latency and failure settings.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, dataset=None, faults=None, poll_interval=0.05):
+        """
+        Initializes the LocalApiServer and binds it to the given address.
+
+        Args:
+            host (str): Interface to listen on.
+            port (int): Port to listen on, 0 picks a free port.
+            dataset (dict): Data to serve, defaults to `build_dataset()`.
+            faults (FaultInjector): Latency and failure settings, defaults to none.
+            poll_interval (float): Seconds between shutdown checks of the serving loop; `stop()`
+                waits up to this long (the standard library default of 0.5 would dominate teardown).
+        """
+        self.httpd = ThreadingHTTPServer((host, port), LocalApiHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.dataset = self.dataset = dataset or build_dataset()
+        self.httpd.faults = self.faults = faults or FaultInjector()
+        self.poll_interval = poll_interval
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        """Starts serving requests on a daemon thread."""
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, args=(self.poll_interval,), name="local-api-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the server and releases the port."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local JSONPlaceholder stand-in server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--seed", type=int, default=config.LOCAL_SERVER_SEED)
+    parser.add_argument("--latency-ms", type=float, default=config.LOCAL_SERVER_LATENCY_MS)
+    parser.add_argument("--jitter-ms", type=float, default=config.LOCAL_SERVER_JITTER_MS)
+    parser.add_argument("--error-rate", type=float, default=config.LOCAL_SERVER_ERROR_RATE)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--rate-limit", type=float, default=config.LOCAL_SERVER_RATE_LIMIT,
+                        help="maximum requests per second before answering 429 (0 disables it)")
+    parser.add_argument("--body-latency-ms", type=float, default=0,
+                        help="time spent trickling out each response body after its headers")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--posts-per-user", type=int, default=10)
+    parser.add_argument("--comments-per-post", type=int, default=5)
+    args = parser.parse_args()
+
+    server = LocalApiServer(
+        host=args.host,
+        port=args.port,
+        dataset=build_dataset(args.seed, args.users, args.posts_per_user, args.comments_per_post),
+        faults=FaultInjector(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status, args.rate_limit, args.seed,
+                              args.body_latency_ms),
+    )
+    print(f"Serving JSONPlaceholder stand-in on {server.url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
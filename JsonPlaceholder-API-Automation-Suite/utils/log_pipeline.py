@@ -0,0 +1,270 @@
+"""
+Non-blocking, structured execution log for the API suite.
+
+Log calls made by the tests only put the record on an in-memory queue; a
+background listener thread formats it as one JSON object per line (timestamp,
+level, logger, message, test nodeid, xdist worker id) and writes it to
+`logs/execution-<worker>.jsonl`. Each pytest-xdist worker writes its own file,
+so no two processes ever append to or rotate the same file. Files are rotated
+by size and the rotated files are gzip-compressed.
+
+Query the records of a test across all workers and rotated files:
+
+    python -m utils.log_pipeline tests/test_posts.py::TestPostAPI::test_get_post
+    python -m utils.log_pipeline test_get_post --level ERROR --json
+"""
+import argparse
+import copy
+import glob
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+import config
+
+LOG_PREFIX = "execution-"
+LOG_SUFFIX = ".jsonl"
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")  # level names accepted by query()
+
+# nodeid of the test currently running in this process, shared by every thread
+# so records logged from worker threads (e.g. the AsyncEngine) are attributed too
+_current = {"nodeid": None}
+
+
+def worker_id():
+    """
+    Returns:
+        str: The pytest-xdist worker id (e.g. "gw0"), "main" when not running under xdist.
+    """
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+class NodeIdFilter(logging.Filter):
+    """Stamps every record with the running test and the worker, on the thread that logged it."""
+
+    def __init__(self, worker):
+        super().__init__()
+        self.worker = worker
+
+    def filter(self, record):
+        record.nodeid = _current["nodeid"]
+        record.worker = self.worker
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats a record as a single-line JSON object."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "nodeid": getattr(record, "nodeid", None),
+            "worker": getattr(record, "worker", None),
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _gzip_namer(name):
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source, dest):
+    with open(source, "rb") as source_file, gzip.open(dest, "wb") as dest_file:
+        shutil.copyfileobj(source_file, dest_file)
+    os.remove(source)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    A QueueHandler that keeps the traceback of a record as its own field.
+
+    The stock `prepare()` folds the formatted traceback into the message; this
+    one only merges the arguments into the message and renders the traceback
+    to text, so the JSON-lines formatter can write the exception separately.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LogPipeline:
+    """
+    The queue, background listener and rotating JSON-lines file of one process.
+
+    Attributes:
+        path (str): The log file written by this process.
+        queue_handler (QueueHandler): The handler installed on the root logger.
+        listener (QueueListener): The background thread writing the records.
+    """
+
+    def __init__(
+        self,
+        directory=config.LOG_DIR,
+        worker=None,
+        level=config.LOG_LEVEL,
+        max_bytes=config.LOG_MAX_BYTES,
+        backup_count=config.LOG_BACKUP_COUNT,
+    ):
+        """
+        Initializes the LogPipeline.
+
+        Args:
+            directory (str): Directory the log files are written to.
+            worker (str): Worker id used in the file name and the records, defaults to `worker_id()`.
+            level (str): Minimum level of the records written.
+            max_bytes (int): Size at which the file is rotated, 0 never rotates.
+            backup_count (int): Number of compressed rotated files kept.
+        """
+        self.worker = worker or worker_id()
+        self.level = level
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{LOG_PREFIX}{self.worker}{LOG_SUFFIX}")
+
+        file_handler = RotatingFileHandler(self.path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        file_handler.namer = _gzip_namer
+        file_handler.rotator = _gzip_rotator
+        file_handler.setFormatter(JsonLinesFormatter())
+
+        self.queue_handler = StructuredQueueHandler(queue.SimpleQueue())
+        self.queue_handler.addFilter(NodeIdFilter(self.worker))
+        self.listener = QueueListener(self.queue_handler.queue, file_handler)
+
+    def start(self):
+        """Installs the queue handler on the root logger and starts the writer thread."""
+        root = logging.getLogger()
+        root.setLevel(self.level)
+        root.addHandler(self.queue_handler)
+        self.listener.start()
+        return self
+
+    def stop(self):
+        """Writes the queued records, then removes the handler and closes the file."""
+        logging.getLogger().removeHandler(self.queue_handler)
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+
+
+class LogPipelinePlugin:
+    """Tells a started LogPipeline which test is running and stops it at the end of the session."""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        _current["nodeid"] = nodeid
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        _current["nodeid"] = None
+
+    def pytest_unconfigure(self, config):
+        self.pipeline.stop()
+
+
+def log_files(directory=config.LOG_DIR):
+    """
+    Returns:
+        list: Every current and rotated log file of every worker in `directory`,
+        oldest first (`.3.gz`, `.2.gz`, `.1.gz`, then the current file).
+    """
+    def age(path):
+        base, _, rotation = os.path.basename(path).partition(f"{LOG_SUFFIX}.")
+        return base, -int(rotation.split(".")[0]) if rotation else 0
+
+    return sorted(glob.glob(os.path.join(directory, f"{LOG_PREFIX}*{LOG_SUFFIX}*")), key=age)
+
+
+def read_records(path):
+    """
+    Reads the records of one log file, compressed or not.
+
+    Yields:
+        dict: The records, skipping lines that are not valid JSON (e.g. a line cut by a crash).
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as log_file:
+        for line in log_file:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def query(test, directory=config.LOG_DIR, level=None, worker=None):
+    """
+    Collects the records of the tests whose nodeid contains `test`, oldest first.
+
+    Records are read oldest file first and the sort by timestamp is stable, so
+    records logged within the same millisecond keep their order.
+
+    Args:
+        test (str): A full nodeid or any part of it (e.g. a test name).
+        directory (str): Directory holding the log files.
+        level (str): Minimum level of the records returned, one of LEVELS in any case.
+        worker (str): Only return records written by this worker.
+
+    Returns:
+        list: The matching records.
+
+    Raises:
+        ValueError: If `level` is not a known level name.
+    """
+    min_level = logging.NOTSET
+    if level:
+        if level.upper() not in LEVELS:
+            raise ValueError(f"Unknown level {level!r}, expected one of {', '.join(LEVELS)}")
+        min_level = logging.getLevelName(level.upper())
+    records = [
+        record
+        for path in log_files(directory)
+        for record in read_records(path)
+        if record.get("nodeid") and test in record["nodeid"]
+        and logging.getLevelName(record["level"]) >= min_level
+        and (worker is None or record.get("worker") == worker)
+    ]
+    return sorted(records, key=lambda record: record["ts"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the execution log records of a test.")
+    parser.add_argument("test", help="test nodeid, or any part of it (e.g. test_get_post)")
+    parser.add_argument("--dir", default=config.LOG_DIR, help="directory holding the log files")
+    parser.add_argument("--level", type=str.upper, choices=LEVELS, help="minimum level (e.g. WARNING)")
+    parser.add_argument("--worker", help="only records of this xdist worker (e.g. gw0)")
+    parser.add_argument("--json", action="store_true", help="print the raw JSON records")
+    args = parser.parse_args()
+
+    records = query(args.test, args.dir, args.level, args.worker)
+    for record in records:
+        if args.json:
+            print(json.dumps(record, ensure_ascii=False))
+        else:
+            print(f"{record['ts']} {record['level']:<8} [{record['worker']}] {record['nodeid']} - {record['message']}")
+            if record.get("exception"):
+                print(record["exception"])
+    if not records:
+        print(f"No records found for '{args.test}' in {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
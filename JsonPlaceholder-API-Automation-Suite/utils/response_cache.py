@@ -0,0 +1,285 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from utils.deadlines import current_body_deadline, enforce_body_deadline
+
+OFF = "off"
+RECORD = "record"  # always hit the network and store the response
+REPLAY = "replay"  # only serve stored responses, a miss is an error
+REFRESH = "refresh"  # serve fresh stored responses, re-fetch missing or stale ones
+MODES = (OFF, RECORD, REPLAY, REFRESH)
+
+CACHEABLE_METHODS = ("GET", "HEAD")
+# never recorded, whatever the client retries: a timed-out or throttled request says nothing about the answer
+UNCACHEABLE_STATUSES = (408, 429)
+# headers describing the stored body, which no longer apply once the body has been decoded
+DROPPED_HEADERS = ("content-encoding", "transfer-encoding", "content-length", "connection", "keep-alive")
+EVICT_TO = 0.9  # eviction trims the store to this fraction of max_bytes, so a full store is not rescanned on every save
+
+
+class CacheMissError(requests.exceptions.RequestException):
+    """Raised in replay mode when no stored response exists for a request."""
+
+
+class ResponseStore:
+    """
+    An on-disk store of HTTP responses, one JSON file per cache key.
+
+    Reading an entry refreshes its modification time, so evicting the files
+    with the oldest modification time gives least-recently-used eviction.
+    Writes go through a temporary file and `os.replace`, which keeps the
+    store consistent when several pytest-xdist workers share it.
+
+    The total size is scanned from disk once and then kept up to date as
+    entries are saved, so the directory is only listed again when the store
+    has grown past `max_bytes` (entries written by other processes in the
+    meantime are counted by that scan). Eviction then trims it to EVICT_TO
+    of `max_bytes`, leaving room for the next saves.
+
+    Attributes:
+        directory (str): The directory holding the entries.
+        ttl (float): Seconds an entry stays fresh, 0 keeps entries fresh forever.
+        max_bytes (int): Maximum total size of the store before evicting entries.
+        vary_headers (tuple): Request headers that are part of the cache key.
+    """
+
+    def __init__(self, directory, ttl=0, max_bytes=0, vary_headers=("Accept", "Authorization")):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.vary_headers = vary_headers
+        os.makedirs(directory, exist_ok=True)
+        self._size = None  # total bytes of the entries, scanned on the first save
+        self._lock = threading.Lock()
+
+    def key(self, request):
+        """
+        Builds the cache key of a prepared request.
+
+        The key covers the method, the URL without its query, the query
+        parameters sorted by name and value, and the `vary_headers`.
+
+        Args:
+            request (requests.PreparedRequest): The request to build the key for.
+
+        Returns:
+            str: A hex digest identifying the request.
+        """
+        url = urlsplit(request.url)
+        query = urlencode(sorted(parse_qsl(url.query, keep_blank_values=True)))
+        headers = [(name.lower(), request.headers.get(name, "")) for name in self.vary_headers]
+        raw_key = json.dumps([request.method, f"{url.scheme}://{url.netloc}{url.path}", query, headers])
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        """Returns the file path of the entry stored under `key`."""
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key):
+        """
+        Reads an entry and marks it as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            dict: The stored entry, or None if there is none.
+        """
+        path = self.path(key)
+        try:
+            with open(path) as entry_file:
+                entry = json.load(entry_file)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def is_fresh(self, entry):
+        """
+        Returns:
+            bool: True if the entry is younger than the TTL.
+        """
+        return not self.ttl or time.time() - entry["stored_at"] < self.ttl
+
+    def save(self, key, response):
+        """
+        Stores a response and evicts the least recently used entries if the store is full.
+
+        Args:
+            key (str): The cache key.
+            response (requests.Response): The response to store, its body is read in full.
+        """
+        entry = {
+            "method": response.request.method,
+            "url": response.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: value for name, value in response.headers.items()
+                if name.lower() not in DROPPED_HEADERS
+            },
+            "body": base64.b64encode(response.content).decode("ascii"),
+            "stored_at": time.time(),
+        }
+        path = self.path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as entry_file:
+            json.dump(entry, entry_file)
+        if not self.max_bytes:
+            os.replace(temp_path, path)
+            return
+        size = os.path.getsize(temp_path)
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            os.replace(temp_path, path)
+            self._size += size - replaced
+            full = self._size > self.max_bytes
+        if full:
+            self.evict()
+
+    def _entries(self):
+        """Returns (modification time, size, file name) of every entry on disk."""
+        entries = []
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(".json"):
+                try:
+                    stat = os.stat(os.path.join(self.directory, file_name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, file_name))
+        return entries
+
+    def evict(self):
+        """Deletes the least recently used entries once the store exceeds `max_bytes`, down to EVICT_TO of it."""
+        if not self.max_bytes:
+            return
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * EVICT_TO if total > self.max_bytes else total
+            for _, size, file_name in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, file_name))
+                except OSError:
+                    pass
+                total -= size
+            self._size = total
+
+
+class RecordReplayAdapter(HTTPAdapter):
+    """
+    A transport adapter that records responses to a ResponseStore and replays them.
+
+    Only GET and HEAD requests go through the store; every other method is
+    always sent to the network. Only deterministic outcomes are recorded:
+    2xx, 3xx and 4xx responses except UNCACHEABLE_STATUSES and the statuses
+    the client retries, so a transient failure is never replayed.
+
+    Recording reads the body inside `send()`, before the client sees the
+    response, so it is read under the client's body deadline (see
+    `utils.deadlines.body_deadline`): a body still arriving when it passes
+    raises DeadlineExceeded and nothing is recorded.
+
+    Attributes:
+        store (ResponseStore): Where responses are recorded.
+        mode (str): One of "record", "replay" or "refresh".
+        uncacheable_statuses (set): Status codes never recorded.
+        hits (int): Number of requests answered from the store.
+        misses (int): Number of requests sent to the network.
+    """
+
+    def __init__(self, store, mode=REFRESH, uncacheable_statuses=(), **kwargs):
+        """
+        Initializes the RecordReplayAdapter.
+
+        Args:
+            store (ResponseStore): Where responses are recorded.
+            mode (str): One of "record", "replay" or "refresh".
+            uncacheable_statuses (tuple): Status codes never recorded on top of
+                UNCACHEABLE_STATUSES, e.g. the client's retried statuses.
+            **kwargs: Arguments passed to `requests.adapters.HTTPAdapter`.
+        """
+        if mode not in MODES or mode == OFF:
+            raise ValueError(f"Unsupported cache mode: {mode!r}, expected one of {MODES[1:]}")
+        super().__init__(**kwargs)
+        self.store = store
+        self.mode = mode
+        self.uncacheable_statuses = set(UNCACHEABLE_STATUSES) | set(uncacheable_statuses)
+        self.hits = 0
+        self.misses = 0
+
+    def send(self, request, **kwargs):
+        if request.method not in CACHEABLE_METHODS:
+            return super().send(request, **kwargs)
+
+        key = self.store.key(request)
+        if self.mode in (REPLAY, REFRESH):
+            entry = self.store.load(key)
+            if entry is not None and (self.mode == REPLAY or self.store.is_fresh(entry)):
+                self.hits += 1
+                return self.replay(request, entry)
+            if self.mode == REPLAY:
+                self.misses += 1
+                raise CacheMissError(f"No recorded response for {request.method} {request.url}", request=request)
+
+        self.misses += 1
+        response = super().send(request, **kwargs)
+        if self.cacheable(response.status_code):
+            expires = current_body_deadline()
+            if expires is not None:
+                # the body is read here to record it, so this is where the client's deadline must hold
+                enforce_body_deadline(response, expires)
+            self.store.save(key, response)
+        return response
+
+    def cacheable(self, status):
+        """
+        Returns:
+            bool: True if a response with this status code is recorded.
+        """
+        return status < 500 and status not in self.uncacheable_statuses
+
+    def replay(self, request, entry):
+        """
+        Builds a `requests.Response` from a stored entry.
+
+        The body is exposed through `raw`, so streamed reads behave like a live response.
+
+        Args:
+            request (requests.PreparedRequest): The request being answered.
+            entry (dict): The stored entry.
+
+        Returns:
+            requests.Response: The replayed response, with `from_cache` set to True.
+        """
+        body = base64.b64decode(entry["body"])
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.headers["Content-Length"] = str(len(body))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return response
@@ -0,0 +1,269 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from jsonschema import ValidationError
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT202012
+
+import config
+from utils.verdict_cache import schema_fingerprint
+
+SCHEMA_SUFFIX = "_schema.json"
+
+
+class BatchValidationError(ValidationError):
+    """
+    Raised when one or more items of a list response fail schema validation.
+
+    Attributes:
+        failures (list): (index, message) tuples for every failing item, in order.
+    """
+
+    MAX_REPORTED = 10  # number of failure messages spelled out in the error message
+
+    def __init__(self, schema_name, failures):
+        self.failures = failures
+        indexes = sorted({index for index, _ in failures})
+        details = "; ".join(f"[{index}] {message}" for index, message in failures[:self.MAX_REPORTED])
+        if len(failures) > self.MAX_REPORTED:
+            details += f"; ... {len(failures) - self.MAX_REPORTED} more"
+        super().__init__(
+            f"{len(indexes)} item(s) failed {schema_name} schema validation "
+            f"at index {', '.join(str(index) for index in indexes)}: {details}"
+        )
+
+
+class CompiledSchema:
+    """
+    A JSON schema that has been checked and compiled into a validator once.
+
+    The schemas in `resource/` describe list responses (`{"items": {...}}`),
+    so single objects are validated against the `items` subschema while
+    whole lists are validated item by item in one pass.
+
+    Attributes:
+        name (str): The schema name (e.g. "user" for resource/user_schema.json).
+        schema (dict): The raw JSON schema.
+        validator (Validator): The compiled validator for the whole schema.
+        item_validator (Validator): The compiled validator for a single list item.
+        fingerprint (str): Hash of the schema files and jsonschema version, used by the verdict cache.
+        verdicts (VerdictCache): Cache of passing verdicts consulted when a raw body is given, or None.
+    """
+
+    def __init__(self, name, schema, registry, fingerprint=None, verdicts=None):
+        """
+        Initializes the CompiledSchema, checking the schema a single time.
+
+        Args:
+            name (str): The schema name.
+            schema (dict): The raw JSON schema.
+            registry (referencing.Registry): Registry used to resolve `$ref`s.
+            fingerprint (str): Hash identifying the schema in the verdict cache.
+            verdicts (VerdictCache): Cache of passing verdicts, None always validates.
+        """
+        self.name = name
+        self.schema = schema
+        self.fingerprint = fingerprint
+        self.verdicts = verdicts
+
+        validator_cls = validator_for(schema)
+        validator_cls.check_schema(schema)
+        self.validator = validator_cls(schema, registry=registry)
+        # evolve() keeps the root resolver, so `$ref`s inside `items` still resolve
+        self.item_validator = self.validator.evolve(schema=schema.get("items", schema))
+
+    def validate(self, instance, body=None):
+        """
+        Validates a single object against the schema.
+
+        Args:
+            instance (dict): The object to validate.
+            body (bytes): The raw body `instance` was decoded from, only when `instance`
+                is the whole body; with a verdict cache, a body that already passed is
+                not validated again.
+
+        Raises:
+            ValidationError: If the object does not match the schema.
+        """
+        def validate():
+            error = best_match(self.item_validator.iter_errors(instance))
+            if error is not None:
+                raise error
+
+        self._cached(body, validate, "single")
+
+    def _cached(self, body, validate, mode):
+        """Runs `validate` through the verdict cache when there is one and the raw body is known."""
+        if self.verdicts is None or body is None:
+            validate()
+        else:
+            self.verdicts.validate(body, self.fingerprint, validate, mode)
+
+    def iter_failures(self, items, offset=0):
+        """
+        Validates every item and yields the ones that fail.
+
+        Args:
+            items (iterable): The items of a list response.
+            offset (int): Index of the first item, used when validating a chunk.
+
+        Yields:
+            tuple: (index, message) for every failing item.
+        """
+        for index, item in enumerate(items, start=offset):
+            message = self._first_error(item)
+            if message is not None:
+                yield index, message
+
+    def iter_validated(self, items):
+        """
+        Validates items one at a time as they are produced, e.g. by a streaming parser.
+
+        Every item is yielded right after it is validated, so the caller never
+        holds more than one of them. Failures are collected and reported together
+        once the items are exhausted, like `validate_many()`.
+
+        Args:
+            items (iterable): The items of a list response.
+
+        Yields:
+            The items, in order.
+
+        Raises:
+            BatchValidationError: After the last item, if one or more items do not match the schema.
+        """
+        failures = []
+        for index, item in enumerate(items):
+            message = self._first_error(item)
+            if message is not None:
+                failures.append((index, message))
+            yield item
+        if failures:
+            raise BatchValidationError(self.name, failures)
+
+    def _first_error(self, item):
+        """Returns the most relevant validation error message for an item, or None."""
+        error = best_match(self.item_validator.iter_errors(item))
+        return None if error is None else error.message
+
+    def validate_many(self, items, chunk_size=config.VALIDATION_CHUNK_SIZE, workers=config.VALIDATION_WORKERS,
+                      body=None):
+        """
+        Validates a whole list response in one pass and reports every failing item.
+
+        Lists longer than `chunk_size` are split into chunks and validated in
+        parallel across `workers` processes when `workers` is greater than 1.
+
+        Args:
+            items (iterable): The items of a list response.
+            chunk_size (int): Number of items per chunk for parallel validation.
+            workers (int): Number of worker processes, 0 or 1 validates in-process.
+            body (bytes): The raw body `items` were decoded from; with a verdict
+                cache, a body that already passed is not validated again.
+
+        Returns:
+            int: The number of items validated (or skipped as already valid).
+
+        Raises:
+            BatchValidationError: If one or more items do not match the schema.
+        """
+        if body is not None and self.verdicts is not None:
+            items = list(items)
+            self._cached(body, lambda: self._validate_all(items, chunk_size, workers), "many")
+            return len(items)
+        return self._validate_all(items, chunk_size, workers)
+
+    def _validate_all(self, items, chunk_size, workers):
+        if workers > 1 and isinstance(items, list) and len(items) > chunk_size:
+            chunks = [(offset, items[offset:offset + chunk_size]) for offset in range(0, len(items), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(
+                    _chunk_failures,
+                    [self.name] * len(chunks),
+                    [chunk for _, chunk in chunks],
+                    [offset for offset, _ in chunks],
+                )
+                failures = [failure for result in results for failure in result]
+            count = len(items)
+        else:
+            failures = []
+            count = 0
+            for count, item in enumerate(items, start=1):
+                message = self._first_error(item)
+                if message is not None:
+                    failures.append((count - 1, message))
+
+        if failures:
+            raise BatchValidationError(self.name, failures)
+        return count
+
+
+class SchemaRegistry:
+    """
+    Loads every schema in the schema directory once and compiles it on first use.
+
+    All schema files are registered as `$ref` targets by file name, so a schema
+    can reference another one (e.g. `{"$ref": "user_schema.json#/items"}`) and
+    the resolution is cached for the whole session.
+    """
+
+    def __init__(self, schema_dir=config.SCHEMA_DIR, verdict_cache=None):
+        """
+        Initializes the SchemaRegistry by reading every `*_schema.json` file.
+
+        Args:
+            schema_dir (str): Directory holding the schema files.
+            verdict_cache (VerdictCache): Cache of passing verdicts shared by the compiled schemas, if any.
+        """
+        self.schema_dir = schema_dir
+        self.verdict_cache = verdict_cache
+        self._schemas = {}
+        for file_name in sorted(os.listdir(schema_dir)):
+            if file_name.endswith(SCHEMA_SUFFIX):
+                with open(os.path.join(schema_dir, file_name)) as schema_file:
+                    self._schemas[file_name[:-len(SCHEMA_SUFFIX)]] = json.load(schema_file)
+
+        self.registry = Registry().with_resources(
+            (f"{name}{SCHEMA_SUFFIX}", Resource.from_contents(schema, default_specification=DRAFT202012))
+            for name, schema in self._schemas.items()
+        ).crawl()
+        self._compiled = {}
+
+    def names(self):
+        """
+        Returns:
+            list: The names of every available schema.
+        """
+        return list(self._schemas)
+
+    def get(self, name):
+        """
+        Returns the compiled schema, compiling it the first time it is requested.
+
+        Args:
+            name (str): The schema name (e.g. "user" for user_schema.json).
+
+        Returns:
+            CompiledSchema: The compiled schema.
+        """
+        if name not in self._compiled:
+            self._compiled[name] = CompiledSchema(
+                name, self._schemas[name], self.registry,
+                fingerprint=schema_fingerprint(name, self._schemas), verdicts=self.verdict_cache,
+            )
+        return self._compiled[name]
+
+
+@lru_cache(maxsize=None)
+def _worker_registry(schema_dir):
+    """Builds one SchemaRegistry per worker process."""
+    return SchemaRegistry(schema_dir)
+
+
+def _chunk_failures(name, chunk, offset):
+    """Validates one chunk of items inside a worker process."""
+    return list(_worker_registry(config.SCHEMA_DIR).get(name).iter_failures(chunk, offset))
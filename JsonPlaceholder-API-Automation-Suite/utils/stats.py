@@ -0,0 +1,39 @@
+import math
+
+
+def percentile(values, pct):
+    """
+    Computes a percentile with linear interpolation between the closest ranks.
+
+    Args:
+        values (iterable): The measured values.
+        pct (float): The percentile to compute, between 0 and 100.
+
+    Returns:
+        float: The percentile, 0.0 if there are no values.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def latency_summary(latencies_ms):
+    """
+    Summarizes latencies the way the reports present them.
+
+    Args:
+        latencies_ms (list): Latencies in milliseconds.
+
+    Returns:
+        dict: count, mean, p50, p90, p95, p99 and max, rounded to 0.1 ms.
+    """
+    summary = {"count": len(latencies_ms)}
+    summary["mean"] = round(sum(latencies_ms) / len(latencies_ms), 1) if latencies_ms else 0.0
+    for pct in (50, 90, 95, 99):
+        summary[f"p{pct}"] = round(percentile(latencies_ms, pct), 1)
+    summary["max"] = round(max(latencies_ms), 1) if latencies_ms else 0.0
+    return summary
@@ -0,0 +1,194 @@
+"""
+Opt-in cache of schema validation verdicts, keyed by content hash.
+
+Validating the same 500 comments against the same schema on every run is
+wasted CPU when the API returns byte-identical bodies. With
+`API_VERDICT_CACHE=true` a body that passed validation is remembered by the
+SHA-256 of its bytes together with a fingerprint of the schema it was checked
+against (the schema files and the jsonschema version). On the next run an
+exact match skips validation; any other body, or the same body after a schema
+change, is validated again. Only passing verdicts are stored, so a failure is
+always reported from a real validation.
+
+Streamed bodies (API_STREAM_JSON) are validated while they are read, before
+their hash is known, so they always run the full validation.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from importlib.metadata import version
+
+import config
+
+VALIDATION_CACHE_PROPERTY = "validation_cache"  # user property holding a test's hits and misses
+
+
+def schema_fingerprint(name, schemas):
+    """
+    Fingerprints a schema for the verdict cache.
+
+    Every schema of the registry is part of the fingerprint, since `$ref`s can
+    pull in the others, and so is the jsonschema version doing the validation.
+
+    Args:
+        name (str): The schema name (e.g. "comment").
+        schemas (dict): Every schema of the registry, by name.
+
+    Returns:
+        str: A SHA-256 hex digest.
+    """
+    digest = hashlib.sha256(f"{name}\0jsonschema {version('jsonschema')}\0".encode())
+    digest.update(json.dumps(schemas, sort_keys=True, separators=(",", ":")).encode())
+    return digest.hexdigest()
+
+
+class VerdictCache:
+    """
+    Passing validation verdicts, stored in one JSON file shared by consecutive runs.
+
+    Every entry records how long the validation took, so a hit can report the
+    time it saved. Entries are stamped with their last use and the least
+    recently used ones are dropped beyond `max_entries`. Saving merges with the
+    file on disk and goes through `os.replace`, so pytest-xdist workers sharing
+    the file never leave it half written.
+
+    Attributes:
+        path (str): The JSON file holding the verdicts.
+        max_entries (int): Maximum number of verdicts kept.
+        hits (int): Validations skipped because the body and schema matched a stored verdict.
+        misses (int): Validations run because no stored verdict matched.
+        saved (float): Seconds of validation the hits skipped, as measured when they were stored.
+    """
+
+    def __init__(self, path=config.VERDICT_CACHE_FILE, max_entries=config.VERDICT_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.saved = 0.0
+        self._lock = threading.Lock()
+        self._verdicts = self._load()
+        self._updated = {}
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            # a corrupt cache only costs a full validation
+            return {}
+
+    @staticmethod
+    def key(body, fingerprint, mode="single"):
+        """
+        Args:
+            body (bytes): The raw response body.
+            fingerprint (str): The fingerprint of the schema it is validated against.
+            mode (str): "single" if the body was validated as one object, "many" if
+                every item of a list body was; a verdict of one never stands for the other.
+
+        Returns:
+            str: The cache key.
+        """
+        return f"{fingerprint[:16]}:{mode}:{hashlib.sha256(body).hexdigest()}"
+
+    def validate(self, body, fingerprint, validate, mode="single"):
+        """
+        Runs `validate` unless the same body already passed against the same schema.
+
+        Args:
+            body (bytes): The raw response body the decoded data came from.
+            fingerprint (str): The fingerprint of the schema.
+            validate (callable): Validates the decoded data, raising on failure.
+            mode (str): "single" or "many", how `validate` checks the body (see `key()`).
+
+        Returns:
+            bool: True if the validation was skipped.
+
+        Raises:
+            ValidationError: If the validation runs and fails; nothing is stored then.
+        """
+        key = self.key(body, fingerprint, mode)
+        with self._lock:
+            verdict = self._verdicts.get(key)
+            if verdict is not None:
+                self.hits += 1
+                self.saved += verdict["seconds"]
+                self._updated[key] = dict(verdict, used=time.time())
+                return True
+            self.misses += 1
+
+        start = time.perf_counter()
+        validate()
+        verdict = {"seconds": round(time.perf_counter() - start, 6), "used": time.time()}
+        with self._lock:
+            self._verdicts[key] = verdict
+            self._updated[key] = verdict
+        return False
+
+    def stats(self):
+        """
+        Returns:
+            dict: The hits, misses and milliseconds saved so far.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "saved_ms": round(self.saved * 1000, 1)}
+
+    def save(self):
+        """Merges the verdicts stored or used by this process into the file."""
+        with self._lock:
+            if not self._updated:
+                return
+            verdicts = self._load()
+            verdicts.update(self._updated)
+            self._updated = {}
+        if len(verdicts) > self.max_entries:
+            kept = sorted(verdicts, key=lambda key: verdicts[key]["used"], reverse=True)[:self.max_entries]
+            verdicts = {key: verdicts[key] for key in kept}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as cache_file:
+            json.dump(verdicts, cache_file)
+        os.replace(temporary, self.path)
+
+
+class VerdictCachePlugin:
+    """
+    Sums the `validation_cache` user properties of the tests into a run summary.
+
+    Reading the reports instead of the cache keeps the summary complete under
+    pytest-xdist, where every worker has its own cache instance.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+        self.seen = False
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == VALIDATION_CACHE_PROPERTY:
+                stats = json.loads(value)
+                self.hits += stats["hits"]
+                self.misses += stats["misses"]
+                self.saved_ms += stats["saved_ms"]
+                self.seen = True
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.seen:
+            return
+        total = self.hits + self.misses
+        terminalreporter.section("validation verdict cache")
+        terminalreporter.write_line(
+            f"{self.hits} hits, {self.misses} misses ({self.hits / total:.0%} hit rate), "
+            f"{self.saved_ms:.1f} ms of schema validation skipped"
+            if total else "no response was validated"
+        )
@@ -0,0 +1,188 @@
+"""
+Write-path checks: batches of POST, PUT, PATCH and DELETE requests built from the schemas.
+
+Request bodies are generated from the resources' JSON schemas
+(`resource/*_schema.json`), so they have every required field with the right
+type and format, and the IDs updated or deleted come from the endpoint spec
+(`resource/endpoint_matrix.json`). A batch of one verb is run through the
+AsyncEngine with bounded concurrency over the pooled client, and every
+response is checked like a read: status code, echoed fields and schema.
+
+The throughput and latency of each batch are recorded as the
+`write_throughput` user property and summarized per verb at the end of the
+run. Like JSONPlaceholder, the local stand-in server answers writes without
+changing its data, so the batches can run against either one.
+"""
+import json
+import random
+import time
+
+import config
+from utils.endpoint_matrix import expand_values
+from utils.endpoints import Endpoint
+from utils.local_server import WORDS
+from utils.stats import latency_summary
+
+WRITE_VERBS = ("POST", "PUT", "PATCH", "DELETE")
+WRITE_PROPERTY = "write_throughput"  # user property holding a batch's throughput and latencies
+EXPECTED_STATUS = {"POST": 201, "PUT": 200, "PATCH": 200, "DELETE": 200}
+
+
+def payload_from_schema(schema, rng, exclude=()):
+    """
+    Generates a value matching a JSON schema.
+
+    Supports the keywords the schemas in `resource/` use: `type` (object, array,
+    string, integer, number, boolean), `properties`, `items` and the `email` format.
+
+    Args:
+        schema (dict): The schema of the value (for a resource, its `items` subschema).
+        rng (random.Random): Source of the generated values.
+        exclude (tuple): Top-level properties left out (e.g. "id", which the server assigns).
+
+    Returns:
+        The generated value.
+
+    Raises:
+        ValueError: If the schema uses a type the generator does not support.
+    """
+    kind = schema.get("type", "object" if "properties" in schema else None)
+    if isinstance(kind, list):
+        kind = next(value for value in kind if value != "null")
+    if kind == "object":
+        return {
+            name: payload_from_schema(subschema, rng)
+            for name, subschema in schema.get("properties", {}).items()
+            if name not in exclude
+        }
+    if kind == "array":
+        return [payload_from_schema(schema.get("items", {"type": "string"}), rng)]
+    if kind == "string":
+        if schema.get("format") == "email":
+            return f"{rng.choice(WORDS)}.{rng.randint(1, 9999)}@{rng.choice(WORDS)}.example"
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 8)))
+    if kind == "integer":
+        return rng.randint(1, 10)
+    if kind == "number":
+        return round(rng.uniform(-90, 90), 4)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    raise ValueError(f"Cannot generate a value for schema type {kind!r}")
+
+
+def write_endpoints(resource, verb, spec, schema, count=config.WRITE_BATCH_SIZE, seed=config.WRITE_SEED):
+    """
+    Builds a batch of write checks for one resource and verb.
+
+    Args:
+        resource (str): The resource path (e.g. "posts").
+        verb (str): One of WRITE_VERBS.
+        spec (dict): The resource's entry in the endpoint spec (its `schema` name and `ids`).
+        schema (CompiledSchema): The resource's compiled schema, the source of the payloads.
+        count (int): Number of requests in the batch.
+        seed (int): Seed of the payload generator, the same seed yields the same batch.
+
+    Returns:
+        list: The Endpoint checks, each with a unique id.
+    """
+    rng = random.Random(f"{seed}-{resource}-{verb}")
+    item_schema = schema.schema.get("items", schema.schema)
+    ids = expand_values(spec.get("ids", []))
+    endpoints = []
+    for index in range(count):
+        item_id = ids[index % len(ids)]
+        check_id = f"{verb} {resource}/{item_id}#{index}"
+        if verb == "POST":
+            payload = payload_from_schema(item_schema, rng, exclude=("id",))
+            endpoints.append(Endpoint(
+                id=f"{verb} {resource}#{index}", path=resource, method=verb, schema=spec["schema"],
+                expected_status=EXPECTED_STATUS[verb], expected_fields=tuple(payload.items()), payload=payload,
+            ))
+        elif verb == "PUT":
+            payload = {**payload_from_schema(item_schema, rng, exclude=("id",)), "id": item_id}
+            endpoints.append(Endpoint(
+                id=check_id, path=f"{resource}/{item_id}", method=verb, schema=spec["schema"],
+                expected_status=EXPECTED_STATUS[verb], expected_fields=tuple(payload.items()), payload=payload,
+            ))
+        elif verb == "PATCH":
+            full = payload_from_schema(item_schema, rng, exclude=("id",))
+            field = rng.choice(sorted(full))
+            payload = {field: full[field]}
+            endpoints.append(Endpoint(
+                id=check_id, path=f"{resource}/{item_id}", method=verb, schema=spec["schema"],
+                expected_status=EXPECTED_STATUS[verb], expected_fields=(("id", item_id), (field, full[field])),
+                payload=payload,
+            ))
+        elif verb == "DELETE":
+            endpoints.append(Endpoint(
+                id=check_id, path=f"{resource}/{item_id}", method=verb, expected_status=EXPECTED_STATUS[verb],
+            ))
+        else:
+            raise ValueError(f"Unsupported write verb {verb!r}, expected one of {', '.join(WRITE_VERBS)}")
+    return endpoints
+
+
+def run_batch(engine, endpoints):
+    """
+    Runs a batch of write checks and measures its throughput.
+
+    Args:
+        engine (AsyncEngine): Engine running the checks with bounded concurrency.
+        endpoints (list): The checks of one verb.
+
+    Returns:
+        tuple: (dict of CheckResult by endpoint id, summary dict with count, errors,
+        duration, throughput_rps, latency percentiles and the raw latencies)
+    """
+    start = time.perf_counter()
+    results = engine.run(endpoints)
+    duration = time.perf_counter() - start
+    latencies = [
+        result.timing.total_ms if result.timing is not None else result.elapsed * 1000 for result in results.values()
+    ]
+    summary = latency_summary(latencies)
+    summary.update({
+        "errors": sum(1 for result in results.values() if not result.passed),
+        "concurrency": engine.concurrency,
+        "duration": round(duration, 3),
+        "throughput_rps": round(len(results) / duration, 2) if duration else 0.0,
+        "latencies_ms": [round(latency, 1) for latency in latencies],
+    })
+    return results, summary
+
+
+class WriteThroughputPlugin:
+    """
+    Summarizes the `write_throughput` user properties per verb at the end of the run.
+
+    Reading the reports keeps the summary complete under pytest-xdist.
+    """
+
+    def __init__(self):
+        self.batches = []
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call":
+            return
+        for name, value in report.user_properties:
+            if name == WRITE_PROPERTY:
+                self.batches.append(json.loads(value))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.batches:
+            return
+        terminalreporter.section("write path throughput")
+        for verb in WRITE_VERBS:
+            batches = [batch for batch in self.batches if batch["verb"] == verb]
+            if not batches:
+                continue
+            count = sum(batch["count"] for batch in batches)
+            errors = sum(batch["errors"] for batch in batches)
+            duration = sum(batch["duration"] for batch in batches)
+            summary = latency_summary([latency for batch in batches for latency in batch["latencies_ms"]])
+            terminalreporter.write_line(
+                f"{verb:<7} {count} requests, {errors} errors, {count / duration if duration else 0:.1f} req/s, "
+                f"p50 {summary['p50']} ms, p95 {summary['p95']} ms, p99 {summary['p99']} ms, max {summary['max']} ms "
+                f"({', '.join(batch['resource'] for batch in batches)})",
+                red=bool(errors),
+            )
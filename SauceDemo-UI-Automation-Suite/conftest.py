@@ -1,20 +1,125 @@
+import os
+
 import pytest
-from utils.browser import get_driver
+from utils.asset_cache import save_asset_cache
+from utils.auth_session import AuthSession
+from utils.driver_pool import PREWARM, PREWARM_PROPERTY, DriverPool, PrewarmPlugin
+from utils.grid import SLOT_WAIT_PROPERTY, GridCapacityPlugin, GridSlots, grid_workers
+from utils.wait_engine import HISTORY, WaitTelemetryPlugin
+
+# history-based xdist sharding shared with the API suite (plugins/duration_sharding.py)
+pytest_plugins = ["duration_sharding"]
+
+USE_GRID = os.getenv('USE_GRID', 'false').lower() == 'true'
+SELENIUM_HUB_URL = os.getenv('SELENIUM_HUB_URL', 'http://localhost:4444')
+DRIVER_POOL = pytest.StashKey[DriverPool]()
+
+def pytest_configure(config):
+    # summary of the time tests waited for a Grid slot, separate from their execution time
+    config.pluginmanager.register(GridCapacityPlugin(), "grid_capacity")
+    # summary of the browser startup hidden by UI_DRIVER_PREWARM
+    config.pluginmanager.register(PrewarmPlugin(), "driver_prewarm")
+    # time and polls of every page action's wait, to find the waits dominating UI test time
+    config.pluginmanager.register(WaitTelemetryPlugin(), "page_waits")
+
+    # one pool per process, created before collection so pre-warmed browsers start alongside it;
+    # under xdist the controller runs no tests and only the workers start browsers
+    pool = config.stash[DRIVER_POOL] = DriverPool(slots=GridSlots(SELENIUM_HUB_URL) if USE_GRID else None)
+    xdist_controller = bool(config.getoption("numprocesses", None)) and not hasattr(config, "workerinput")
+    if PREWARM and not config.option.collectonly and not xdist_controller:
+        pool.prewarm(PREWARM)
+
+def pytest_unconfigure(config):
+    # quit the browsers still in the pool, including pre-warmed ones no test used
+    pool = config.stash.get(DRIVER_POOL, None)
+    if pool is not None:
+        pool.close()
+    # merge the static assets this process recorded into the shared on-disk cache
+    save_asset_cache()
+    # keep this run's wait durations for the adaptive timeouts of the next runs
+    HISTORY.save()
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    # `-n auto` in Grid mode starts one worker per free Grid slot instead of one per CPU
+    if USE_GRID:
+        return grid_workers(SELENIUM_HUB_URL)
+    return None
+
+@pytest.fixture(scope="session")
+def driver_pool(pytestconfig):
+    """
+    Fixture keeping warm WebDriver instances for the whole session (one pool per xdist worker).
+
+    Returns:
+        DriverPool: The pool the `browser` fixture leases browsers from.
+
+    Notes:
+    - The pool is created in `pytest_configure`, so with UI_DRIVER_PREWARM=N its first N
+      browsers start in the background while the tests are collected.
+    - Browsers are otherwise started by `get_driver()` on first use. In Grid mode every
+      browser holds a Grid slot, so the workers never request more sessions than it can run.
+    - `pytest_unconfigure` quits every browser still in the pool.
+    """
+
+    return pytestconfig.stash[DRIVER_POOL]
 
 @pytest.fixture
-def browser():
+def browser(driver_pool, request):
     """
-    Fixture to set up and tear down a WebDriver instance.
+    Fixture to lease a WebDriver instance to a test.
 
     Yields:
-        webdriver: A WebDriver instance.
+        webdriver: A WebDriver instance with no cookies or storage, showing about:blank.
 
     Steps:
-    1. Call the `get_driver()` function to obtain a WebDriver instance.
+    1. Lease a warm browser from the pool, or start one with `get_driver()` if none is idle;
+       in Grid mode the time spent waiting for a free slot is recorded as `grid_slot_wait`, and
+       the startup time a pre-warmed browser saved is recorded as `prewarm_hidden`.
     2. Yield the WebDriver instance to the test.
-    3. After the test finishes, call `driver.quit()` to close the browser.
+    3. After the test finishes, clear its cookies, localStorage and sessionStorage, navigate
+       to about:blank and return it to the pool; a browser that crashed or has served
+       UI_DRIVER_MAX_USES tests is quit instead.
+    """
+
+    waited = driver_pool.stats["slot_wait_seconds"]
+    hidden = driver_pool.stats["hidden_seconds"]
+    with driver_pool.lease() as driver:
+        if USE_GRID:
+            request.node.user_properties.append(
+                (SLOT_WAIT_PROPERTY, round(driver_pool.stats["slot_wait_seconds"] - waited, 3))
+            )
+        if driver_pool.stats["hidden_seconds"] > hidden:
+            request.node.user_properties.append(
+                (PREWARM_PROPERTY, round(driver_pool.stats["hidden_seconds"] - hidden, 3))
+            )
+        yield driver
+
+@pytest.fixture(scope="session")
+def auth_session():
+    """
+    Fixture holding the standard user's session for the whole session (one per xdist worker).
+
+    Returns:
+        AuthSession: Logs in through the UI on first use, then injects the captured session.
+    """
+
+    return AuthSession()
+
+@pytest.fixture
+def logged_in_browser(browser, auth_session):
+    """
+    Fixture to provide a browser already logged in as the standard user, showing the inventory page.
+
+    Yields:
+        webdriver: The leased WebDriver instance on inventory.html.
+
+    Steps:
+    1. Lease a browser through the `browser` fixture.
+    2. Inject the captured session cookies and storage and open inventory.html directly
+       (the first test, or the first after the session expired, performs the real UI login).
+    3. Yield the WebDriver instance to the test.
     """
 
-    driver = get_driver()
-    yield driver
-    driver.quit()
\ No newline at end of file
+    auth_session.open(browser, "inventory.html")
+    yield browser
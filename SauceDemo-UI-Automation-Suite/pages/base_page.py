@@ -0,0 +1,44 @@
+import sys
+
+from utils.wait_engine import WaitEngine
+
+
+class BasePage:
+    """
+    This class is the base of the page objects of the Sauce Demo application.
+
+    Provides the shared wait engine every page action waits through, so waits
+    are reused, polled per condition, timed and counted.
+
+    Attributes:
+        driver (WebDriver): The WebDriver instance used to interact with the page.
+        waits (WaitEngine): The wait engine of the browser, shared by all its page objects.
+    """
+
+    def __init__(self, driver):
+        """
+        Initializes the page object with the provided WebDriver instance.
+
+        Args:
+            driver (WebDriver): The WebDriver instance used to interact with the page.
+        """
+        self.driver = driver
+        self.waits = WaitEngine.for_driver(driver)
+
+    def wait(self, condition, target, timeout=None):
+        """
+        Waits for a condition on an element and records the wait under the calling page action.
+
+        Args:
+            condition (str): "present", "all_present", "visible", "clickable" or "url_contains".
+            target (tuple or str): The element locator, or the URL fragment for "url_contains".
+            timeout (float): Longest wait, defaults to the learned or the default (10 second) timeout.
+
+        Returns:
+            The value of the condition (e.g. the WebElement).
+
+        Raises:
+            TimeoutException: If the condition is not met within the timeout.
+        """
+        action = f"{type(self).__name__}.{sys._getframe(1).f_code.co_name}"
+        return self.waits.until(condition, target, action, timeout)
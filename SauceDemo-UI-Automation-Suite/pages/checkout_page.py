@@ -1,9 +1,9 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
+from pages.base_page import BasePage
 
-class CheckoutPage:
+
+class CheckoutPage(BasePage):
     """
     This class represents the Checkout Page of the Sauce Demo application.
 
@@ -26,7 +26,7 @@ class CheckoutPage:
         Args:
             driver (WebDriver): The WebDriver instance used to interact with the page.
         """
-        self.driver = driver
+        super().__init__(driver)
         self.first_name_locator = (By.ID, "first-name")
         self.last_name_locator = (By.ID, "last-name")
         self.zip_code_locator = (By.ID, "postal-code")
@@ -37,50 +37,50 @@ class CheckoutPage:
         """
         Enters the provided first name into the first name input field on the checkout page.
 
-        Uses WebDriverWait with a 10-second timeout to wait for the element to be clickable
+        Uses BasePage.wait with a timeout of up to 10 seconds to wait for the element to be clickable
         before sending the keys.
 
         Args:
             first_name (str): The first name to enter.
         """
-        WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(self.first_name_locator)).send_keys(first_name)
+        self.wait("clickable", self.first_name_locator).send_keys(first_name)
 
     def checkout_last_name(self, last_name):
         """
         Enters the provided last name into the last name input field on the checkout page.
 
-        Uses WebDriverWait with a 10-second timeout to wait for the element to be clickable
+        Uses BasePage.wait with a timeout of up to 10 seconds to wait for the element to be clickable
         before sending the keys.
 
         Args:
             last_name (str): The last name to enter.
         """
-        WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(self.last_name_locator)).send_keys(last_name)
+        self.wait("clickable", self.last_name_locator).send_keys(last_name)
 
     def checkout_zipcode(self, zip_code):
         """
         Enters the provided zip code into the zip code input field on the checkout page.
 
-        Uses WebDriverWait with a 10-second timeout to wait for the element to be clickable
+        Uses BasePage.wait with a timeout of up to 10 seconds to wait for the element to be clickable
         before sending the keys.
 
         Args:
             zip_code (str): The zip code to enter.
         """
-        WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(self.zip_code_locator)).send_keys(zip_code)
+        self.wait("clickable", self.zip_code_locator).send_keys(zip_code)
 
     def click_continue(self):
         """
         Clicks the "Continue" button on the checkout page.
 
-        Uses WebDriverWait with a 10-second timeout to wait for the button to be clickable before clicking.
+        Uses BasePage.wait with a timeout of up to 10 seconds to wait for the button to be clickable before clicking.
         """
-        WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(self.continue_locator)).click()
+        self.wait("clickable", self.continue_locator).click()
 
     def click_finish(self):
         """
         Clicks the "Finish" button on the checkout page.
 
-        Uses WebDriverWait with a 10-second timeout to wait for the button to be clickable before clicking.
+        Uses BasePage.wait with a timeout of up to 10 seconds to wait for the button to be clickable before clicking.
         """
-        WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(self.finish_locator)).click()
\ No newline at end of file
+        self.wait("clickable", self.finish_locator).click()
\ No newline at end of file
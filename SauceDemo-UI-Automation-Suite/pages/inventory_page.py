@@ -1,9 +1,9 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
+from pages.base_page import BasePage
 
-class InventoryPage:
+
+class InventoryPage(BasePage):
     """
     This class represents the Inventory Page of the Sauce Demo application.
 
@@ -26,7 +26,7 @@ class InventoryPage:
         Args:
             driver (WebDriver): The WebDriver instance used to interact with the page.
         """
-        self.driver = driver
+        super().__init__(driver)
         self.product_inventory = (By.CLASS_NAME, "inventory_item_name")  # Product name locator
         self.add_to_cart_locator = (By.ID, "add-to-cart")  # "Add To Cart" button locator
         self.cart_flipped_text = (By.XPATH, "//*[@id='remove']")  # Text indicating item in cart
@@ -35,13 +35,13 @@ class InventoryPage:
         """
         Searches for a product on the inventory page and clicks on it.
 
-        Uses WebDriverWait with a 10-second timeout to wait for the product list to be present.
+        Uses BasePage.wait with a timeout of up to 10 seconds to wait for the product list to be present.
         Then iterates through each product name and clicks on the one that matches the provided name.
 
         Args:
             product_name (str): The name of the product to search for.
         """
-        inventory_items = WebDriverWait(self.driver, 10).until(EC.presence_of_all_elements_located(self.product_inventory))
+        inventory_items = self.wait("all_present", self.product_inventory)
 
         for product in inventory_items:
             if product_name in product.text:
@@ -52,13 +52,13 @@ class InventoryPage:
         """
         Clicks the "Add To Cart" button and returns the confirmation text.
 
-        Uses WebDriverWait with a 10-second timeout to wait for the button to be clickable.
-        Then clicks the button and uses WebDriverWait again to wait for a confirmation text to appear
+        Uses BasePage.wait with a timeout of up to 10 seconds to wait for the button to be clickable.
+        Then clicks the button and uses the wait engine again to wait for a confirmation text to appear
         (e.g., the text might change from "Add To Cart" to "REMOVE").
 
         Returns:
             str: The confirmation text that appears after adding an item to the cart.
         """
-        WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(self.add_to_cart_locator)).click()
+        self.wait("clickable", self.add_to_cart_locator).click()
 
-        return WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(self.cart_flipped_text)).text
\ No newline at end of file
+        return self.wait("clickable", self.cart_flipped_text).text
\ No newline at end of file
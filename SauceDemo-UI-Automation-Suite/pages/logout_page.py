@@ -1,9 +1,9 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
+from pages.base_page import BasePage
 
-class LogoutPage:
+
+class LogoutPage(BasePage):
     """
     This class represents the Logout Page of the Sauce Demo application.
 
@@ -23,7 +23,7 @@ class LogoutPage:
         Args:
             driver (WebDriver): The WebDriver instance used to interact with the page.
         """
-        self.driver = driver
+        super().__init__(driver)
         self.menu_icon_locator = (By.ID, "react-burger-menu-btn")
         self.logout_locator = (By.ID, "logout_sidebar_link")
 
@@ -31,19 +31,19 @@ class LogoutPage:
         """
         Clicks the menu icon on the Logout Page (if present).
 
-        Uses WebDriverWait with a 10-second timeout to wait for the element to be clickable.
+        Uses BasePage.wait with a timeout of up to 10 seconds to wait for the element to be clickable.
         If the element is not found within the timeout, a TimeoutException is raised.
 
         This method is useful when the logout functionality requires clicking a menu first
         to access the logout option.
         """
-        WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(self.menu_icon_locator)).click()
+        self.wait("clickable", self.menu_icon_locator).click()
 
     def click_logout(self):
         """
         Clicks the logout button on the Logout Page.
 
-        Uses WebDriverWait with a 10-second timeout to wait for the element to be clickable.
+        Uses BasePage.wait with a timeout of up to 10 seconds to wait for the element to be clickable.
         If the element is not found within the timeout, a TimeoutException is raised.
         """
-        WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(self.logout_locator)).click()
\ No newline at end of file
+        self.wait("clickable", self.logout_locator).click()
\ No newline at end of file
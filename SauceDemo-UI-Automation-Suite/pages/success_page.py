@@ -1,9 +1,9 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
+from pages.base_page import BasePage
 
-class SuccessPage:
+
+class SuccessPage(BasePage):
     """
     This class represents the Success Page of the Sauce Demo application.
 
@@ -20,7 +20,7 @@ class SuccessPage:
         Args:
             driver (WebDriver): The WebDriver instance used to interact with the page.
         """
-        self.driver = driver
+        super().__init__(driver)
         self.success_message = (By.XPATH, "//*[@id='checkout_complete_container']/h2")
         self.back_home = (By.ID, "back-to-products")
 
@@ -28,20 +28,20 @@ class SuccessPage:
         """
         Verifies the presence of the success message element and returns its text.
 
-        Uses WebDriverWait with a 10-second timeout to wait for the element to be present.
+        Uses BasePage.wait with a timeout of up to 10 seconds to wait for the element to be present.
         If the element is not found within the timeout, a TimeoutException is raised.
 
         Returns:
             str: The text of the success message element.
         """
-        success_text = WebDriverWait(self.driver, 10).until(EC.presence_of_element_located(self.success_message)).text
+        success_text = self.wait("present", self.success_message).text
         return success_text
 
     def click_back_home(self):
         """
         Clicks the "Back To Products" button on the Success Page.
 
-        Uses WebDriverWait with a 10-second timeout to wait for the button to be clickable.
+        Uses BasePage.wait with a timeout of up to 10 seconds to wait for the button to be clickable.
         If the button is not clickable within the timeout, a TimeoutException is raised.
         """
-        WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(self.back_home)).click()
\ No newline at end of file
+        self.wait("clickable", self.back_home).click()
\ No newline at end of file
@@ -1,22 +1,14 @@
-from pages.login_page import LoginPage
 from pages.inventory_page import InventoryPage
 from pages.cart_page import CartPage
 
-def test_cart_success(browser):
-    # Navigate to login page
-    browser.get("https://www.saucedemo.com/")
+def test_cart_success(logged_in_browser):
+    # The logged_in_browser fixture starts on the inventory page as the standard user
 
-    # Login with valid credentials
-    login_page_object = LoginPage(browser)
-    login_page_object.enter_username("standard_user")
-    login_page_object.enter_password("secret_sauce")
-    login_page_object.click_login()
-
-    # Validate successful login
-    assert "inventory.html" in browser.current_url, "Login failed!"
+    # Validate the inventory page is open
+    assert "inventory.html" in logged_in_browser.current_url, "Login failed!"
 
     # Search for product on Inventory Page
-    inventory_page = InventoryPage(browser)
+    inventory_page = InventoryPage(logged_in_browser)
     inventory_page.search_product("Sauce Labs Onesie")
 
     # Add product to cart
@@ -24,7 +16,7 @@ def test_cart_success(browser):
     assert "Remove" in text, "Add to cart failed!"
 
     # Proceed to checkout from Cart Page
-    cart_page_object = CartPage(browser)
+    cart_page_object = CartPage(logged_in_browser)
     cart_page_object.proceed_cart()
 
     # Verify added product details
@@ -35,4 +27,4 @@ def test_cart_success(browser):
     cart_page_object.checkout_button()
 
     # Validate checkout page URL
-    assert "checkout-step-one.html" in browser.current_url, "Checkout failed!"
\ No newline at end of file
+    assert "checkout-step-one.html" in logged_in_browser.current_url, "Checkout failed!"
\ No newline at end of file
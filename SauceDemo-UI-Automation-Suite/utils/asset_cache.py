@@ -0,0 +1,235 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.driver_cache import CACHE_DIR, file_lock
+
+logger = logging.getLogger(__name__)
+
+# Environment Variables:
+# - UI_ASSET_CACHE: Set to 'true' to serve static assets from the on-disk cache (default: false)
+# - UI_ASSET_CACHE_DIR: Directory of the cached assets (default: ~/.cache/autotestlab/assets)
+# - UI_ASSET_CACHE_MAX_MB: Size the cache is trimmed to, least recently used assets first (default: 200)
+ENABLED = os.getenv("UI_ASSET_CACHE", "false").lower() == "true"
+ASSET_DIR = os.getenv("UI_ASSET_CACHE_DIR", os.path.join(CACHE_DIR, "assets"))
+MAX_BYTES = int(float(os.getenv("UI_ASSET_CACHE_MAX_MB", "200")) * 1024 * 1024)
+INDEX_FILE = "index.json"
+MAX_ASSET_BYTES = 10 * 1024 * 1024  # larger responses are not kept by the browser for recording
+
+# static assets only: documents and API calls always go to the network
+STATIC_ASSET = re.compile(r"\.(js|mjs|css|png|jpe?g|gif|svg|webp|ico|woff2?|ttf|otf|map)(\?.*)?$", re.IGNORECASE)
+
+
+def _field(params, name):
+    """Reads a field of a BiDi event, delivered as a dict or as a parameters object."""
+    return params.get(name) if isinstance(params, dict) else getattr(params, name, None)
+
+
+class AssetCache:
+    """
+    Serves static assets to browsers from disk, recorded on their first fetch.
+
+    The cache works through WebDriver BiDi network interception, so it applies
+    to local and Selenium Grid browsers alike (the driver needs `webSocketUrl`,
+    see `enable()`). Requests for static assets (scripts, stylesheets, images,
+    fonts) are paused: a cached asset is answered from disk without touching the
+    network, any other request continues. Responses of uncached assets are
+    recorded when they complete.
+
+    The index maps every URL to the SHA-256 of its content; the content is
+    stored once per hash, so the same file under several URLs is kept once.
+    When the cache grows past `max_bytes`, the least recently used URLs are
+    dropped with the content no other URL refers to. The index is shared by
+    every process on the machine (e.g. the xdist workers) and merged under a
+    file lock when saved.
+
+    Attributes:
+        directory (str): Directory of the index and the content files.
+        max_bytes (int): Size the cache is trimmed to.
+        index (dict): URL mapped to its content hash, size, content type and last use.
+        stats (dict): Requests served from the cache, fetched from the network,
+            assets recorded and assets evicted.
+    """
+
+    def __init__(self, directory=ASSET_DIR, max_bytes=MAX_BYTES):
+        """
+        Initializes the AssetCache and loads its index.
+
+        Args:
+            directory (str): Directory of the index and the content files.
+            max_bytes (int): Size the cache is trimmed to.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.index = self._read_index()
+        self.stats = {"hits": 0, "misses": 0, "recorded": 0, "evicted": 0}
+        self._lock = threading.Lock()
+
+    def _read_index(self):
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE)) as index_file:
+                return json.load(index_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _content_path(self, digest):
+        return os.path.join(self.directory, digest)
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    @staticmethod
+    def enable(options):
+        """
+        Asks for the WebDriver BiDi connection the cache intercepts requests through.
+
+        Args:
+            options (Options): The ChromeOptions of the driver being created.
+        """
+        options.enable_bidi = True
+
+    def attach(self, driver):
+        """
+        Starts serving and recording static assets in a browser.
+
+        If the browser has no BiDi connection (e.g. an old Grid), the cache is
+        skipped with a warning and the browser uses the network as before.
+
+        Args:
+            driver (WebDriver): A browser created with `enable()`d options.
+        """
+        try:
+            network = driver.network
+            collector = network.add_data_collector(
+                data_types=["response"], max_encoded_data_size=MAX_ASSET_BYTES
+            )["collector"]
+            network.add_request_handler(self._serve)
+            network.add_event_handler(
+                "response_completed", lambda params: self._record(network, collector, params)
+            )
+        except (WebDriverException, AttributeError, KeyError, TypeError) as e:
+            logger.warning(f"Static asset cache disabled for this browser, BiDi interception unavailable: {e}")
+
+    def _serve(self, request):
+        """Answers a paused request from disk when its asset is cached; other requests continue."""
+        if request.method != "GET" or not STATIC_ASSET.search(request.url):
+            return
+        entry = self.index.get(request.url)
+        if entry is None:
+            self._count("misses")
+            return
+        try:
+            with open(self._content_path(entry["sha256"]), "rb") as content:
+                body = content.read()
+        except FileNotFoundError:
+            # evicted by another process
+            self._count("misses")
+            return
+        entry["last_used"] = time.time()
+        self._count("hits")
+        headers = {"Content-Type": entry["content_type"], "Content-Length": str(len(body))}
+        request.provide_response(
+            status=200, headers=headers, body={"type": "base64", "value": base64.b64encode(body).decode()}
+        )
+
+    def _record(self, network, collector, params):
+        """Stores the body of a completed static asset response fetched from the network."""
+        request, response = _field(params, "request") or {}, _field(params, "response") or {}
+        url = response.get("url") or request.get("url", "")
+        if (
+            request.get("method") != "GET"
+            or response.get("status") != 200
+            or not STATIC_ASSET.search(url)
+            or url in self.index
+        ):
+            return
+        try:
+            data = network.get_data(data_type="response", collector=collector, request=request["request"], disown=True)
+        except WebDriverException:
+            # the body was too large to keep or is gone already
+            return
+        value = data["bytes"]
+        body = base64.b64decode(value["value"]) if value["type"] == "base64" else value["value"].encode()
+        headers = {header["name"].lower(): header["value"].get("value") for header in response.get("headers", [])}
+        self.add(url, body, headers.get("content-type") or response.get("mimeType") or "application/octet-stream")
+
+    def add(self, url, body, content_type):
+        """
+        Records an asset.
+
+        Args:
+            url (str): The asset URL.
+            body (bytes): Its content.
+            content_type (str): Its Content-Type header.
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._content_path(digest)
+        if not os.path.exists(path):
+            temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporary, "wb") as content:
+                content.write(body)
+            os.replace(temporary, path)
+        with self._lock:
+            self.index[url] = {
+                "sha256": digest, "size": len(body), "content_type": content_type, "last_used": time.time(),
+            }
+            self.stats["recorded"] += 1
+
+    def save(self):
+        """Merges the index with the one on disk, evicts the least recently used assets and writes it."""
+        with file_lock(os.path.join(self.directory, f"{INDEX_FILE}.lock")):
+            index = self._read_index()
+            with self._lock:
+                for url, entry in self.index.items():
+                    if url not in index or index[url]["last_used"] < entry["last_used"]:
+                        index[url] = entry
+            sizes = {entry["sha256"]: entry["size"] for entry in index.values()}
+            by_age = sorted(index, key=lambda url: index[url]["last_used"])
+            while by_age and sum(sizes.values()) > self.max_bytes:
+                evicted = index.pop(by_age.pop(0))
+                self.stats["evicted"] += 1
+                if all(entry["sha256"] != evicted["sha256"] for entry in index.values()):
+                    sizes.pop(evicted["sha256"], None)
+                    try:
+                        os.remove(self._content_path(evicted["sha256"]))
+                    except FileNotFoundError:
+                        pass
+            path = os.path.join(self.directory, INDEX_FILE)
+            with open(f"{path}.tmp", "w") as index_file:
+                json.dump(index, index_file)
+            os.replace(f"{path}.tmp", path)
+            self.index = index
+        logger.info(
+            f"Static asset cache: {self.stats['hits']} served from disk, {self.stats['misses']} fetched, "
+            f"{self.stats['recorded']} recorded, {self.stats['evicted']} evicted, "
+            f"{len(index)} assets ({sum(sizes.values()) / 1024 / 1024:.1f} MB) kept"
+        )
+
+
+_cache = None
+
+
+def asset_cache():
+    """
+    Returns:
+        AssetCache: The process-wide cache, created on first use.
+    """
+    global _cache
+    if _cache is None:
+        _cache = AssetCache()
+    return _cache
+
+
+def save_asset_cache():
+    """Saves the process-wide cache if it was used."""
+    if _cache is not None:
+        _cache.save()
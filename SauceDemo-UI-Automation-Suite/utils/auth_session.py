@@ -0,0 +1,138 @@
+import logging
+import time
+from urllib.parse import urljoin
+
+from pages.login_page import LoginPage
+from utils.wait_engine import WaitEngine
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://www.saucedemo.com/"
+USERNAME = "standard_user"
+PASSWORD = "secret_sauce"
+EXPIRY_MARGIN = 60  # seconds; a session expiring sooner than this is replaced by a new login
+
+READ_STORAGE_SCRIPT = """
+const dump = (storage) => Object.fromEntries(Object.keys(storage).map((key) => [key, storage.getItem(key)]));
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+WRITE_STORAGE_SCRIPT = """
+const [local, session] = arguments;
+Object.entries(local).forEach(([key, value]) => window.localStorage.setItem(key, value));
+Object.entries(session).forEach(([key, value]) => window.sessionStorage.setItem(key, value));
+"""
+
+
+class AuthSession:
+    """
+    Logs in through the UI once and injects the resulting session into later browsers.
+
+    The first `open()` performs the real login (LoginPage) and captures the
+    session cookies, localStorage and sessionStorage. Later calls add them to
+    the browser and load the target page directly, skipping the login page and
+    its form. SauceDemo's session cookie expires after a few minutes, so an
+    expired session is replaced by a new login.
+
+    Attributes:
+        username (str): The user logged in.
+        password (str): Its password.
+        cookies (list): The captured session cookies, None before the first login.
+        local_storage (dict): The captured localStorage items.
+        session_storage (dict): The captured sessionStorage items.
+        stats (dict): Real logins performed and sessions injected.
+    """
+
+    def __init__(self, username=USERNAME, password=PASSWORD, base_url=BASE_URL):
+        """
+        Initializes the AuthSession. No login happens until the first `open()`.
+
+        Args:
+            username (str): The user to log in.
+            password (str): Its password.
+            base_url (str): The application URL.
+        """
+        self.username = username
+        self.password = password
+        self.base_url = base_url
+        self.cookies = None
+        self.local_storage = {}
+        self.session_storage = {}
+        self.stats = {"logins": 0, "injected": 0}
+
+    def expired(self):
+        """
+        Returns:
+            bool: True if there is no captured session or one of its cookies expires within EXPIRY_MARGIN.
+        """
+        if self.cookies is None:
+            return True
+        deadline = time.time() + EXPIRY_MARGIN
+        return any("expiry" in cookie and cookie["expiry"] < deadline for cookie in self.cookies)
+
+    def login(self, driver):
+        """
+        Performs the real UI login and captures the resulting session.
+
+        Args:
+            driver (WebDriver): The browser to log in with; it is left on the inventory page.
+        """
+        driver.get(self.base_url)
+        login_page = LoginPage(driver)
+        login_page.enter_username(self.username)
+        login_page.enter_password(self.password)
+        login_page.click_login()
+        WaitEngine.for_driver(driver).until("url_contains", "inventory.html", "AuthSession.login")
+
+        self.cookies = driver.get_cookies()
+        storage = driver.execute_script(READ_STORAGE_SCRIPT)
+        self.local_storage, self.session_storage = storage["local"], storage["session"]
+        self.stats["logins"] += 1
+        logger.info(f"Logged in as {self.username} and captured {len(self.cookies)} session cookie(s)")
+
+    def inject(self, driver, path):
+        """
+        Adds the captured session to a browser and loads `path`.
+
+        On local Chrome the cookies are set through the DevTools protocol before
+        the first navigation, so only the target page is loaded. Elsewhere
+        (Selenium Grid) cookies can only be added on a page of the application's
+        origin, so that page is loaded first.
+
+        Args:
+            driver (WebDriver): The browser, with no cookies for the application.
+            path (str): The page to open, relative to the application URL.
+        """
+        url = urljoin(self.base_url, path)
+        has_storage = bool(self.local_storage or self.session_storage)
+        if hasattr(driver, "execute_cdp_cmd") and not has_storage:
+            for cookie in self.cookies:
+                driver.execute_cdp_cmd("Network.setCookie", {
+                    "name": cookie["name"],
+                    "value": cookie["value"],
+                    "url": self.base_url,
+                    "path": cookie.get("path", "/"),
+                    **({"expires": cookie["expiry"]} if "expiry" in cookie else {}),
+                })
+        else:
+            driver.get(url)
+            for cookie in self.cookies:
+                driver.add_cookie({key: value for key, value in cookie.items() if key != "domain"})
+            if has_storage:
+                driver.execute_script(WRITE_STORAGE_SCRIPT, self.local_storage, self.session_storage)
+        driver.get(url)
+        self.stats["injected"] += 1
+
+    def open(self, driver, path="inventory.html"):
+        """
+        Opens a page of the application as a logged-in user.
+
+        Args:
+            driver (WebDriver): The browser, with no cookies for the application.
+            path (str): The page to open, relative to the application URL.
+        """
+        if self.expired():
+            self.login(driver)
+            if path != "inventory.html":
+                driver.get(urljoin(self.base_url, path))
+            return
+        self.inject(driver, path)
@@ -1,12 +1,110 @@
+import logging
 import os
+import time
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.remote.webdriver import WebDriver
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.options import Options
+from utils.asset_cache import AssetCache, asset_cache
+from utils.asset_cache import ENABLED as USE_ASSET_CACHE
+from utils.driver_cache import resolve_chromedriver
 
+logger = logging.getLogger(__name__)
 
-def get_driver():
+_local_drivers_started = 0  # local drivers started by this process, to tell the first startup from later ones
+
+# Environment Variables:
+# - UI_LEAN_PROFILE: Set to 'true' to block unused resources, load pages eagerly and apply tuned Chrome flags (default: false)
+# - UI_BLOCKED_URLS: Comma-separated URL patterns the lean profile blocks (default: DEFAULT_BLOCKED_URLS)
+# - UI_PAGE_LOAD_STRATEGY: Page load strategy of the lean profile, 'eager' or 'normal' (default: eager)
+LEAN_PROFILE = os.getenv('UI_LEAN_PROFILE', 'false').lower() == 'true'
+PAGE_LOAD_STRATEGY = os.getenv('UI_PAGE_LOAD_STRATEGY', 'eager')
+
+# product images, web fonts and third-party scripts; none of the assertions use them
+DEFAULT_BLOCKED_URLS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*google-analytics.com*", "*googletagmanager.com*", "*backtrace.io*", "*events.backtrace.io*",
+]
+BLOCKED_URLS = [
+    pattern.strip() for pattern in os.getenv('UI_BLOCKED_URLS', ','.join(DEFAULT_BLOCKED_URLS)).split(',')
+    if pattern.strip()
+]
+
+# Chrome flags of the lean profile: no background services, extensions or image decoding
+LEAN_CHROME_FLAGS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--no-first-run",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+]
+
+
+def apply_lean_options(options):
+    """
+    Applies the lean profile's page load strategy and Chrome flags to ChromeOptions.
+
+    The `eager` strategy returns from `get()` at DOMContentLoaded instead of
+    waiting for every image and font. It is safe here because every page
+    object waits for its elements explicitly.
+
+    Args:
+        options (Options): The ChromeOptions of the driver being created.
+    """
+    options.page_load_strategy = PAGE_LOAD_STRATEGY
+    for flag in LEAN_CHROME_FLAGS:
+        options.add_argument(flag)
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+
+def execute_cdp(driver, cmd, params):
+    """
+    Runs a Chrome DevTools Protocol command on a local or remote Chrome.
+
+    Selenium Grid forwards chromedriver's `goog/cdp/execute` endpoint to the
+    node, so the command is registered on remote drivers that lack it.
+
+    Args:
+        driver (WebDriver): The browser.
+        cmd (str): The DevTools command, e.g. "Network.setBlockedURLs".
+        params (dict): Its parameters.
+
+    Returns:
+        dict: The command's result.
+    """
+    if hasattr(driver, "execute_cdp_cmd"):
+        return driver.execute_cdp_cmd(cmd, params)
+    driver.command_executor.add_command("executeCdpCommand", "POST", "/session/$sessionId/goog/cdp/execute")
+    return driver.execute("executeCdpCommand", {"cmd": cmd, "params": params})["value"]
+
+
+def block_urls(driver, patterns=None):
+    """
+    Blocks requests whose URL matches one of the patterns, through DevTools network interception.
+
+    Blocked requests fail with `net::ERR_BLOCKED_BY_CLIENT` for the rest of the session.
+    If the DevTools protocol is not reachable (e.g. a Grid without CDP forwarding),
+    only the image blocking of the Chrome flags applies.
+
+    Args:
+        driver (WebDriver): The browser.
+        patterns (list): URL patterns with `*` wildcards, BLOCKED_URLS by default.
+    """
+    patterns = BLOCKED_URLS if patterns is None else patterns
+    try:
+        execute_cdp(driver, "Network.enable", {})
+        execute_cdp(driver, "Network.setBlockedURLs", {"urls": patterns})
+    except WebDriverException as e:
+        logger.warning(f"Cannot block URLs through DevTools, only images are blocked: {e.msg or e}")
+
+
+def get_driver(lean=None):
     """
     This function sets up and returns a Chrome WebDriver instance.
     
@@ -17,6 +115,11 @@ def get_driver():
     Environment Variables:
     - SELENIUM_HUB_URL: URL to Selenium Hub (e.g., http://selenium-hub:4444)
     - USE_GRID: Set to 'true' to enable Selenium Grid mode (default: false)
+    - UI_LEAN_PROFILE: Set to 'true' to apply the lean profile (default: false)
+    - UI_ASSET_CACHE: Set to 'true' to serve static assets from the on-disk cache (default: false)
+    
+    Args:
+        lean (bool): True to apply the lean profile, None to follow UI_LEAN_PROFILE
     
     Returns:
         WebDriver: A Chrome WebDriver instance
@@ -25,25 +128,34 @@ def get_driver():
     use_grid = os.getenv('USE_GRID', 'false').lower() == 'true'
     selenium_hub_url = os.getenv('SELENIUM_HUB_URL', 'http://localhost:4444')
     
+    lean = LEAN_PROFILE if lean is None else lean
+    
     if use_grid:
-        return get_remote_driver(selenium_hub_url)
+        return get_remote_driver(selenium_hub_url, lean)
     else:
-        return get_local_driver()
+        return get_local_driver(lean)
 
 
-def get_local_driver():
+def get_local_driver(lean=False):
     """
     Sets up and returns a headless Chrome WebDriver instance for local execution.
     
-    Uses ChromeDriverManager to automatically manage the ChromeDriver binary.
+    The ChromeDriver binary is resolved once per machine and Chrome version (see
+    `utils/driver_cache.py`), so later drivers and other workers skip the lookup.
     
     Steps:
     1. Create ChromeOptions object to configure the browser.
     2. Set 'headless' mode to run the browser in the background.
     3. Add additional options for sandbox and shared memory handling.
-    4. Use ChromeDriverManager to find the appropriate ChromeDriver.
+    4. Resolve the ChromeDriver matching the installed Chrome, from the cache when possible.
     5. Create a new Chrome WebDriver instance.
     6. Maximize the browser window.
+    7. Log the time taken to resolve the driver and start the browser.
+    8. With the lean profile, load pages eagerly, apply the tuned flags and block unused URLs.
+    9. With UI_ASSET_CACHE, serve static assets from the on-disk cache (utils/asset_cache.py).
+    
+    Args:
+        lean (bool): True to apply the lean profile
     
     Returns:
         WebDriver: A local Chrome WebDriver instance
@@ -56,16 +168,33 @@ def get_local_driver():
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option('useAutomationExtension', False)
-    
+    if lean:
+        apply_lean_options(options)
+    if USE_ASSET_CACHE:
+        AssetCache.enable(options)
+    
+    global _local_drivers_started
+    start = time.perf_counter()
+    driver_path = resolve_chromedriver()
+    resolved = time.perf_counter()
     driver = webdriver.Chrome(
-        service=ChromeService(ChromeDriverManager().install()),
+        service=ChromeService(driver_path),
         options=options
     )
     driver.maximize_window()
+    if lean:
+        block_urls(driver)
+    if USE_ASSET_CACHE:
+        asset_cache().attach(driver)
+    _local_drivers_started += 1
+    logger.info(
+        f"{'First' if _local_drivers_started == 1 else 'Later'} local driver started in "
+        f"{time.perf_counter() - start:.2f}s (driver resolution {resolved - start:.2f}s)"
+    )
     return driver
 
 
-def get_remote_driver(hub_url):
+def get_remote_driver(hub_url, lean=False):
     """
     Sets up and returns a Chrome WebDriver instance connected to a Selenium Hub.
     
@@ -73,6 +202,7 @@ def get_remote_driver(hub_url):
     
     Args:
         hub_url (str): URL to the Selenium Hub (e.g., http://selenium-hub:4444)
+        lean (bool): True to apply the lean profile
     
     Returns:
         WebDriver: A remote Chrome WebDriver instance
@@ -84,6 +214,10 @@ def get_remote_driver(hub_url):
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option('useAutomationExtension', False)
+    if lean:
+        apply_lean_options(options)
+    if USE_ASSET_CACHE:
+        AssetCache.enable(options)
     
     # Selenium 4 uses /wd/hub for the endpoint
     grid_url = f"{hub_url}/wd/hub" if not hub_url.endswith('/wd/hub') else hub_url
@@ -93,4 +227,8 @@ def get_remote_driver(hub_url):
         options=options
     )
     driver.maximize_window()
+    if lean:
+        block_urls(driver)
+    if USE_ASSET_CACHE:
+        asset_cache().attach(driver)
     return driver
\ No newline at end of file
@@ -0,0 +1,163 @@
+import json
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+
+logger = logging.getLogger(__name__)
+
+# Environment Variables:
+# - UI_DRIVER_CACHE_DIR: Directory of the resolved-driver index (default: ~/.cache/autotestlab)
+# - UI_DRIVER_OFFLINE: Set to 'true' to never touch the network, only the cache,
+#   CHROMEDRIVER_PATH or a chromedriver on PATH are used (default: false)
+# - CHROMEDRIVER_PATH: ChromeDriver binary to use in offline mode when the cache has none
+CACHE_DIR = os.getenv("UI_DRIVER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "autotestlab"))
+OFFLINE = os.getenv("UI_DRIVER_OFFLINE", "false").lower() == "true"
+INDEX_FILE = "chromedriver_index.json"
+LOCK_TIMEOUT = 300  # seconds a lock is waited for, and after which it is considered stale
+
+_resolved = {}  # Chrome version -> driver path, resolved once per process
+
+
+def chrome_version():
+    """
+    Returns:
+        str: The version of the installed Chrome (or Chromium), None if it cannot be found.
+    """
+    os_manager = OperationSystemManager()
+    for chrome_type in (ChromeType.GOOGLE, ChromeType.CHROMIUM):
+        try:
+            version = os_manager.get_browser_version_from_os(chrome_type)
+        except Exception:  # the lookup shells out and fails differently on every platform
+            version = None
+        if version:
+            return version
+    return None
+
+
+@contextmanager
+def file_lock(path, timeout=LOCK_TIMEOUT):
+    """
+    Holds an exclusive lock shared by every process on the machine (e.g. the xdist workers).
+
+    The lock is a file created atomically; a lock older than `timeout` is left
+    over from a crashed process and is taken over.
+
+    Args:
+        path (str): Path of the lock file.
+        timeout (float): Seconds to wait for the lock.
+
+    Raises:
+        TimeoutError: If the lock is still held by a live process after `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > timeout:
+                    os.remove(path)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for {path}")
+            time.sleep(0.1)
+    try:
+        os.write(fd, str(os.getpid()).encode())
+        os.close(fd)
+        yield
+    finally:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def read_index(cache_dir=CACHE_DIR):
+    """
+    Returns:
+        dict: Chrome version mapped to the path of the ChromeDriver resolved for it.
+    """
+    try:
+        with open(os.path.join(cache_dir, INDEX_FILE)) as index_file:
+            return json.load(index_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_index(index, cache_dir=CACHE_DIR):
+    path = os.path.join(cache_dir, INDEX_FILE)
+    with open(f"{path}.tmp", "w") as index_file:
+        json.dump(index, index_file, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def offline_driver_path():
+    """
+    Returns:
+        str: CHROMEDRIVER_PATH, or the chromedriver found on PATH, None if there is neither.
+    """
+    path = os.getenv("CHROMEDRIVER_PATH")
+    if path and os.path.isfile(path):
+        return path
+    return shutil.which("chromedriver")
+
+
+def resolve_chromedriver(offline=OFFLINE, cache_dir=CACHE_DIR, install=lambda: ChromeDriverManager().install()):
+    """
+    Returns the path of a ChromeDriver matching the installed Chrome, resolving it once per machine.
+
+    Steps:
+    1. Return the path already resolved by this process for the Chrome version.
+    2. Return the path recorded in the on-disk index for the Chrome version, if the binary still exists.
+    3. Offline: use CHROMEDRIVER_PATH or the chromedriver on PATH, never the network.
+    4. Online: take the machine-wide lock, check the index again (another worker may have
+       resolved it meanwhile), then download with ChromeDriverManager and record the path.
+
+    Args:
+        offline (bool): True to never touch the network.
+        cache_dir (str): Directory of the index and its lock.
+        install (callable): Downloads the driver and returns its path.
+
+    Returns:
+        str: Path of the ChromeDriver binary.
+
+    Raises:
+        RuntimeError: In offline mode, if no ChromeDriver is cached or installed.
+    """
+    version = chrome_version() or "unknown"
+    if version in _resolved:
+        return _resolved[version]
+
+    path = read_index(cache_dir).get(version)
+    if not (path and os.path.isfile(path)):
+        if offline:
+            path = offline_driver_path()
+            if path is None:
+                raise RuntimeError(
+                    f"UI_DRIVER_OFFLINE is set but no ChromeDriver is cached for Chrome {version} in {cache_dir}; "
+                    "set CHROMEDRIVER_PATH, put chromedriver on PATH or run once online"
+                )
+        else:
+            os.makedirs(cache_dir, exist_ok=True)
+            with file_lock(os.path.join(cache_dir, f"{INDEX_FILE}.lock")):
+                index = read_index(cache_dir)
+                path = index.get(version)
+                if not (path and os.path.isfile(path)):
+                    start = time.perf_counter()
+                    path = install()
+                    logger.info(f"Resolved ChromeDriver for Chrome {version} in {time.perf_counter() - start:.2f}s: {path}")
+                    # an undetected Chrome version cannot be told apart from the next one, so it is not recorded
+                    if version != "unknown":
+                        index[version] = path
+                        write_index(index, cache_dir)
+
+    _resolved[version] = path
+    return path
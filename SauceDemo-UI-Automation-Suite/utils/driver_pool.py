@@ -0,0 +1,281 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.browser import get_driver
+
+logger = logging.getLogger(__name__)
+
+# Environment Variables:
+# - UI_DRIVER_POOL_SIZE: Idle browsers kept warm per pytest process (default: 1)
+# - UI_DRIVER_MAX_USES: Tests a browser serves before it is replaced (default: 20, 1 restores a browser per test)
+# - UI_DRIVER_PREWARM: Browsers started on background threads as soon as pytest starts (default: 0, off)
+POOL_SIZE = int(os.getenv("UI_DRIVER_POOL_SIZE", "1"))
+MAX_USES = int(os.getenv("UI_DRIVER_MAX_USES", "20"))
+PREWARM = int(os.getenv("UI_DRIVER_PREWARM", "0"))
+PREWARM_PROPERTY = "prewarm_hidden"  # user property holding the startup seconds a pre-warmed browser saved a test
+
+# clears the storage of the page's origin; about:blank and data: pages have none and raise on access
+CLEAR_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+class PooledDriver:
+    """
+    A WebDriver instance held by the DriverPool, with its usage count.
+
+    Attributes:
+        driver (WebDriver): The browser.
+        uses (int): Number of tests the browser has served.
+        started (float): Seconds it took to start the browser.
+    """
+
+    def __init__(self, driver, started):
+        self.driver = driver
+        self.uses = 0
+        self.started = started
+
+
+class DriverPool:
+    """
+    Leases warm WebDriver instances to tests instead of starting a browser per test.
+
+    A lease hands out an idle browser, or starts one with `factory` when none
+    is idle. When the lease ends the browser is reset (see `reset()`) and kept
+    for the next test, unless it has served `max_uses` tests or no longer
+    responds (e.g. the browser or the Grid session crashed), in which case it
+    is quit and the next lease starts a fresh one. At most `size` idle browsers
+    are kept; `close()` quits them all. `prewarm()` starts browsers in the
+    background ahead of the first lease, which then only waits for whatever
+    part of the startup has not finished yet.
+
+    With pytest-xdist every worker process has its own pool, so browsers are
+    never shared between processes. On Selenium Grid, `slots` (GridSlots)
+    holds a Grid slot for the lifetime of every browser, so the workers
+    together never request more sessions than the Grid can run.
+
+    Attributes:
+        factory (callable): Starts a new WebDriver, `get_driver` by default (local or Grid).
+        size (int): Maximum number of idle browsers kept.
+        max_uses (int): Tests a browser serves before it is replaced.
+        slots (GridSlots): Grid slot throttle, None outside Grid mode.
+        stats (dict): Leases, browsers started, leases served by a warm browser, browsers recycled
+            after `max_uses`, browsers discarded after a crash, seconds spent starting browsers
+            seconds spent waiting for a Grid slot, leases served by a pre-warmed browser and
+            the startup seconds pre-warming hid from the tests.
+    """
+
+    def __init__(self, factory=get_driver, size=POOL_SIZE, max_uses=MAX_USES, slots=None):
+        """
+        Initializes the DriverPool. No browser is started until the first lease.
+
+        Args:
+            factory (callable): Starts a new WebDriver.
+            size (int): Maximum number of idle browsers kept.
+            max_uses (int): Tests a browser serves before it is replaced.
+            slots (GridSlots): Grid slot throttle, None outside Grid mode.
+        """
+        self.factory = factory
+        self.slots = slots
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.stats = {
+            "leases": 0, "started": 0, "reused": 0, "recycled": 0, "crashed": 0,
+            "startup_seconds": 0.0, "slot_wait_seconds": 0.0, "prewarmed": 0, "hidden_seconds": 0.0,
+        }
+        self._idle = []
+        self._warming = []  # futures of the browsers being started in the background
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        waited = self.slots.acquire() if self.slots is not None else 0.0
+        start = time.perf_counter()
+        try:
+            driver = self.factory()
+        except Exception:
+            if self.slots is not None:
+                self.slots.release()
+            raise
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.stats["started"] += 1
+            self.stats["startup_seconds"] += elapsed
+            self.stats["slot_wait_seconds"] += waited
+        logger.info(f"Started a browser in {elapsed:.2f}s")
+        return PooledDriver(driver, elapsed)
+
+    def prewarm(self, count):
+        """
+        Starts browsers on background threads, e.g. while pytest collects the tests.
+
+        Args:
+            count (int): Number of browsers to start; the pool keeps at least that many idle.
+        """
+        if count <= 0:
+            return
+        self.size = max(self.size, count)
+        self._executor = ThreadPoolExecutor(max_workers=count, thread_name_prefix="driver-prewarm")
+        with self._lock:
+            self._warming.extend(self._executor.submit(self._start) for _ in range(count))
+        logger.info(f"Pre-warming {count} browser(s) in the background")
+
+    def _take_prewarmed(self, future):
+        """Waits for a browser started in the background, None if its startup failed."""
+        start = time.perf_counter()
+        try:
+            pooled = future.result()
+        except Exception as e:
+            logger.warning(f"A pre-warmed browser failed to start, starting one now: {e}")
+            return None
+        hidden = max(0.0, pooled.started - (time.perf_counter() - start))
+        with self._lock:
+            self.stats["prewarmed"] += 1
+            self.stats["hidden_seconds"] += hidden
+        return pooled
+
+    @contextmanager
+    def lease(self):
+        """
+        Lends a browser for the duration of the block.
+
+        Yields:
+            WebDriver: A browser with no cookies or storage, showing about:blank.
+        """
+        with self._lock:
+            self.stats["leases"] += 1
+            pooled = self._idle.pop() if self._idle else None
+            if pooled is not None:
+                self.stats["reused"] += 1
+            future = self._warming.pop(0) if pooled is None and self._warming else None
+        if future is not None:
+            pooled = self._take_prewarmed(future)
+        if pooled is None:
+            pooled = self._start()
+        try:
+            yield pooled.driver
+        finally:
+            pooled.uses += 1
+            self._release(pooled)
+
+    def _release(self, pooled):
+        """Resets the browser and keeps it, or quits it once it is worn out or unresponsive."""
+        if pooled.uses >= self.max_uses:
+            self._count("recycled")
+            logger.info(f"Recycling a browser after {pooled.uses} uses")
+            self._quit(pooled)
+            return
+        try:
+            self.reset(pooled.driver)
+        except WebDriverException as e:
+            self._count("crashed")
+            logger.warning(f"Discarding a browser that failed to reset: {e.msg or e.__class__.__name__}")
+            self._quit(pooled)
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(pooled)
+                return
+        self._quit(pooled)
+
+    @staticmethod
+    def reset(driver):
+        """
+        Clears the state a test leaves behind in a browser.
+
+        Steps:
+        1. Close every window but the first one.
+        2. Clear the cookies, localStorage and sessionStorage of the current page's origin
+           (and every origin's cookies through the DevTools protocol on local Chrome).
+        3. Navigate to about:blank.
+
+        Args:
+            driver (WebDriver): The browser to reset.
+
+        Raises:
+            WebDriverException: If the browser does not respond (e.g. it crashed).
+        """
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        driver.delete_all_cookies()
+        driver.execute_script(CLEAR_STORAGE_SCRIPT)
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.get("about:blank")
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _quit(self, pooled):
+        try:
+            pooled.driver.quit()
+        except WebDriverException:
+            # the browser is already gone
+            pass
+        finally:
+            if self.slots is not None:
+                self.slots.release()
+
+    def close(self):
+        """Quits every idle or still-warming browser and logs how many starts the pool saved."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            warming, self._warming = self._warming, []
+        for future in warming:
+            try:
+                idle.append(future.result())
+            except Exception:
+                # the startup failed, there is nothing to quit
+                pass
+        if self._executor is not None:
+            self._executor.shutdown()
+        for pooled in idle:
+            self._quit(pooled)
+        logger.info(
+            f"Driver pool: {self.stats['leases']} leases, {self.stats['started']} browsers started "
+            f"({self.stats['startup_seconds']:.1f}s), {self.stats['reused']} reused, "
+            f"{self.stats['recycled']} recycled, {self.stats['crashed']} discarded after a crash, "
+            f"{self.stats['slot_wait_seconds']:.1f}s waiting for Grid slots, "
+            f"{self.stats['prewarmed']} pre-warmed ({self.stats['hidden_seconds']:.1f}s of startup hidden)"
+        )
+
+
+class PrewarmPlugin:
+    """
+    Reports the browser startup latency pre-warming hid from the tests.
+
+    Tests served by a pre-warmed browser record the startup seconds they did
+    not wait for as the `prewarm_hidden` user property; reading it from the
+    reports keeps the summary complete under pytest-xdist.
+    """
+
+    def __init__(self):
+        self.hidden = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == PREWARM_PROPERTY:
+                self.hidden[report.nodeid] = value
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.hidden:
+            return
+        terminalreporter.section("browser pre-warming")
+        terminalreporter.write_line(
+            f"{len(self.hidden)} tests started on a pre-warmed browser, "
+            f"{sum(self.hidden.values()):.1f}s of browser startup hidden behind collection and setup"
+        )
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+import urllib.request
+
+logger = logging.getLogger(__name__)
+
+# Environment Variables:
+# - UI_GRID_MAX_WORKERS: Upper bound on the xdist workers started by `-n auto` in Grid mode (default: 0, no bound)
+# - UI_GRID_SLOT_TIMEOUT: Seconds a test waits for a free Grid slot before failing (default: 300)
+MAX_WORKERS = int(os.getenv("UI_GRID_MAX_WORKERS", "0"))
+SLOT_TIMEOUT = float(os.getenv("UI_GRID_SLOT_TIMEOUT", "300"))
+POLL_INTERVAL = 0.5  # seconds between two checks for a free slot
+SLOT_WAIT_PROPERTY = "grid_slot_wait"  # user property holding the seconds a test waited for a Grid slot
+
+
+def hub_base_url(hub_url):
+    """
+    Returns:
+        str: The hub URL without the legacy `/wd/hub` suffix.
+    """
+    hub_url = hub_url.rstrip("/")
+    return hub_url[: -len("/wd/hub")] if hub_url.endswith("/wd/hub") else hub_url
+
+
+def grid_slots(hub_url, browser_name="chrome", timeout=5):
+    """
+    Reads the Grid's slots for a browser from the hub status endpoint.
+
+    Args:
+        hub_url (str): URL to the Selenium Hub (e.g., http://selenium-hub:4444).
+        browser_name (str): Only slots whose stereotype is this browser are counted.
+        timeout (float): Seconds to wait for the hub.
+
+    Returns:
+        tuple: (total, free) slots on the nodes that are up.
+
+    Raises:
+        OSError: If the hub cannot be reached.
+    """
+    with urllib.request.urlopen(f"{hub_base_url(hub_url)}/status", timeout=timeout) as response:
+        status = json.load(response)["value"]
+    total = free = 0
+    for node in status.get("nodes", []):
+        if node.get("availability", "UP") != "UP":
+            continue
+        for slot in node.get("slots", []):
+            if slot.get("stereotype", {}).get("browserName") != browser_name:
+                continue
+            total += 1
+            if slot.get("session") is None:
+                free += 1
+    return total, free
+
+
+def grid_workers(hub_url, max_workers=MAX_WORKERS):
+    """
+    Returns:
+        int: Number of xdist workers matching the Grid's free slots, None if the hub cannot be read.
+    """
+    try:
+        _, free = grid_slots(hub_url)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Cannot read the Grid status from {hub_url}: {e}")
+        return None
+    workers = max(1, free)
+    return min(workers, max_workers) if max_workers else workers
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class GridSlots:
+    """
+    Throttles session requests so they never queue on the Grid past its capacity.
+
+    Every process on the machine (e.g. each xdist worker) takes a slot token
+    before requesting a session and gives it back when the session ends. The
+    tokens are files created atomically in a directory shared per hub, one per
+    Grid slot, so at most `capacity` sessions are requested at once. A token
+    left by a process that died is reclaimed. A token is only used once the hub
+    also reports a free slot, which covers sessions opened by other clients.
+
+    Attributes:
+        hub_url (str): URL to the Selenium Hub.
+        capacity (int): Number of Grid slots, read from the hub on first use.
+        timeout (float): Seconds to wait for a slot.
+        wait_seconds (float): Total seconds spent waiting for slots.
+    """
+
+    def __init__(self, hub_url, capacity=None, timeout=SLOT_TIMEOUT, directory=None):
+        """
+        Args:
+            hub_url (str): URL to the Selenium Hub.
+            capacity (int): Number of Grid slots, None to read it from the hub.
+            timeout (float): Seconds to wait for a slot.
+            directory (str): Directory of the slot tokens, derived from the hub URL by default.
+        """
+        self.hub_url = hub_url
+        self.capacity = capacity
+        self.timeout = timeout
+        self.directory = directory or os.path.join(
+            tempfile.gettempdir(), f"autotestlab-grid-{hashlib.sha1(hub_base_url(hub_url).encode()).hexdigest()[:12]}"
+        )
+        self.wait_seconds = 0.0
+        self._held = []
+
+    def _free_on_hub(self):
+        try:
+            total, free = grid_slots(self.hub_url)
+        except (OSError, ValueError, KeyError):
+            # the hub cannot be read: rely on the tokens alone
+            return True
+        if self.capacity is None:
+            self.capacity = max(1, total)
+        return free > 0
+
+    def _take_token(self):
+        for index in range(self.capacity or 1):
+            path = os.path.join(self.directory, f"slot-{index}")
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    with open(path) as token:
+                        owner = int(token.read() or 0)
+                except (FileNotFoundError, ValueError):
+                    continue
+                if owner and not _pid_alive(owner):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                continue
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            return path
+        return None
+
+    def acquire(self):
+        """
+        Waits for a free Grid slot and takes it.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        Raises:
+            TimeoutError: If no slot is free within `timeout` seconds.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        start = time.perf_counter()
+        token = None
+        while True:
+            if self._free_on_hub():
+                token = token or self._take_token()
+                if token is not None:
+                    break
+            if time.perf_counter() - start > self.timeout:
+                if token is not None:
+                    os.remove(token)
+                raise TimeoutError(f"No free Grid slot on {self.hub_url} within {self.timeout:.0f}s")
+            time.sleep(POLL_INTERVAL)
+        self._held.append(token)
+        waited = time.perf_counter() - start
+        self.wait_seconds += waited
+        if waited > POLL_INTERVAL:
+            logger.info(f"Waited {waited:.2f}s for a free Grid slot")
+        return waited
+
+    def release(self):
+        """Gives back a slot taken by `acquire()`."""
+        if not self._held:
+            return
+        try:
+            os.remove(self._held.pop())
+        except FileNotFoundError:
+            pass
+
+
+class GridCapacityPlugin:
+    """
+    Reports the time tests waited for a Grid slot separately from their execution time.
+
+    Tests record their wait as the `grid_slot_wait` user property; reading it
+    from the reports keeps the summary complete under pytest-xdist.
+    """
+
+    def __init__(self):
+        self.waits = {}
+        self.durations = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call":
+            self.durations[report.nodeid] = report.duration
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == SLOT_WAIT_PROPERTY:
+                self.waits[report.nodeid] = value
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.waits:
+            return
+        terminalreporter.section("grid capacity")
+        waited = sum(self.waits.values())
+        executed = sum(self.durations.get(nodeid, 0.0) for nodeid in self.waits)
+        terminalreporter.write_line(
+            f"{len(self.waits)} tests: {waited:.1f}s waiting for Grid slots, {executed:.1f}s executing"
+        )
+        for nodeid, wait in sorted(self.waits.items(), key=lambda item: item[1], reverse=True)[:5]:
+            if wait > 0:
+                terminalreporter.write_line(
+                    f"{nodeid}: waited {wait:.2f}s, executed {self.durations.get(nodeid, 0.0):.2f}s"
+                )
@@ -0,0 +1,124 @@
+"""
+Per-page load times of SauceDemo with and without the lean browser profile.
+
+Loads every page of the tested flow in a browser with the default profile
+and in one with the lean profile (`UI_LEAN_PROFILE`, see `utils/browser.py`),
+`--runs` times each with the browser cache cleared before every load, and
+reports the median time `driver.get()` blocked the test, the
+DOMContentLoaded time, and the resources and bytes transferred. Pages behind
+the login get the session injected (`utils/auth_session.py`). Works locally
+and on Selenium Grid (`USE_GRID=true`).
+
+Usage:
+    python -m utils.page_load_report
+    python -m utils.page_load_report --runs 10 --output page_load_report.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.auth_session import AuthSession
+from utils.browser import execute_cdp, get_driver
+
+PAGES = ["", "inventory.html", "inventory-item.html?id=4", "cart.html", "checkout-step-one.html"]
+LOGGED_OUT_PAGES = [""]
+
+NAVIGATION_TIMING_SCRIPT = """
+const [navigation] = performance.getEntriesByType('navigation');
+const resources = performance.getEntriesByType('resource');
+return {
+    dom_content_loaded_ms: navigation ? navigation.domContentLoadedEventEnd : null,
+    resources: resources.length,
+    transfer_bytes: (navigation ? navigation.transferSize : 0)
+        + resources.reduce((total, resource) => total + (resource.transferSize || 0), 0),
+};
+"""
+
+
+def measure_page(driver, url):
+    """
+    Loads a page with a cold browser cache and measures it.
+
+    Args:
+        driver (WebDriver): The browser.
+        url (str): The page URL.
+
+    Returns:
+        dict: `get_ms` (time `get()` blocked), `dom_content_loaded_ms`, `resources` and `transfer_bytes`.
+    """
+    try:
+        execute_cdp(driver, "Network.clearBrowserCache", {})
+    except WebDriverException:
+        # without DevTools the later runs are measured with a warm cache
+        pass
+    start = time.perf_counter()
+    driver.get(url)
+    get_ms = (time.perf_counter() - start) * 1000
+    return {"get_ms": get_ms, **driver.execute_script(NAVIGATION_TIMING_SCRIPT)}
+
+
+def measure_profile(lean, runs, session):
+    """
+    Measures every page in one browser.
+
+    Args:
+        lean (bool): True for the lean profile.
+        runs (int): Loads per page.
+        session (AuthSession): Logs the browser in for the pages behind the login.
+
+    Returns:
+        dict: Page path mapped to the median of each measure over the runs.
+    """
+    driver = get_driver(lean=lean)
+    try:
+        results = {}
+        for page in PAGES:
+            if page not in LOGGED_OUT_PAGES and not driver.get_cookies():
+                session.open(driver, page)
+            samples = [measure_page(driver, f"{session.base_url}{page}") for _ in range(runs)]
+            results[page or "/"] = {
+                name: round(statistics.median(sample[name] for sample in samples), 1)
+                for name in samples[0] if all(sample[name] is not None for sample in samples)
+            }
+        return results
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SauceDemo page load times with and without the lean profile.")
+    parser.add_argument("--runs", type=int, default=5, help="loads per page and profile")
+    parser.add_argument("--output", default="page_load_report.json", help="path of the JSON report")
+    args = parser.parse_args()
+
+    session = AuthSession()
+    report = {
+        "runs": args.runs,
+        "default": measure_profile(False, args.runs, session),
+        "lean": measure_profile(True, args.runs, session),
+    }
+    with open(args.output, "w") as report_file:
+        json.dump(report, report_file, indent=2)
+
+    print(f"{'page':<28} {'get() ms':>18} {'DOMContentLoaded ms':>22} {'resources':>12} {'kB':>16}")
+    for page, default in report["default"].items():
+        lean = report["lean"][page]
+        print(
+            f"{page:<28} {default['get_ms']:>8.0f} -> {lean['get_ms']:<7.0f}"
+            f" {default.get('dom_content_loaded_ms', 0):>10.0f} -> {lean.get('dom_content_loaded_ms', 0):<9.0f}"
+            f" {default['resources']:>5.0f} -> {lean['resources']:<4.0f}"
+            f" {default['transfer_bytes'] / 1024:>7.0f} -> {lean['transfer_bytes'] / 1024:<6.0f}"
+        )
+    total_default = sum(page["get_ms"] for page in report["default"].values())
+    total_lean = sum(page["get_ms"] for page in report["lean"].values())
+    print(f"\nTotal get() time {total_default:.0f} ms -> {total_lean:.0f} ms "
+          f"({(total_lean - total_default) / total_default:+.0%}), report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.wait import WebDriverWait
+
+from utils.driver_cache import file_lock
+
+logger = logging.getLogger(__name__)
+
+# Environment Variables:
+# - UI_WAIT_TIMEOUT: Longest time a page action waits for its element, in seconds (default: 10)
+# - UI_WAIT_POLL: Polling intervals per condition in seconds, e.g. 'clickable=0.05,present=0.1'
+# - UI_ADAPTIVE_WAITS: Set to 'true' to use the timeouts learned per locator (default: false)
+# - UI_WAIT_HISTORY_FILE: Where the wait durations of previous runs are kept (default: .wait_history.json)
+DEFAULT_TIMEOUT = float(os.getenv("UI_WAIT_TIMEOUT", "10"))
+ADAPTIVE = os.getenv("UI_ADAPTIVE_WAITS", "false").lower() == "true"
+HISTORY_FILE = os.getenv("UI_WAIT_HISTORY_FILE", ".wait_history.json")
+HISTORY_WINDOW = 50  # durations kept per locator
+MIN_SAMPLES = 5  # durations a locator needs before its timeout is learned
+TIMEOUT_FACTOR = 4  # learned timeout = p95 of the recent durations x this factor
+MIN_TIMEOUT = 2.0  # learned timeouts are never shorter than this
+WAITS_PROPERTY = "page_waits"  # user property holding the waits of a test's page actions
+
+# condition name -> (expected condition factory, polling interval in seconds)
+CONDITIONS = {
+    "present": (EC.presence_of_element_located, 0.1),
+    "all_present": (EC.presence_of_all_elements_located, 0.1),
+    "visible": (EC.visibility_of_element_located, 0.1),
+    "clickable": (EC.element_to_be_clickable, 0.1),
+    "url_contains": (EC.url_contains, 0.2),
+}
+POLL_INTERVALS = {name: poll for name, (_, poll) in CONDITIONS.items()}
+for _override in filter(None, os.getenv("UI_WAIT_POLL", "").split(",")):
+    _name, _poll = _override.split("=")
+    POLL_INTERVALS[_name.strip()] = float(_poll)
+
+
+class WaitHistory:
+    """
+    Recent wait durations per locator, kept across runs to learn timeouts from.
+
+    Attributes:
+        path (str): The JSON file the durations are loaded from and saved to.
+        durations (dict): "condition:by=value" key mapped to its most recent durations in seconds.
+    """
+
+    def __init__(self, path=HISTORY_FILE):
+        self.path = path
+        self.durations = {}
+        self._lock = threading.Lock()
+        try:
+            with open(path) as history_file:
+                for key, values in json.load(history_file).items():
+                    self.durations[key] = deque(values, maxlen=HISTORY_WINDOW)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        self._recorded = {}
+
+    def observe(self, key, seconds):
+        with self._lock:
+            self.durations.setdefault(key, deque(maxlen=HISTORY_WINDOW)).append(round(seconds, 3))
+            self._recorded.setdefault(key, []).append(round(seconds, 3))
+
+    def timeout(self, key, ceiling=DEFAULT_TIMEOUT):
+        """
+        Returns:
+            float: The learned timeout of a locator, `ceiling` until it has MIN_SAMPLES durations.
+        """
+        with self._lock:
+            samples = sorted(self.durations.get(key, ()))
+        if len(samples) < MIN_SAMPLES:
+            return ceiling
+        p95 = samples[min(len(samples) - 1, math.ceil(0.95 * len(samples)) - 1)]
+        # rounded up to half seconds so that few distinct WebDriverWait objects are needed
+        return min(ceiling, max(MIN_TIMEOUT, math.ceil(p95 * TIMEOUT_FACTOR * 2) / 2))
+
+    def save(self):
+        """Adds this process's durations to the history file, merged under a lock with the other workers."""
+        if not self._recorded:
+            return
+        with file_lock(f"{self.path}.lock"):
+            try:
+                with open(self.path) as history_file:
+                    history = json.load(history_file)
+            except (FileNotFoundError, json.JSONDecodeError):
+                history = {}
+            with self._lock:
+                for key, values in self._recorded.items():
+                    history[key] = (history.get(key, []) + values)[-HISTORY_WINDOW:]
+                self._recorded = {}
+            with open(f"{self.path}.tmp", "w") as history_file:
+                json.dump(history, history_file)
+            os.replace(f"{self.path}.tmp", self.path)
+
+
+HISTORY = WaitHistory()
+RECORDS = []  # waits of the running test, drained into its user properties
+
+
+class WaitEngine:
+    """
+    The waits of every page object of one browser.
+
+    WebDriverWait objects are reused per (timeout, polling interval) instead of
+    built for every action; each condition has its own polling interval
+    (POLL_INTERVALS). Every wait is timed, its polls counted and the result
+    recorded in RECORDS and in the per-locator HISTORY, from which adaptive
+    timeouts are learned when UI_ADAPTIVE_WAITS is set.
+
+    Attributes:
+        driver (WebDriver): The browser.
+        adaptive (bool): True to wait at most the timeout learned for the locator.
+    """
+
+    def __init__(self, driver, adaptive=ADAPTIVE):
+        self.driver = driver
+        self.adaptive = adaptive
+        self._waits = {}
+
+    @classmethod
+    def for_driver(cls, driver):
+        """
+        Returns:
+            WaitEngine: The engine of a browser, shared by all its page objects.
+        """
+        engine = getattr(driver, "_wait_engine", None)
+        if engine is None:
+            engine = driver._wait_engine = cls(driver)
+        return engine
+
+    def _wait(self, timeout, poll):
+        wait = self._waits.get((timeout, poll))
+        if wait is None:
+            wait = self._waits[(timeout, poll)] = WebDriverWait(self.driver, timeout, poll_frequency=poll)
+        return wait
+
+    def until(self, condition, target, action, timeout=None):
+        """
+        Waits for a condition on a locator (or a URL fragment for "url_contains").
+
+        Args:
+            condition (str): One of CONDITIONS.
+            target (tuple or str): The locator, or the argument of the condition.
+            action (str): The page action waiting, e.g. "LoginPage.click_login".
+            timeout (float): Longest wait, defaults to the learned or the default timeout.
+
+        Returns:
+            The value of the condition (e.g. the WebElement).
+
+        Raises:
+            TimeoutException: If the condition is not met in time.
+        """
+        factory, _ = CONDITIONS[condition]
+        key = f"{condition}:{'='.join(target) if isinstance(target, tuple) else target}"
+        if timeout is None:
+            timeout = HISTORY.timeout(key) if self.adaptive else DEFAULT_TIMEOUT
+        predicate = factory(target)
+        polls = 0
+
+        def counted(driver):
+            nonlocal polls
+            polls += 1
+            return predicate(driver)
+
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return self._wait(timeout, POLL_INTERVALS[condition]).until(counted)
+        except TimeoutException:
+            timed_out = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            if not timed_out:
+                HISTORY.observe(key, elapsed)
+            RECORDS.append({
+                "action": action, "locator": key, "seconds": round(elapsed, 4), "polls": polls,
+                "timeout": timeout, "timed_out": timed_out,
+            })
+
+
+class WaitTelemetryPlugin:
+    """
+    Records the waits of every test's page actions and reports which ones dominate UI test time.
+
+    The waits are attached to each test as the `page_waits` user property and
+    aggregated from the reports, so the summary also covers pytest-xdist workers.
+    """
+
+    def __init__(self):
+        self.actions = {}
+        self.call_seconds = 0.0
+
+    def pytest_runtest_setup(self, item):
+        RECORDS.clear()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_teardown(self, item):
+        # before the fixtures are torn down, so the property is part of the teardown report
+        if RECORDS:
+            item.user_properties.append((WAITS_PROPERTY, json.dumps(RECORDS)))
+            RECORDS.clear()
+
+    def pytest_runtest_logreport(self, report):
+        if report.when in ("setup", "call"):
+            self.call_seconds += report.duration
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name != WAITS_PROPERTY:
+                continue
+            for record in json.loads(value):
+                totals = self.actions.setdefault(
+                    record["action"], {"count": 0, "seconds": 0.0, "polls": 0, "timeouts": 0, "durations": []}
+                )
+                totals["count"] += 1
+                totals["seconds"] += record["seconds"]
+                totals["polls"] += record["polls"]
+                totals["timeouts"] += record["timed_out"]
+                totals["durations"].append(record["seconds"])
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.actions:
+            return
+        waited = sum(totals["seconds"] for totals in self.actions.values())
+        terminalreporter.section("page waits")
+        terminalreporter.write_line(
+            f"{waited:.1f}s waiting in page actions, {waited / self.call_seconds:.0%} of "
+            f"{self.call_seconds:.1f}s test setup and call time" if self.call_seconds else f"{waited:.1f}s waiting"
+        )
+        for action, totals in sorted(self.actions.items(), key=lambda item: item[1]["seconds"], reverse=True):
+            durations = sorted(totals["durations"])
+            p95 = durations[min(len(durations) - 1, math.ceil(0.95 * len(durations)) - 1)]
+            terminalreporter.write_line(
+                f"{action:<36} {totals['count']:>4} waits {totals['seconds']:>7.2f}s total, "
+                f"p95 {p95:.2f}s, {totals['polls'] / totals['count']:.1f} polls/wait"
+                + (f", {totals['timeouts']} timed out" if totals["timeouts"] else ""),
+                red=bool(totals["timeouts"]),
+            )
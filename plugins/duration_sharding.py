@@ -0,0 +1,393 @@
+"""
+History-based duration sharding for pytest-xdist.
+
+Plain `pytest -n N` hands tests to workers in collection order, whatever
+they cost, so one worker can still be busy with the slow tests long after the
+others are idle. With `--shard-by-duration` the controller instead predicts
+every test's duration from previous runs and splits the tests into one shard
+per worker with the longest-processing-time-first rule: the tests are sorted
+from slowest to fastest and each goes to the worker with the least predicted
+work so far, so all shards finish at about the same time. The last quarter
+or so of every shard is held back and handed out as workers drain, so a
+worker slower than predicted passes work to the idle ones and the tests of a
+crashed worker are still run. The run summary compares the predicted
+makespan (the longest shard) with the actual one.
+
+Durations come from the JSON store this plugin writes after every run
+(`duration_store`, default `.test_durations.json`) and from previous JUnit XML
+or pytest-json-report files (`duration_reports` in pytest.ini, or
+`--durations-from`). A test that has never been seen is predicted at the
+median duration of the known tests in its file, else of all known tests, else
+`duration_default` seconds.
+
+Tests sharing an `xdist_group` mark are kept together on one worker.
+
+Usage (from either suite):
+
+    pytest tests/ -n 4 --shard-by-duration
+"""
+import json
+import os
+import re
+import statistics
+import time
+from collections import defaultdict
+from xml.etree import ElementTree
+
+import pytest
+
+STORE_SMOOTHING = 0.5  # weight of the latest run when updating a stored duration
+TAIL_SHARE = 0.25  # share of each shard's predicted work held back and handed out as workers drain
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("duration_sharding", "history-based duration sharding for pytest-xdist")
+    group.addoption("--shard-by-duration", action="store_true", default=False,
+                    help="assign tests to xdist workers longest-first using durations of previous runs")
+    group.addoption("--durations-from", action="append", default=[], metavar="REPORT",
+                    help="JUnit XML or pytest-json-report file to read test durations from (repeatable)")
+    parser.addini("duration_reports", type="paths", default=[],
+                  help="JUnit XML or pytest-json-report files of previous runs read for test durations")
+    parser.addini("duration_store", default=".test_durations.json",
+                  help="JSON file, relative to the rootdir, where measured test durations are kept")
+    parser.addini("duration_default", default="1.0",
+                  help="seconds predicted for a test when no test of the run has any history")
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(DurationShardingPlugin(config), "duration_sharding_plugin")
+
+
+def split_group(nodeid):
+    """
+    Splits the `@group` suffix pytest-xdist appends to tests with an `xdist_group` mark.
+
+    Returns:
+        tuple: (nodeid without the suffix, group name or None)
+    """
+    if nodeid.rfind("@") > nodeid.rfind("]"):
+        base, _, group = nodeid.rpartition("@")
+        return base, group
+    return nodeid, None
+
+
+def junit_address(nodeid):
+    """
+    Returns the (classname, name) pytest's JUnit XML report uses for a nodeid.
+
+    Mirrors `_pytest.junitxml.mangle_test_address`, so JUnit durations can be
+    matched back to collected tests.
+    """
+    path, bracket, params = nodeid.partition("[")
+    names = path.split("::")
+    names[0] = re.sub(r"\.py$", "", names[0].replace("/", "."))
+    names[-1] += bracket + params
+    return ".".join(names[:-1]), names[-1]
+
+
+def read_junit_durations(path):
+    """
+    Returns:
+        dict: (classname, name) mapped to the test duration in seconds.
+    """
+    durations = {}
+    for testcase in ElementTree.parse(path).getroot().iter("testcase"):
+        if testcase.find("skipped") is None:
+            durations[(testcase.get("classname", ""), testcase.get("name", ""))] = float(testcase.get("time", 0))
+    return durations
+
+
+def read_json_report_durations(path):
+    """
+    Returns:
+        dict: nodeid mapped to the test duration in seconds (setup + call + teardown).
+    """
+    with open(path) as report_file:
+        report = json.load(report_file)
+    durations = {}
+    for test in report.get("tests", []):
+        if test.get("outcome") == "skipped":
+            continue
+        durations[test["nodeid"]] = sum(
+            test[stage].get("duration", 0) for stage in ("setup", "call", "teardown") if stage in test
+        )
+    return durations
+
+
+class DurationHistory:
+    """
+    Predicted test durations, merged from the store and from previous reports.
+
+    Attributes:
+        by_nodeid (dict): nodeid mapped to its duration in seconds.
+        by_junit (dict): (classname, name) mapped to its duration, for JUnit reports.
+        default (float): Seconds predicted when no test of a run has any history.
+    """
+
+    def __init__(self, store=None, reports=(), default=1.0):
+        self.by_nodeid = {}
+        self.by_junit = {}
+        self.default = default
+        for report in reports:
+            if not os.path.exists(report):
+                continue
+            if str(report).endswith(".xml"):
+                self.by_junit.update(read_junit_durations(report))
+            else:
+                self.by_nodeid.update(read_json_report_durations(report))
+        if store and os.path.exists(store):
+            with open(store) as store_file:
+                # the store is updated after every run, so it wins over older reports
+                self.by_nodeid.update(json.load(store_file))
+
+    def known(self, nodeid):
+        """Returns the recorded duration of a test, or None if it has never been seen."""
+        nodeid, _ = split_group(nodeid)
+        if nodeid in self.by_nodeid:
+            return self.by_nodeid[nodeid]
+        return self.by_junit.get(junit_address(nodeid))
+
+    def predict(self, nodeids):
+        """
+        Predicts the duration of every test, falling back for tests without history.
+
+        Args:
+            nodeids (list): The collected nodeids.
+
+        Returns:
+            tuple: (list of predicted durations in seconds, number of tests predicted by the fallback)
+        """
+        known = [self.known(nodeid) for nodeid in nodeids]
+        per_file = defaultdict(list)
+        for nodeid, duration in zip(nodeids, known):
+            if duration is not None:
+                per_file[nodeid.split("::")[0]].append(duration)
+        overall = [duration for duration in known if duration is not None]
+        overall_median = statistics.median(overall) if overall else self.default
+
+        predicted = []
+        for nodeid, duration in zip(nodeids, known):
+            if duration is None:
+                same_file = per_file.get(nodeid.split("::")[0])
+                duration = statistics.median(same_file) if same_file else overall_median
+            predicted.append(duration)
+        return predicted, known.count(None)
+
+
+def lpt_shards(durations, units, workers):
+    """
+    Splits tests into `workers` shards with the longest-processing-time-first rule.
+
+    Args:
+        durations (list): Predicted duration of every test, by collection index.
+        units (list): Work unit of every test; tests of the same unit stay on one shard.
+        workers (int): Number of shards.
+
+    Returns:
+        tuple: (list of shards, each a sorted list of collection indices; list of predicted shard durations)
+    """
+    unit_tests = defaultdict(list)
+    for index, unit in enumerate(units):
+        unit_tests[unit].append(index)
+    unit_cost = {unit: sum(durations[index] for index in tests) for unit, tests in unit_tests.items()}
+
+    shards = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    for unit in sorted(unit_tests, key=lambda unit: (-unit_cost[unit], unit_tests[unit][0])):
+        target = loads.index(min(loads))
+        shards[target].extend(unit_tests[unit])
+        loads[target] += unit_cost[unit]
+    # keep collection order inside a shard so module and class fixtures are set up once
+    return [sorted(shard) for shard in shards], loads
+
+
+def make_scheduler_class():
+    from xdist.scheduler import LoadScheduling
+
+    class DurationScheduling(LoadScheduling):
+        """
+        LoadScheduling whose distribution follows a longest-processing-time-first split.
+
+        Every worker is sent its shard up front except a tail of about
+        TAIL_SHARE of its predicted work, held back in whole units (an
+        `xdist_group` is never split). A worker running low on tests is sent
+        the next unit of its own tail; once that is empty it takes the last
+        unit of the worker with the most held-back work, so a worker slower
+        than predicted sheds work to the others. The tail of a crashed worker
+        goes to the workers still running, its sent tests are rescheduled by
+        LoadScheduling, and workers are only shut down once nothing is left.
+        """
+
+        def __init__(self, config, log, history, on_schedule):
+            super().__init__(config, log)
+            self.history = history
+            self.on_schedule = on_schedule
+            self.durations = []
+            self.node2tail = {}
+            self.moved = 0
+
+        @property
+        def tests_finished(self):
+            return not any(self.node2tail.values()) and super().tests_finished
+
+        @property
+        def has_pending(self):
+            return any(self.node2tail.values()) or super().has_pending
+
+        def schedule(self):
+            if self.collection is not None or not self._check_nodes_have_same_collection():
+                return super().schedule()
+
+            self.collection = next(iter(self.node2collection.values()))
+            if not self.collection:
+                return
+            self.durations, unseen = self.history.predict(self.collection)
+            units = [split_group(nodeid)[1] or nodeid for nodeid in self.collection]
+            shards, loads = lpt_shards(self.durations, units, len(self.nodes))
+            for node, shard, load in zip(self.nodes, shards, loads):
+                unit_tests = defaultdict(list)
+                for index in shard:
+                    unit_tests[units[index]].append(index)
+                # units in collection order, so module and class fixtures are set up once
+                shard_units = sorted(unit_tests.values(), key=lambda tests: tests[0])
+                tail = []
+                held = 0.0
+                while len(shard_units) > 1 and held < TAIL_SHARE * load:
+                    held += self._cost(shard_units[-1])
+                    tail.insert(0, shard_units.pop())
+                self.node2tail[node] = tail
+                self._send_unit(node, [index for tests in shard_units for index in tests])
+            for node in self.nodes:
+                self.check_schedule(node)
+            self.on_schedule(
+                {node.gateway.id: load for node, load in zip(self.nodes, loads)},
+                {node.gateway.id: len(shard) for node, shard in zip(self.nodes, shards)},
+                unseen,
+            )
+
+        def _cost(self, tests):
+            return sum(self.durations[index] for index in tests)
+
+        def _held(self, node):
+            return sum(map(self._cost, self.node2tail[node]))
+
+        def _send_unit(self, node, tests):
+            if tests:
+                self.node2pending[node].extend(tests)
+                node.send_runtest_some(tests)
+
+        def check_schedule(self, node, duration=0):
+            if node.shutting_down:
+                return
+            # a replacement for a crashed worker starts without a tail of its own
+            tail = self.node2tail.setdefault(node, [])
+            # a worker holds back its last test until it is sent more or shut down
+            if len(self.node2pending[node]) >= 2:
+                return
+            if self.pending:
+                # tests a crashed worker had been sent
+                self._send_tests(node, max(1, len(self.pending) // len(self.node2pending)))
+            elif tail:
+                self._send_unit(node, tail.pop(0))
+            else:
+                donor = max(self.node2tail, key=self._held)
+                if self.node2tail[donor]:
+                    self.moved += 1
+                    self._send_unit(node, self.node2tail[donor].pop())
+                else:
+                    node.shutdown()
+
+        def remove_node(self, node):
+            tail = self.node2tail.pop(node, [])
+            running = [other for other in self.node2tail if not other.shutting_down]
+            for unit in tail:
+                if running:
+                    # still as one unit, to the worker with the least held-back work
+                    self.node2tail[min(running, key=self._held)].append(unit)
+                else:
+                    self.pending.extend(unit)
+            return super().remove_node(node)
+
+    return DurationScheduling
+
+
+class DurationShardingPlugin:
+    """Schedules xdist workers from the duration history and keeps the history up to date."""
+
+    def __init__(self, config):
+        self.config = config
+        self.enabled = config.getoption("shard_by_duration")
+        self.store = os.path.join(str(config.rootpath), config.getini("duration_store"))
+        self.history = None
+        self.scheduler = None
+        self.measured = defaultdict(float)
+        self.worker_actual = defaultdict(float)
+        self.predicted = None
+        self.shard_sizes = None
+        self.unseen = 0
+        self.started = time.perf_counter()
+        if self.enabled and hasattr(config, "workerinput"):
+            # workers tag xdist_group tests with an @group suffix, as with --dist loadgroup
+            config.option.loadgroup = True
+
+    @pytest.hookimpl(tryfirst=True, optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        if not self.enabled:
+            return None
+        reports = list(config.getini("duration_reports")) + config.getoption("durations_from")
+        self.history = DurationHistory(self.store, reports, float(config.getini("duration_default")))
+        self.scheduler = make_scheduler_class()(config, log, self.history, self._scheduled)
+        return self.scheduler
+
+    def _scheduled(self, predicted, shard_sizes, unseen):
+        self.predicted = predicted
+        self.shard_sizes = shard_sizes
+        self.unseen = unseen
+        self.started = time.perf_counter()
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call" and report.skipped:
+            return
+        nodeid, _ = split_group(report.nodeid)
+        self.measured[nodeid] += report.duration
+        node = getattr(report, "node", None)
+        if node is not None:
+            self.worker_actual[node.gateway.id] += report.duration
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, "workerinput") or not self.measured:
+            return
+        stored = {}
+        if os.path.exists(self.store):
+            with open(self.store) as store_file:
+                stored = json.load(store_file)
+        for nodeid, duration in self.measured.items():
+            previous = stored.get(nodeid)
+            stored[nodeid] = round(
+                duration if previous is None else STORE_SMOOTHING * duration + (1 - STORE_SMOOTHING) * previous, 4
+            )
+        temporary = f"{self.store}.tmp"
+        with open(temporary, "w") as store_file:
+            json.dump(stored, store_file, indent=1, sort_keys=True)
+        os.replace(temporary, self.store)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.predicted:
+            return
+        wall = time.perf_counter() - self.started
+        terminalreporter.section("duration sharding")
+        for worker in sorted(self.predicted):
+            terminalreporter.write_line(
+                f"{worker}: {self.shard_sizes[worker]} tests, predicted {self.predicted[worker]:.2f}s, "
+                f"actual {self.worker_actual.get(worker, 0.0):.2f}s"
+            )
+        actual_makespan = max(self.worker_actual.values(), default=0.0)
+        terminalreporter.write_line(
+            f"makespan: predicted {max(self.predicted.values()):.2f}s, actual {actual_makespan:.2f}s "
+            f"(test time on the busiest worker; {wall:.2f}s wall clock); "
+            f"{self.unseen} test(s) without history used the fallback estimate"
+        )
+        if self.scheduler.moved:
+            terminalreporter.write_line(
+                f"{self.scheduler.moved} held-back unit(s) moved to workers that ran out of their own tests"
+            )
@@ -3,10 +3,16 @@ Script to generate combined HTML test report from API and UI tests
 """
 import json
 import os
+import sys
+from html import escape
 from pathlib import Path
 from datetime import datetime
 from xml.etree import ElementTree as ET
 
+# the percentile definition behind the API suite's latency budgets and hedging, so the report agrees with them
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'JsonPlaceholder-API-Automation-Suite'))
+from utils.stats import percentile  # noqa: E402
+
 
 def parse_junit_report(report_path):
     """Parse JUnit XML report and extract test details"""
@@ -22,7 +28,17 @@ def parse_junit_report(report_path):
                     'classname': testcase.get('classname', ''),
                     'name': testcase.get('name', ''),
                     'time': float(testcase.get('time', 0)),
-                    'status': 'passed'
+                    'status': 'passed',
+                    'http_timings': [
+                        json.loads(prop.get('value'))
+                        for prop in testcase.findall('properties/property')
+                        if prop.get('name') == 'http_timing'
+                    ],
+                    'deadlines': [
+                        json.loads(prop.get('value'))
+                        for prop in testcase.findall('properties/property')
+                        if prop.get('name') == 'request_deadlines'
+                    ]
                 }
                 
                 if testcase.find('failure') is not None:
@@ -57,6 +73,97 @@ def parse_junit_report(report_path):
         return None
 
 
+def timing_summary(timings):
+    """Summarize the HTTP timings of one test as a single line"""
+    if not timings:
+        return ''
+    new_connections = sum(1 for timing in timings if timing['new_connection'])
+    cached = sum(1 for timing in timings if timing.get('from_cache'))
+    ttfb = sum(timing['ttfb_ms'] for timing in timings)
+    total = sum(timing['total_ms'] for timing in timings)
+    size = sum(timing['size_bytes'] or 0 for timing in timings)
+    decode = sum(timing['json_decode_ms'] or 0 for timing in timings)
+    summary = (f"{len(timings)} req • {new_connections} new conn • TTFB {ttfb:.1f} ms • "
+               f"total {total:.1f} ms • {size / 1024:.1f} KiB • JSON {decode:.1f} ms")
+    if cached:
+        summary += f" • {cached} cached"
+    hedged = sum(1 for timing in timings if timing.get('hedged'))
+    if hedged:
+        summary += f" • {hedged} hedged"
+    return summary
+
+
+def deadline_totals(testcases):
+    """Sum the timeouts, hedges and hedge wins recorded by the test cases"""
+    totals = {'timeouts': 0, 'hedges': 0, 'hedge_wins': 0}
+    for tc in testcases:
+        for counts in tc.get('deadlines', []):
+            for name in totals:
+                totals[name] += counts.get(name, 0)
+    return totals
+
+
+def endpoint_aggregates(testcases):
+    """Aggregate the HTTP timings of all test cases per endpoint"""
+    by_endpoint = {}
+    for tc in testcases:
+        for timing in tc.get('http_timings', []):
+            by_endpoint.setdefault(timing['endpoint'], []).append(timing)
+
+    aggregates = []
+    for endpoint, timings in sorted(by_endpoint.items()):
+        ttfb = [timing['ttfb_ms'] for timing in timings]
+        total = [timing['total_ms'] for timing in timings]
+        sizes = [timing['size_bytes'] for timing in timings if timing['size_bytes'] is not None]
+        decodes = [timing['json_decode_ms'] for timing in timings if timing['json_decode_ms'] is not None]
+        aggregates.append({
+            'endpoint': endpoint,
+            'count': len(timings),
+            'new_connections': sum(1 for timing in timings if timing['new_connection']),
+            'ttfb_p50': percentile(ttfb, 50),
+            'ttfb_p90': percentile(ttfb, 90),
+            'total_p50': percentile(total, 50),
+            'total_p90': percentile(total, 90),
+            'total_max': max(total),
+            'avg_size': sum(sizes) / len(sizes) if sizes else 0,
+            'avg_decode': sum(decodes) / len(decodes) if decodes else 0,
+        })
+    return aggregates
+
+
+def generate_endpoint_table(testcases):
+    """Generate the per-endpoint HTTP timing table, empty if no timings were recorded"""
+    aggregates = endpoint_aggregates(testcases)
+    if not aggregates:
+        return ''
+    rows = ''
+    for agg in aggregates:
+        rows += f"""
+                    <tr>
+                        <td>{escape(agg['endpoint'])}</td>
+                        <td>{agg['count']}</td>
+                        <td>{agg['new_connections']}</td>
+                        <td>{agg['ttfb_p50']:.1f} / {agg['ttfb_p90']:.1f}</td>
+                        <td>{agg['total_p50']:.1f} / {agg['total_p90']:.1f} / {agg['total_max']:.1f}</td>
+                        <td>{agg['avg_size'] / 1024:.1f}</td>
+                        <td>{agg['avg_decode']:.2f}</td>
+                    </tr>"""
+    return f"""
+                <h3 class="subsection-title">HTTP timings per endpoint (ms)</h3>
+                <table class="timing-table">
+                    <tr>
+                        <th>Endpoint</th>
+                        <th>Requests</th>
+                        <th>New connections</th>
+                        <th>TTFB p50 / p90</th>
+                        <th>Total p50 / p90 / max</th>
+                        <th>Avg size (KiB)</th>
+                        <th>Avg JSON decode</th>
+                    </tr>{rows}
+                </table>
+"""
+
+
 def generate_html_report(api_data, ui_data):
     """Generate combined HTML report"""
     
@@ -231,6 +338,38 @@ def generate_html_report(api_data, ui_data):
             margin-left: 10px;
         }}
         
+        .test-timing {{
+            color: #6c757d;
+            font-size: 0.8em;
+            margin-left: 10px;
+        }}
+        
+        .subsection-title {{
+            color: #333;
+            margin: 20px 0 10px;
+        }}
+        
+        .timing-table {{
+            width: 100%;
+            border-collapse: collapse;
+            margin-bottom: 20px;
+            font-size: 0.9em;
+        }}
+        
+        .timing-table th, .timing-table td {{
+            padding: 8px;
+            border-bottom: 1px solid #e9ecef;
+            text-align: right;
+        }}
+        
+        .timing-table th:first-child, .timing-table td:first-child {{
+            text-align: left;
+        }}
+        
+        .timing-table th {{
+            background: #f8f9fa;
+        }}
+        
         .footer {{
             background: #f8f9fa;
             padding: 20px;
@@ -310,11 +449,21 @@ def generate_html_report(api_data, ui_data):
                     <span class="skipped">{api_stats['skipped']} skipped</span>
                 </div>
 """
+        deadlines = deadline_totals(api_data['testcases'])
+        if any(deadlines.values()):
+            html += f"""
+                <div class="test-suite">
+                    <strong>Deadlines:</strong> {deadlines['timeouts']} timeouts •
+                    {deadlines['hedges']} hedged requests ({deadlines['hedge_wins']} answered first by the hedge)
+                </div>
+"""
+        html += generate_endpoint_table(api_data['testcases'])
         for tc in api_data['testcases']:
             html += f"""
                 <div class="test-case {tc['status']}">
                     <span class="test-status {tc['status']}">{tc['status']}</span>
                     <span class="test-name">{tc['name']}</span>
+                    <span class="test-timing">{timing_summary(tc['http_timings'])}</span>
                     <span class="test-time">{tc['time']:.2f}s</span>
                 </div>
 """